@@ -1,13 +1,30 @@
 import os
 from pathlib import Path
 import click
-from typing import Dict
+from typing import Dict, Iterable, Optional, Tuple
 import ffmpeg
+import hashlib
 import logging
+import time
+
+from audiogram_client.common_utils.batch import (
+    BatchItem,
+    BatchStats,
+    check_output_names,
+    collect_inputs,
+    run_bounded,
+)
+from audiogram_client.common_utils.ledger import LEDGER_FILENAME, JobLedger
 
 class AudioConverter:
     # Supported input formats
     SUPPORTED_FORMATS = ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac', '.mp4']
+    # Output format required for speech recognition
+    OUTPUT_PARAMS = {
+        'acodec': 'pcm_s16le',  # 16-bit PCM
+        'ac': 1,                # mono
+        'ar': 16000,            # 16kHz
+    }
     
     def __init__(self, input_file: str, output_dir: str = "output"):
         """Initialize the audio converter.
@@ -77,9 +94,7 @@ class AudioConverter:
             stream = ffmpeg.output(
                 stream,
                 str(output_path),
-                acodec='pcm_s16le',  # 16-bit PCM
-                ac=1,                # mono
-                ar=16000,            # 16kHz
+                **self.OUTPUT_PARAMS,
                 loglevel='error',    # Reduce ffmpeg output
                 y=None              # Overwrite output file if exists
             )
@@ -92,7 +107,35 @@ class AudioConverter:
         except ffmpeg.Error as e:
             error_message = e.stderr.decode() if hasattr(e, 'stderr') else str(e)
             self.logger.error(f"FFmpeg error: {error_message}")
-            raise Exception(f"Audio conversion failed: {error_message}")
+            raise Exception(f"Audio conversion failed: {error_message}") from None
+
+    def stream_to_stdout(self) -> None:
+        """Decode media to raw PCM (s16le, mono, 16kHz) on stdout, without an intermediate WAV.
+
+        ffmpeg inherits our stdout, so it blocks when the reading side is slower,
+        e.g. `... --stdout | audiogram asr stream --audio-file - --format s16le --rate 16000`
+        """
+        try:
+            self.logger.info(f"Streaming PCM of {self.input_path} to stdout...")
+            (
+                ffmpeg.input(str(self.input_path))
+                .audio.output(
+                    'pipe:',
+                    format='s16le',
+                    **self.OUTPUT_PARAMS,
+                    loglevel='error',
+                )
+                .run(capture_stderr=True)
+            )
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if hasattr(e, 'stderr') else str(e)
+            self.logger.error(f"FFmpeg error: {error_message}")
+            raise Exception(f"Audio conversion failed: {error_message}") from None
+
+    def probe_duration(self) -> float:
+        """Get media duration in seconds, 0 if it is unknown."""
+        probe = ffmpeg.probe(str(self.input_path))
+        return float(probe.get('format', {}).get('duration', 0))
 
     def process(self) -> str:
         """Process the input file: extract audio and convert to WAV.
@@ -122,13 +165,113 @@ class AudioConverter:
         
         return str(output_path)
 
+class BatchConverter:
+    """Convert many files to WAV concurrently, one ffmpeg process per job.
+
+    Outputs are named after the inputs (made unique with a path hash), so
+    reruns write to the same files. Conversions are recorded in a job ledger,
+    files converted before with unchanged contents are skipped.
+    """
+
+    def __init__(self, output_dir: str = "output", jobs: Optional[int] = None, force: bool = False):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_dir = Path(output_dir).resolve()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.force = force
+        # NB: output format is part of the ledger key, changing it reconverts everything
+        output_params = repr(sorted(AudioConverter.OUTPUT_PARAMS.items()))
+        self.config_hash = hashlib.sha256(output_params.encode()).hexdigest()
+
+    def _convert_item(self, item: BatchItem, ledger: JobLedger) -> Optional[Tuple[float, float]]:
+        """Probe and convert one file.
+
+        Returns conversion time and audio duration, or None if the output is up to date.
+        """
+        # NB: output names change when another input with the same name is added, paths don't
+        key = str(item.path)
+        content_hash = ledger.content_hash(key, item.path)
+        if not self.force and ledger.is_done(key, content_hash, self.config_hash):
+            return None
+        ledger.start(key, item.path, content_hash, self.config_hash)
+
+        started = time.monotonic()
+        output_path = self.output_dir / f"{item.output_name}.wav"
+        # NB: write-then-rename, so an interrupted run never leaves a truncated WAV behind
+        tmp_path = self.output_dir / f"{item.output_name}.part.wav"
+        try:
+            converter = AudioConverter(str(item.path), str(self.output_dir))
+            duration = converter.probe_duration()
+            converter._convert_to_wav(tmp_path)
+            os.replace(tmp_path, output_path)
+        except Exception as e:
+            ledger.fail(key, str(e))
+            raise
+
+        ledger.finish(key, output_path)
+        return time.monotonic() - started, duration
+
+    def run(self, sources: Iterable[str]) -> BatchStats:
+        """Convert all files found in directories, globs and CSV/JSONL manifests.
+
+        Raises ValueError before converting anything if outputs would clash or leave the output dir.
+        """
+        # NB: the output dir may sit inside an input dir, never take earlier results as inputs
+        items = collect_inputs(
+            sources, AudioConverter.SUPPORTED_FORMATS, exclude=[self.output_dir]
+        )
+        check_output_names(items, self.output_dir, ".wav")
+        self.logger.info(f"Files to convert: {len(items)}, jobs: {self.jobs}")
+        self.logger.info(f"Output directory: {self.output_dir}")
+
+        stats = BatchStats()
+        ledger = JobLedger(self.output_dir / LEDGER_FILENAME)
+        try:
+            jobs = run_bounded(lambda item: self._convert_item(item, ledger), items, self.jobs)
+            for idx, (item, future) in enumerate(jobs, 1):
+                prefix = f"[{idx}/{len(items)}] {item.path}"
+                try:
+                    result = future.result()
+                except Exception as e:
+                    stats.add_failure()
+                    self.logger.error(f"{prefix}: FAILED ({str(e).strip()})")
+                    continue
+
+                if result is None:
+                    stats.add_skipped()
+                    self.logger.info(f"{prefix}: up to date, skipped")
+                    continue
+
+                elapsed, duration = result
+                stats.add_success(elapsed, duration)
+                speed = duration / elapsed if elapsed else 0
+                self.logger.info(
+                    f"{prefix} -> {item.output_name}.wav: {duration:.1f} s of audio "
+                    f"in {elapsed:.2f} s ({speed:.1f}x realtime)"
+                )
+        finally:
+            ledger.close()
+
+        return stats
+
+
 @click.command()
 @click.argument('input_file', type=click.Path(exists=True), required=False)
 @click.option('--output-dir', default='output', help='Directory to save the output files')
 @click.option('--list-formats', is_flag=True, help='List supported audio formats')
+@click.option('--stdout', 'to_stdout', is_flag=True,
+              help='Write raw PCM (s16le, mono, 16kHz) to stdout instead of a WAV file')
+@click.option('--input', 'inputs', multiple=True,
+              help='Batch mode: directory, glob pattern or CSV/JSONL manifest '
+                   'with an audio_file column. Can be repeated.')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Batch mode: number of files converted at once (default: number of CPUs)')
+@click.option('--force', is_flag=True,
+              help='Batch mode: convert files even if their output is up to date')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose (DEBUG) logging')
 @click.option('--quiet', '-q', is_flag=True, help='Suppress informational (INFO) logging')
-def main(input_file: str, output_dir: str, list_formats: bool, verbose: bool, quiet: bool):
+def main(input_file: str, output_dir: str, list_formats: bool, to_stdout: bool,
+         inputs: Tuple[str, ...], jobs: Optional[int], force: bool, verbose: bool, quiet: bool):
     """Convert audio/video files to WAV format suitable for speech recognition.
     
     This utility can handle various audio and video formats and convert them to a standardized WAV format:
@@ -142,6 +285,9 @@ def main(input_file: str, output_dir: str, list_formats: bool, verbose: bool, qu
     - Optimizes conversion for speech recognition
     
     Supported input formats: MP3, WAV, M4A, AAC, OGG, FLAC, MP4 (video)
+
+    With --input, all matching files are converted in parallel to <output-dir>/<name>.wav,
+    skipping files converted by an earlier run.
     """
     if list_formats:
         click.echo("Supported input formats:")
@@ -149,7 +295,7 @@ def main(input_file: str, output_dir: str, list_formats: bool, verbose: bool, qu
             click.echo(f"  {fmt}")
         return
 
-    if not input_file:
+    if not input_file and not inputs:
         click.echo("Error: INPUT_FILE is required unless --list-formats is used.", err=True)
         # Show help message
         context = click.get_current_context()
@@ -168,14 +314,31 @@ def main(input_file: str, output_dir: str, list_formats: bool, verbose: bool, qu
         format='%(levelname)-8s %(message)s'
     )
         
+    if inputs:
+        # NB: per-file conversion details are too noisy for thousands of files
+        if not verbose:
+            logging.getLogger(AudioConverter.__name__).setLevel(logging.WARNING)
+
+        try:
+            stats = BatchConverter(output_dir, jobs, force).run(inputs)
+        except ValueError as e:
+            raise click.UsageError(str(e)) from e
+        logging.info(f"Summary:\n{stats.summary()}")
+        if stats.failed:
+            raise click.Abort()
+        return
+
     try:
         converter = AudioConverter(input_file, output_dir)
+        if to_stdout:
+            converter.stream_to_stdout()
+            return
         output_path = converter.process()
         logging.info(f"Success! Final WAV file: {output_path}")
         logging.info("The WAV file is now ready for speech recognition.")
     except Exception as e:
         logging.error(f"Operation failed: {str(e)}", exc_info=verbose)
-        raise click.Abort()
+        raise click.Abort() from e
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
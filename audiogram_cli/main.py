@@ -4,10 +4,14 @@ import click
 import urllib3
 from urllib3.exceptions import InsecureRequestWarning
 
+from audiogram_client.asr.batch_recognize import batch_recognize
 from audiogram_client.asr.file_recognize import file_recognize
+from audiogram_client.asr.loadtest import loadtest
 from audiogram_client.asr.recognize import recognize
+from audiogram_client.asr.rtp_recognize import rtp_recognize
 from audiogram_client.audio_archive.__main__ import audio_archive
 from audiogram_client.models_service import models_info
+from audiogram_client.tts.batch_synthesize import batch_synthesize
 from audiogram_client.tts.stream_synthesize import stream_synthesize
 from audiogram_client.tts.synthesize import synthesize
 from audiogram_client.voice_cloning.clone_voice import clone_voice
@@ -48,9 +52,13 @@ def models_group():
 
 asr_group.add_command(recognize, "stream")
 asr_group.add_command(file_recognize, "file")
+asr_group.add_command(batch_recognize, "batch")
+asr_group.add_command(loadtest, "loadtest")
+asr_group.add_command(rtp_recognize, "rtp")
 
 tts_group.add_command(synthesize, "file")
 tts_group.add_command(stream_synthesize, "stream")
+tts_group.add_command(batch_synthesize, "batch")
 
 voice_cloning_group.add_command(clone_voice, "clone")
 voice_cloning_group.add_command(get_task_info, "get-task-info")
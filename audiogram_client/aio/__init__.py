@@ -0,0 +1,11 @@
+from .asr import AsyncASRClient
+from .channel import create_aio_channel
+from .tts import AsyncTTSClient
+from .voice_cloning import AsyncVoiceCloningClient
+
+__all__ = [
+    "AsyncASRClient",
+    "AsyncTTSClient",
+    "AsyncVoiceCloningClient",
+    "create_aio_channel",
+]
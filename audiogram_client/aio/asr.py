@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
+import grpc
+
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc, stt_response_pb2
+
+
+class AsyncASRClient:
+    """asyncio client of the STT service.
+
+    Configs are built with `asr.utils.request.make_recognition_config` and
+    friends, exactly as in the CLI. Any number of calls can run
+    concurrently over one channel.
+    """
+
+    def __init__(
+        self,
+        channel: grpc.aio.Channel,
+        metadata: Sequence[tuple[str, str]] = (),
+        timeout: float | None = None,
+    ) -> None:
+        self._stub = stt_pb2_grpc.STTStub(channel)
+        self._metadata = tuple(metadata)
+        self._timeout = timeout
+
+    async def file_recognize(
+        self,
+        config: stt_pb2.RecognitionConfig,
+        audio: bytes | memoryview,
+    ) -> stt_response_pb2.FileRecognizeResponse:
+        request = stt_pb2.FileRecognizeRequest(config=config, audio=bytes(audio))
+        response: stt_response_pb2.FileRecognizeResponse = await self._stub.FileRecognize(
+            request,
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+
+        return response
+
+    async def recognize(
+        self,
+        config: stt_pb2.StreamRecognitionConfig,
+        audio_chunks: AsyncIterable[bytes | memoryview],
+    ) -> AsyncIterator[stt_response_pb2.RecognizeResponse]:
+        """Stream audio chunks and yield responses as the server sends them.
+
+        Chunks are sent as soon as the iterator produces them, pacing is up
+        to the caller.
+        """
+
+        async def request_iterator() -> AsyncIterator[stt_pb2.RecognizeRequest]:
+            yield stt_pb2.RecognizeRequest(config=config)
+            async for chunk in audio_chunks:
+                yield stt_pb2.RecognizeRequest(audio=bytes(chunk))
+
+        call = self._stub.Recognize(
+            request_iterator(),
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+        async for response in call:
+            yield response
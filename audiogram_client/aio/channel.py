@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import grpc
+
+from audiogram_client.common_utils.auth import SSOAuthPlugin
+from audiogram_client.common_utils.grpc import SSLCreds, channel_options
+
+
+class _AuthMetadataInterceptor:
+    """Add auth headers to every call on channels that can't carry call credentials."""
+
+    def __init__(self, auth_plugin: SSOAuthPlugin) -> None:
+        self._auth_plugin = auth_plugin
+
+    async def _with_auth(self, details: grpc.aio.ClientCallDetails) -> grpc.aio.ClientCallDetails:
+        # NB: an expired or missing token is fetched with a blocking HTTP request,
+        # so the plugin runs in a worker thread to keep the event loop responsive
+        auth_metadata = await asyncio.to_thread(self._auth_plugin.metadata)
+        metadata = grpc.aio.Metadata(*auth_metadata)
+        for key, value in details.metadata or ():
+            metadata.add(key, value)
+
+        return grpc.aio.ClientCallDetails(
+            details.method,
+            details.timeout,
+            metadata,
+            details.credentials,
+            details.wait_for_ready,
+        )
+
+
+class _UnaryUnaryAuthInterceptor(_AuthMetadataInterceptor, grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.aio.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        return await continuation(await self._with_auth(client_call_details), request)
+
+
+class _UnaryStreamAuthInterceptor(_AuthMetadataInterceptor, grpc.aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_stream(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.aio.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        return await continuation(await self._with_auth(client_call_details), request)
+
+
+class _StreamUnaryAuthInterceptor(_AuthMetadataInterceptor, grpc.aio.StreamUnaryClientInterceptor):
+    async def intercept_stream_unary(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.aio.ClientCallDetails,
+        request_iterator: Any,
+    ) -> Any:
+        return await continuation(await self._with_auth(client_call_details), request_iterator)
+
+
+class _StreamStreamAuthInterceptor(
+    _AuthMetadataInterceptor, grpc.aio.StreamStreamClientInterceptor
+):
+    async def intercept_stream_stream(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.aio.ClientCallDetails,
+        request_iterator: Any,
+    ) -> Any:
+        return await continuation(await self._with_auth(client_call_details), request_iterator)
+
+
+def create_aio_channel(
+    address: str,
+    ssl_creds: SSLCreds | None,
+    auth_plugin: SSOAuthPlugin | None = None,
+    compression: bool = False,
+) -> grpc.aio.Channel:
+    """Create asyncio channel with the same options and auth as `open_grpc_channel`.
+
+    Use as `async with create_aio_channel(...) as channel`.
+    """
+    options = channel_options()
+    channel_compression = grpc.Compression.Gzip if compression else None
+
+    if ssl_creds:
+        creds = grpc.ssl_channel_credentials(
+            root_certificates=ssl_creds.root_certificates,
+            private_key=ssl_creds.private_key,
+            certificate_chain=ssl_creds.certificate_chain,
+        )
+        if auth_plugin:
+            creds = grpc.composite_channel_credentials(
+                creds,
+                grpc.metadata_call_credentials(auth_plugin),
+            )
+
+        return grpc.aio.secure_channel(address, creds, options, channel_compression)
+
+    # NB: gRPC refuses call credentials on insecure channels, so inject headers instead;
+    # a channel applies an interceptor to a single kind of call, hence one per kind
+    interceptors = None
+    if auth_plugin:
+        interceptors = [
+            interceptor(auth_plugin)
+            for interceptor in (
+                _UnaryUnaryAuthInterceptor,
+                _UnaryStreamAuthInterceptor,
+                _StreamUnaryAuthInterceptor,
+                _StreamStreamAuthInterceptor,
+            )
+        ]
+    return grpc.aio.insecure_channel(address, options, channel_compression, interceptors)
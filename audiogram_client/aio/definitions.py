@@ -0,0 +1,3 @@
+from typing import Final
+
+CLONING_POLL_INTERVAL_S: Final = 1.0
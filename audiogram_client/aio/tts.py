@@ -0,0 +1,46 @@
+from collections.abc import AsyncIterator, Sequence
+
+import grpc
+
+from audiogram_client.genproto import tts_pb2, tts_pb2_grpc
+
+
+class AsyncTTSClient:
+    """asyncio client of the TTS service.
+
+    Requests are built with `tts.utils.request.make_tts_request`.
+    """
+
+    def __init__(
+        self,
+        channel: grpc.aio.Channel,
+        metadata: Sequence[tuple[str, str]] = (),
+        timeout: float | None = None,
+    ) -> None:
+        self._stub = tts_pb2_grpc.TTSStub(channel)
+        self._metadata = tuple(metadata)
+        self._timeout = timeout
+
+    async def synthesize(
+        self,
+        request: tts_pb2.SynthesizeSpeechRequest,
+    ) -> tts_pb2.SynthesizeSpeechResponse:
+        response: tts_pb2.SynthesizeSpeechResponse = await self._stub.Synthesize(
+            request,
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+
+        return response
+
+    async def stream_synthesize(
+        self,
+        request: tts_pb2.SynthesizeSpeechRequest,
+    ) -> AsyncIterator[tts_pb2.StreamingSynthesizeSpeechResponse]:
+        call = self._stub.StreamingSynthesize(
+            request,
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+        async for response in call:
+            yield response
@@ -0,0 +1,73 @@
+import asyncio
+from collections.abc import Sequence
+
+import grpc
+
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.genproto import stt_pb2, voice_cloning_pb2, voice_cloning_pb2_grpc
+
+from .definitions import CLONING_POLL_INTERVAL_S
+
+
+class AsyncVoiceCloningClient:
+    """asyncio client of the voice cloning service."""
+
+    def __init__(
+        self,
+        channel: grpc.aio.Channel,
+        metadata: Sequence[tuple[str, str]] = (),
+        timeout: float | None = None,
+    ) -> None:
+        self._stub = voice_cloning_pb2_grpc.VoiceCloningStub(channel)
+        self._metadata = tuple(metadata)
+        self._timeout = timeout
+
+    async def clone_voice(self, audio: AudioFile) -> str:
+        """Create cloning task from a voice sample, return task ID."""
+        request = voice_cloning_pb2.CloneVoiceRequest(
+            audio_format=voice_cloning_pb2.AudioFormat(
+                encoding=stt_pb2.LINEAR_PCM,
+                sample_rate_hertz=audio.sample_rate,
+                audio_channel_count=audio.channel_count,
+            ),
+            signal=audio.blob,
+        )
+        response: voice_cloning_pb2.TaskId = await self._stub.CloneVoice(
+            request,
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+
+        return response.val
+
+    async def get_task_info(self, task_id: str) -> voice_cloning_pb2.TaskInfo:
+        response: voice_cloning_pb2.TaskInfo = await self._stub.GetTaskInfo(
+            voice_cloning_pb2.TaskId(val=task_id),
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
+
+        return response
+
+    async def wait_for_voice(
+        self,
+        task_id: str,
+        poll_interval: float = CLONING_POLL_INTERVAL_S,
+    ) -> voice_cloning_pb2.TaskInfo:
+        """Poll the task until it leaves the CREATING state."""
+        while True:
+            info = await self.get_task_info(task_id)
+            if info.status not in (
+                voice_cloning_pb2.TaskInfo.Status.UNDEFINED,
+                voice_cloning_pb2.TaskInfo.Status.CREATING,
+            ):
+                return info
+
+            await asyncio.sleep(poll_interval)
+
+    async def delete_voice(self, voice_id: str) -> None:
+        await self._stub.DeleteVoice(
+            voice_cloning_pb2.DeleteVoiceRequest(voice_id=voice_id),
+            metadata=self._metadata,
+            timeout=self._timeout,
+        )
@@ -1,9 +1,15 @@
+from .batch_recognize import batch_recognize
 from .file_recognize import file_recognize
 from .get_models_info import get_models_info
+from .loadtest import loadtest
 from .recognize import recognize
+from .rtp_recognize import rtp_recognize
 
 __all__ = [
+    "batch_recognize",
     "get_models_info",
     "file_recognize",
+    "loadtest",
     "recognize",
+    "rtp_recognize",
 ]
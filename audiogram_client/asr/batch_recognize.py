@@ -0,0 +1,428 @@
+from collections.abc import Callable
+import functools
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import cast
+import wave
+
+import click
+import ffmpeg
+from google.protobuf.json_format import MessageToJson
+import grpc
+
+from audiogram_client.common_utils.arguments import common_options_in_settings
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.common_utils.auth import (
+    auth_metadata_from_settings,
+    auth_plugin_from_settings,
+)
+from audiogram_client.common_utils.batch import (
+    BatchItem,
+    BatchStats,
+    check_output_names,
+    collect_inputs,
+    run_bounded,
+)
+from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import (
+    DEFAULT_CHANNEL_POOL_SIZE,
+    DEFAULT_MAX_DECODERS,
+)
+from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.flac import encode_flac
+from audiogram_client.common_utils.grpc import ChannelPool, ssl_creds_from_settings
+from audiogram_client.common_utils.ledger import LEDGER_FILENAME, JobLedger
+from audiogram_client.common_utils.media import DecoderPool, is_media_file
+from audiogram_client.common_utils.types import (
+    ASAttackType,
+    UploadEncoding,
+    VADAlgo,
+    VADMode,
+    VAResponseMode,
+)
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc, stt_response_pb2
+
+from .utils.arguments import (
+    common_asr_options,
+    silence_trim_options,
+    transcript_cache_options,
+    upload_encoding_options,
+)
+from .utils.cache import TranscriptCache, cached_file_recognize
+from .utils.definitions import (
+    BATCH_AUDIO_SUFFIXES,
+    DEFAULT_BATCH_MAX_IN_FLIGHT,
+    DEFAULT_VAD_F_MIN_SILENCE_MS,
+    DEFAULT_VAD_F_MIN_SPEECH_MS,
+    DEFAULT_VAD_F_SPEECH_PAD_MS,
+    DEFAULT_VAD_F_THRESHOLD,
+)
+from .utils.request import (
+    make_antispoofing_config,
+    make_context_dictionary_config,
+    make_recognition_config,
+    make_speaker_labeling_config,
+    make_va_config,
+)
+from .utils.segmentation import cut_silence, trim_summary
+from .utils.timeline import OffsetMap, remap_response_times
+
+
+@click.command(
+    help="Offline (file) speech recognition of many files over one connection",
+)
+@errors_handler
+@common_options_in_settings
+@common_asr_options(
+    DEFAULT_VAD_F_THRESHOLD,
+    DEFAULT_VAD_F_MIN_SILENCE_MS,
+    DEFAULT_VAD_F_SPEECH_PAD_MS,
+    DEFAULT_VAD_F_MIN_SPEECH_MS,
+    with_audio_file=False,
+)
+@click.option(
+    "--input",
+    "inputs",
+    required=True,
+    multiple=True,
+    help="directory, glob pattern or CSV/JSONL manifest with `audio_file` column (can be repeated)",
+    metavar="<path|glob>",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True, resolve_path=True),
+    default="transcripts",
+    show_default=True,
+    help="directory for per-file JSON results",
+    metavar="<path>",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_MAX_IN_FLIGHT,
+    show_default=True,
+    help="max number of concurrent FileRecognize calls",
+)
+@click.option(
+    "--channels",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHANNEL_POOL_SIZE,
+    show_default=True,
+    help="number of gRPC connections to spread requests over",
+)
+@click.option(
+    "--max-decoders",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_DECODERS,
+    show_default=True,
+    help="max number of ffmpeg processes decoding media inputs (MP3, MP4, ...) at once",
+)
+@click.option(
+    "--resume/--no-resume",
+    default=True,
+    show_default=True,
+    help="skip files already recognized with the same config according to the job ledger "
+    f"({LEDGER_FILENAME} in output directory), results are recorded in it either way",
+)
+@click.option(
+    "--split-by-channel",
+    is_flag=True,
+    default=False,
+    help="recognize audio channels as separate speech tracks",
+)
+@transcript_cache_options()
+@upload_encoding_options()
+@silence_trim_options()
+def batch_recognize(
+    settings: SettingsProtocol,
+    inputs: tuple[str, ...],
+    output_dir: str,
+    max_in_flight: int,
+    channels: int,
+    max_decoders: int,
+    resume: bool,
+    model: str,
+    enable_word_time_offsets: bool,
+    enable_punctuator: bool,
+    enable_denormalization: bool,
+    enable_speaker_labeling: bool,
+    enable_genderage: bool,
+    enable_antispoofing: bool,
+    va_response_mode: VAResponseMode,
+    vad_algo: VADAlgo,
+    vad_mode: VADMode,
+    vad_threshold: float,
+    vad_speech_pad_ms: int,
+    vad_min_silence_ms: int,
+    vad_min_speech_ms: int,
+    dep_smoothed_window_threshold: float,
+    dep_smoothed_window_ms: int,
+    antispoofing_attack_type: ASAttackType | None,
+    antispoofing_far: int | None,
+    antispoofing_frr: int | None,
+    antispoofing_max_duration_for_analysis: int | None,
+    speakers_max: int | None,
+    speakers_num: int | None,
+    wfst_dictionary_name: str,
+    wfst_dictionary_weight: float,
+    split_by_channel: bool,
+    enhanced_vad_beginning_window_ms: int,
+    enhanced_vad_beginning_threshold: float,
+    enhanced_vad_ending_window_ms: int,
+    enhanced_vad_ending_threshold: float,
+    target_speech_vad_beginning_window_ms: int,
+    target_speech_vad_beginning_threshold: float,
+    target_speech_vad_ending_window_ms: int,
+    target_speech_vad_ending_threshold: float,
+    cache_dir: str,
+    no_cache: bool,
+    cache_max_size_mb: int,
+    encoding: UploadEncoding,
+    trim_silence: bool,
+    trim_threshold_dbfs: float,
+    trim_min_silence_ms: int,
+    trim_pad_ms: int,
+) -> None:
+    items = collect_inputs(inputs, BATCH_AUDIO_SUFFIXES)
+    try:
+        check_output_names(items, Path(output_dir), ".json")
+    except ValueError as err:
+        raise click.UsageError(str(err)) from err
+    if not items:
+        click.echo("No input audio files found")
+        return
+
+    auth_plugin = auth_plugin_from_settings(settings)
+    auth_metadata = auth_metadata_from_settings(settings, auth_plugin)
+
+    va_config = make_va_config(
+        vad_algo,
+        vad_mode,
+        vad_threshold,
+        vad_min_silence_ms,
+        vad_speech_pad_ms,
+        vad_min_speech_ms,
+        dep_smoothed_window_threshold,
+        dep_smoothed_window_ms,
+        enhanced_vad_beginning_window_ms,
+        enhanced_vad_beginning_threshold,
+        enhanced_vad_ending_window_ms,
+        enhanced_vad_ending_threshold,
+        target_speech_vad_beginning_window_ms,
+        target_speech_vad_beginning_threshold,
+        target_speech_vad_ending_window_ms,
+        target_speech_vad_ending_threshold,
+    )
+    as_config = make_antispoofing_config(
+        enable_antispoofing,
+        antispoofing_attack_type,
+        antispoofing_far,
+        antispoofing_frr,
+        antispoofing_max_duration_for_analysis,
+    )
+    sl_config = make_speaker_labeling_config(
+        enable_speaker_labeling,
+        speakers_max,
+        speakers_num,
+    )
+    wfst_config = make_context_dictionary_config(
+        wfst_dictionary_name,
+        wfst_dictionary_weight,
+    )
+    # NB: audio parameters are filled in per file, see _recognize_file
+    base_config = make_recognition_config(
+        model,
+        va_config,
+        va_response_mode,
+        0,
+        0,
+        enable_genderage,
+        enable_word_time_offsets,
+        enable_punctuator,
+        enable_denormalization,
+        as_config,
+        sl_config,
+        wfst_config,
+        split_by_channel,
+        encoding.pb2_value,
+    )
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    config_digest = hashlib.sha256(base_config.SerializeToString(deterministic=True))
+    trim: Callable[[AudioFile], tuple[AudioFile, OffsetMap]] | None = None
+    if trim_silence:
+        # NB: trimmed audio gives different results, so trimming settings are a part of the job
+        config_digest.update(repr((trim_threshold_dbfs, trim_min_silence_ms, trim_pad_ms)).encode())
+        trim = functools.partial(
+            cut_silence,
+            windows=[],
+            threshold_dbfs=trim_threshold_dbfs,
+            min_silence_ms=trim_min_silence_ms,
+            pad_ms=trim_pad_ms,
+        )
+    config_hash = config_digest.hexdigest()
+    ledger = JobLedger(output_path / LEDGER_FILENAME)
+    cache = None if no_cache else TranscriptCache(Path(cache_dir), cache_max_size_mb)
+
+    click.echo(
+        f"Files to recognize: {len(items)}\n"
+        f"Max in-flight requests: {max_in_flight}\n"
+        f"Channels: {channels}\n"
+        f"Upload encoding: {encoding}\n"
+        f"Silence trimming: {trim_silence}\n"
+        f"Output directory: {output_path}\n"
+        f"Resume from ledger: {resume}\n"
+    )
+    click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+
+    stats = BatchStats()
+    sent_seconds = 0.0
+    # NB: decoding happens inside the in-flight window, so a slow server stops ffmpeg
+    # from running ahead and memory stays bounded by --max-in-flight decoded files
+    decoders = DecoderPool(max_decoders)
+
+    ssl_creds = ssl_creds_from_settings(settings)
+
+    with ChannelPool(channels, settings.use_gzip) as pool:
+
+        def recognize_item(item: BatchItem) -> tuple[float, float, float] | None:
+            return _recognize_file(
+                stt_pb2_grpc.STTStub(pool.get(settings.api_address, ssl_creds, auth_plugin)),
+                item,
+                base_config,
+                config_hash,
+                output_path,
+                ledger,
+                resume,
+                cache,
+                auth_metadata,
+                settings.timeout,
+                encoding,
+                decoders,
+                trim,
+            )
+
+        for idx, (item, future) in enumerate(run_bounded(recognize_item, items, max_in_flight), 1):
+            prefix = f"[{idx}/{len(items)}] {item.path}"
+            try:
+                result = future.result()
+            except grpc.RpcError as err:
+                err_call = cast(grpc.Call, err)
+                stats.add_failure()
+                click.echo(f"{prefix}: FAILED ({err_call.code()}: {err_call.details()})")
+                continue
+            except (OSError, ValueError, wave.Error, ffmpeg.Error) as err:
+                stats.add_failure()
+                click.echo(f"{prefix}: FAILED ({err})")
+                continue
+
+            if result is None:
+                stats.add_skipped()
+                click.echo(f"{prefix}: already done, skipped")
+                continue
+
+            latency, audio_seconds, file_sent_seconds = result
+            stats.add_success(latency, audio_seconds)
+            sent_seconds += file_sent_seconds
+            click.echo(f"{prefix}: done in {latency:.2f} s")
+
+        click.echo(f"\n{pool.stats()}")
+
+    ledger.close()
+
+    click.echo(f"\n{stats.summary()}")
+    if trim:
+        analyzed_ms = round(stats.audio_seconds * 1000)
+        click.echo(f"Silence trimming: {trim_summary(analyzed_ms, round(sent_seconds * 1000))}")
+    if cache:
+        click.echo(f"Transcript cache: {cache.stats()}")
+
+
+def _recognize_file(
+    stub: stt_pb2_grpc.STTStub,
+    item: BatchItem,
+    base_config: stt_pb2.RecognitionConfig,
+    config_hash: str,
+    output_dir: Path,
+    ledger: JobLedger,
+    resume: bool,
+    cache: TranscriptCache | None,
+    metadata: list[tuple[str, str]],
+    timeout: float,
+    encoding: UploadEncoding,
+    decoders: DecoderPool,
+    trim: Callable[[AudioFile], tuple[AudioFile, OffsetMap]] | None,
+) -> tuple[float, float, float] | None:
+    """Recognize one file and store the JSON result.
+
+    Return latency, audio length and length of audio sent after trimming,
+    or None if resuming and the ledger shows that the same file was already
+    recognized with the same config.
+    """
+    # NB: output names change when another input with the same name is added, paths don't
+    key = str(item.path)
+    content_hash = ledger.content_hash(key, item.path)
+    if resume and ledger.is_done(key, content_hash, config_hash):
+        return None
+    ledger.start(key, item.path, content_hash, config_hash)
+
+    try:
+        if is_media_file(item.path):
+            audio = decoders.decode(item.path)
+        else:
+            audio = AudioFile(str(item.path))
+        with audio:
+            config = stt_pb2.RecognitionConfig()
+            config.CopyFrom(base_config)
+            config.sample_rate_hertz = audio.sample_rate
+            config.audio_channel_count = audio.channel_count
+            audio_seconds = audio.duration_ms / 1000
+
+            pcm = audio.pcm
+            offset_map = None
+            if trim is not None:
+                trimmed, offset_map = trim(audio)
+                pcm = trimmed.pcm
+            sent_seconds = len(pcm) / audio.frame_size / audio.sample_rate
+
+            encode = None
+            if encoding == UploadEncoding.flac:
+                encode = functools.partial(
+                    encode_flac,
+                    sample_rate=audio.sample_rate,
+                    channel_count=audio.channel_count,
+                )
+
+            started = time.monotonic()
+            if pcm:
+                response = cached_file_recognize(
+                    stub, config, pcm, metadata, timeout, cache, encode
+                )
+            else:
+                # NB: trimming left no speech, an empty result is stored without a call
+                response = stt_response_pb2.FileRecognizeResponse()
+            latency = time.monotonic() - started
+
+        if offset_map is not None:
+            for result in response.response:
+                remap_response_times(result, offset_map)
+
+        # NB: write-then-rename, so an interrupted run never leaves a truncated result
+        output_file = output_dir / f"{item.output_name}.json"
+        tmp_file = output_file.with_suffix(".json.tmp")
+        tmp_file.write_text(
+            MessageToJson(response, preserving_proto_field_name=True, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, output_file)
+    except Exception as err:
+        ledger.fail(key, str(err))
+        raise
+
+    ledger.finish(key, output_file)
+
+    return latency, audio_seconds, sent_seconds
@@ -1,4 +1,6 @@
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+import functools
+from pathlib import Path
 
 import click
 from google.protobuf.json_format import MessageToJson
@@ -6,14 +8,31 @@ import grpc
 
 from audiogram_client.common_utils.arguments import common_options_in_settings
 from audiogram_client.common_utils.audio import AudioFile
-from audiogram_client.common_utils.auth import get_auth_metadata
+from audiogram_client.common_utils.auth import (
+    auth_metadata_from_settings,
+    auth_plugin_from_settings,
+)
+from audiogram_client.common_utils.batch import run_bounded
 from audiogram_client.common_utils.config import SettingsProtocol
 from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.flac import encode_flac
 from audiogram_client.common_utils.grpc import open_grpc_channel, print_metadata, ssl_creds_from_settings
-from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
+from audiogram_client.common_utils.media import decode_media, is_media_file
+from audiogram_client.common_utils.types import UploadEncoding
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc, stt_response_pb2
 
-from .utils.arguments import common_asr_options
+from .utils.arguments import (
+    audio_window_options,
+    common_asr_options,
+    result_output_options,
+    silence_trim_options,
+    transcript_cache_options,
+    upload_encoding_options,
+    window_ranges,
+)
+from .utils.cache import TranscriptCache, cached_file_recognize
 from .utils.definitions import (
+    DEFAULT_MAX_PARALLEL_SEGMENTS,
     DEFAULT_VAD_F_MIN_SILENCE_MS,
     DEFAULT_VAD_F_MIN_SPEECH_MS,
     DEFAULT_VAD_F_SPEECH_PAD_MS,
@@ -28,6 +47,16 @@ from .utils.request import (
     make_va_config,
 )
 from .utils.response import print_recognize_response
+from .utils.segmentation import (
+    Segment,
+    audio_windows,
+    cut_silence,
+    format_windows,
+    split_on_silence,
+    trim_summary,
+)
+from .utils.timeline import OffsetMap, merge_file_responses, remap_response_times
+from .utils.writers import ResultWriters
 
 
 @click.command(
@@ -53,6 +82,25 @@ from .utils.response import print_recognize_response
     default=False,
     help="print JSON representation of the request config and metadata (audio not included)",
 )
+@click.option(
+    "--segment-len",
+    type=click.IntRange(min=10),
+    default=None,
+    help="split audio longer than this at pauses and recognize segments in parallel",
+    metavar="<seconds>",
+)
+@click.option(
+    "--max-parallel-segments",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_PARALLEL_SEGMENTS,
+    show_default=True,
+    help="max number of segments recognized at once (with --segment-len)",
+)
+@transcript_cache_options()
+@upload_encoding_options()
+@audio_window_options()
+@silence_trim_options()
+@result_output_options()
 def file_recognize(
     settings: SettingsProtocol,
     audio_file: str,
@@ -90,20 +138,29 @@ def file_recognize(
     target_speech_vad_ending_window_ms: int,
     target_speech_vad_ending_threshold: float,
     dump_json_request: bool,
+    segment_len: int | None,
+    max_parallel_segments: int,
+    cache_dir: str,
+    no_cache: bool,
+    cache_max_size_mb: int,
+    encoding: UploadEncoding,
+    start_ms: int | None,
+    end_ms: int | None,
+    ranges: tuple[tuple[int, int | None], ...],
+    trim_silence: bool,
+    trim_threshold_dbfs: float,
+    trim_min_silence_ms: int,
+    trim_pad_ms: int,
+    outputs: tuple[str, ...],
+    quiet: bool,
 ) -> None:
-    auth_metadata = get_auth_metadata(
-        settings.sso_url,
-        settings.realm,
-        settings.client_id,
-        settings.client_secret,
-        settings.iam_account,
-        settings.iam_workspace,
-        settings.verify_sso,
-    )
-    auth_metadata.append(("x-ai-account", "demo"))
-    auth_metadata.append(("x-ai-workspace", "default"))
-
-    audio = AudioFile(audio_file)
+    ranges_ms = window_ranges(start_ms, end_ms, ranges)
+    # NB: media files are decoded straight into memory, no intermediate WAV is written
+    audio = decode_media(audio_file) if is_media_file(audio_file) else AudioFile(audio_file)
+    try:
+        windows = audio_windows(audio, ranges_ms) if ranges_ms else []
+    except ValueError as err:
+        raise click.UsageError(str(err)) from err
 
     click.echo(
         f"Request parameters:\n"
@@ -117,6 +174,9 @@ def file_recognize(
         f"Word time offsets enabled: {enable_word_time_offsets}\n"
         f"Antispoofing enabled: {enable_antispoofing}\n"
         f"Split by channel: {split_by_channel}\n"
+        f"Segment length: {f'{segment_len} s' if segment_len else 'disabled'}\n"
+        f"Upload encoding: {encoding}\n"
+        f"Audio ranges: {format_windows(windows)}\n"
     )
 
     va_config = make_va_config(
@@ -167,6 +227,7 @@ def file_recognize(
         sl_config,
         wfst_config,
         split_by_channel,
+        encoding.pb2_value,
     )
     if dump_json_request:
         try:
@@ -179,31 +240,146 @@ def file_recognize(
         except Exception as exc:
             click.echo(f"Failed to dump JSON request: {exc}\n")
 
-    click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+    offset_map: OffsetMap | None = None
+    if trim_silence:
+        analyzed_ms = sum(w.duration_ms for w in windows) if windows else audio.duration_ms
+        audio, offset_map = cut_silence(
+            audio, windows, trim_threshold_dbfs, trim_min_silence_ms, trim_pad_ms
+        )
+        # NB: windows are cut out along with the silence, the offset map covers both
+        windows = []
+        click.echo(f"Silence trimming: {trim_summary(analyzed_ms, audio.duration_ms)}\n")
 
-    # Create the request
-    request = stt_pb2.FileRecognizeRequest(
-        config=recognition_config,
-        audio=audio.blob,
-    )
+    if not audio.frame_count:
+        click.echo("No speech found in the audio, nothing to recognize")
+        return
 
-    with open_grpc_channel(
-        settings.api_address,
-        ssl_creds_from_settings(settings),
-    ) as channel:
-        stub = stt_pb2_grpc.STTStub(channel)
-
-        response: stt_pb2.FileRecognizeResponse
-        call: grpc.Call
-        response, call = stub.FileRecognize.with_call(
-            request,
-            metadata=auth_metadata,
-            timeout=settings.timeout,
+    # NB: only the selected windows are sent, every part is shifted back to file time on merge
+    segments = windows
+    if segment_len:
+        segments = [
+            segment
+            for window in windows or [Segment(0, audio.frame_count, audio.sample_rate)]
+            for segment in split_on_silence(audio, segment_len * 1000, bounds=window)
+        ]
+    encode: Callable[[bytes | memoryview], bytes] | None = None
+    if encoding == UploadEncoding.flac:
+        encode = functools.partial(
+            encode_flac,
+            sample_rate=audio.sample_rate,
+            channel_count=audio.channel_count,
         )
 
-        click.echo("Response metadata:")
-        print_metadata(call.initial_metadata())
+    cache = None if no_cache else TranscriptCache(Path(cache_dir), cache_max_size_mb)
+    cache_key = ""
+    response: stt_response_pb2.FileRecognizeResponse | None = None
+    if cache and not windows and len(segments) <= 1:
+        cache_key = TranscriptCache.make_key(audio.pcm, recognition_config)
+        response = cache.get(cache_key)
+
+    if response is not None:
+        click.echo("Response served from local cache\n")
+    else:
+        # NB: token is only fetched when the request actually leaves the machine
+        auth_plugin = auth_plugin_from_settings(settings)
+        auth_metadata = auth_metadata_from_settings(settings, auth_plugin)
+
+        click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+
+        with open_grpc_channel(
+            settings.api_address,
+            ssl_creds_from_settings(settings),
+            auth_plugin,
+            settings.use_gzip,
+        ) as channel:
+            stub = stt_pb2_grpc.STTStub(channel)
+
+            if windows or len(segments) > 1:
+                response = _recognize_segments(
+                    stub,
+                    audio,
+                    recognition_config,
+                    segments,
+                    max_parallel_segments,
+                    auth_metadata,
+                    settings.timeout,
+                    cache,
+                    encode,
+                )
+            else:
+                # Create the request
+                request = stt_pb2.FileRecognizeRequest(
+                    config=recognition_config,
+                    audio=encode(audio.pcm) if encode else audio.blob,
+                )
+                if encode:
+                    click.echo(
+                        f"FLAC upload: {len(request.audio) / 1024:.0f} KB, "
+                        f"{len(request.audio) / len(audio.pcm):.0%} of PCM\n"
+                    )
 
+                call: grpc.Call
+                response, call = stub.FileRecognize.with_call(
+                    request,
+                    metadata=auth_metadata,
+                    timeout=settings.timeout,
+                )
+
+                click.echo("Response metadata:")
+                print_metadata(call.initial_metadata())
+
+                if cache:
+                    cache.put(cache_key, response)
+
+    if offset_map is not None:
+        for result in response.response:
+            remap_response_times(result, offset_map)
+
+    result_channels = audio.channel_count if split_by_channel else 1
+    with ResultWriters(outputs, result_channels) as writers:
         for idx, result in enumerate(response.response, 1):
-            click.echo(f"\nResult {idx}:")
-            print_recognize_response(result, True)
+            writers.write(result)
+            if not quiet:
+                click.echo(f"\nResult {idx}:")
+                print_recognize_response(result, True)
+
+    for output in outputs:
+        click.echo(f"\nResults written to {output}")
+
+    if cache:
+        click.echo(f"\nTranscript cache: {cache.stats()}")
+
+
+def _recognize_segments(
+    stub: stt_pb2_grpc.STTStub,
+    audio: AudioFile,
+    config: stt_pb2.RecognitionConfig,
+    segments: list[Segment],
+    max_parallel: int,
+    metadata: list[tuple[str, str]],
+    timeout: float,
+    cache: TranscriptCache | None,
+    encode: Callable[[bytes | memoryview], bytes] | None,
+) -> stt_response_pb2.FileRecognizeResponse:
+    """Recognize segments concurrently and merge results into the original timeline.
+
+    With `encode`, every segment is compressed in its own worker, so encoding
+    of one segment overlaps with uploading the others.
+    """
+    click.echo(f"Recognizing {len(segments)} segments, up to {max_parallel} in parallel\n")
+
+    def recognize_segment(segment: Segment) -> stt_response_pb2.FileRecognizeResponse:
+        return cached_file_recognize(
+            stub, config, segment.pcm(audio), metadata, timeout, cache, encode
+        )
+
+    parts = {}
+    for segment, future in run_bounded(recognize_segment, segments, max_parallel):
+        parts[segment] = future.result()
+        click.echo(
+            f"Segment {segment.start_ms / 1000:.2f}s "
+            f"(+{segment.duration_ms / 1000:.2f}s) recognized "
+            f"[{len(parts)}/{len(segments)}]"
+        )
+
+    return merge_file_responses((segment.start_ms, parts[segment]) for segment in segments)
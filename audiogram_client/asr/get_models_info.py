@@ -29,6 +29,7 @@ def get_models_info(
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        compression=settings.use_gzip,
     ) as channel:
         stub = stt_pb2_grpc.STTStub(channel)
         response: stt_pb2.ModelsInfo
@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import threading
+import time
+
+import click
+
+from audiogram_client.common_utils.arguments import common_options_in_settings
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.common_utils.auth import (
+    auth_metadata_from_settings,
+    auth_plugin_from_settings,
+)
+from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import DEFAULT_CHANNEL_POOL_SIZE
+from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.grpc import ChannelPool, ssl_creds_from_settings
+from audiogram_client.common_utils.types import ASAttackType, VADAlgo, VADMode, VAResponseMode
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
+
+from .utils.arguments import common_asr_options
+from .utils.definitions import (
+    DEFAULT_LOADTEST_STREAMS,
+    DEFAULT_VAD_S_MIN_SILENCE_MS,
+    DEFAULT_VAD_S_MIN_SPEECH_MS,
+    DEFAULT_VAD_S_SPEECH_PAD_MS,
+    DEFAULT_VAD_S_THRESHOLD,
+    LOADTEST_CHUNK_LEN_MS,
+)
+from .utils.loadtest import LoadTestStats, StreamResult, run_stream
+from .utils.request import (
+    make_antispoofing_config,
+    make_context_dictionary_config,
+    make_recognition_config,
+    make_speaker_labeling_config,
+    make_va_config,
+)
+
+
+@click.command(
+    help="Load test of online (stream) speech recognition with concurrent streams",
+)
+@errors_handler
+@common_options_in_settings
+@common_asr_options(
+    DEFAULT_VAD_S_THRESHOLD,
+    DEFAULT_VAD_S_MIN_SILENCE_MS,
+    DEFAULT_VAD_S_SPEECH_PAD_MS,
+    DEFAULT_VAD_S_MIN_SPEECH_MS,
+)
+@click.option(
+    "--streams",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LOADTEST_STREAMS,
+    show_default=True,
+    help="number of concurrent Recognize streams at full load",
+)
+@click.option(
+    "--ramp-step",
+    type=click.IntRange(min=1),
+    default=None,
+    help="start streams in groups of this size (default: all at once)",
+)
+@click.option(
+    "--ramp-interval",
+    type=click.FloatRange(min=0),
+    default=10.0,
+    show_default=True,
+    help="seconds between starting two groups of streams",
+    metavar="<seconds>",
+)
+@click.option(
+    "--duration",
+    type=click.FloatRange(min=0),
+    default=0,
+    help="keep replaying audio in every stream slot for this long (default: replay once)",
+    metavar="<seconds>",
+)
+@click.option(
+    "--speed",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="audio sending pace relative to real time (0 - as fast as possible)",
+)
+@click.option(
+    "--chunk-len",
+    "chunk_len_ms",
+    type=click.IntRange(10, 2000),
+    default=LOADTEST_CHUNK_LEN_MS,
+    show_default=True,
+    help="audio chunk length in milliseconds",
+)
+@click.option(
+    "--interim-results/--no-interim-results",
+    default=True,
+    show_default=True,
+    help="request partial results (needed for time to first partial)",
+)
+@click.option(
+    "--channels",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHANNEL_POOL_SIZE,
+    show_default=True,
+    help="number of gRPC connections to spread streams over",
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="write JSON report with run parameters and latency percentiles",
+    metavar="<path>",
+)
+def loadtest(
+    settings: SettingsProtocol,
+    audio_file: str,
+    streams: int,
+    ramp_step: int | None,
+    ramp_interval: float,
+    duration: float,
+    speed: float,
+    chunk_len_ms: int,
+    interim_results: bool,
+    channels: int,
+    report: str | None,
+    model: str,
+    enable_word_time_offsets: bool,
+    enable_punctuator: bool,
+    enable_denormalization: bool,
+    enable_speaker_labeling: bool,
+    enable_genderage: bool,
+    enable_antispoofing: bool,
+    va_response_mode: VAResponseMode,
+    vad_algo: VADAlgo,
+    vad_mode: VADMode,
+    vad_threshold: float,
+    vad_speech_pad_ms: int,
+    vad_min_silence_ms: int,
+    vad_min_speech_ms: int,
+    dep_smoothed_window_threshold: float,
+    dep_smoothed_window_ms: int,
+    antispoofing_attack_type: ASAttackType | None,
+    antispoofing_far: int | None,
+    antispoofing_frr: int | None,
+    antispoofing_max_duration_for_analysis: int | None,
+    speakers_max: int | None,
+    speakers_num: int | None,
+    wfst_dictionary_name: str,
+    wfst_dictionary_weight: float,
+    enhanced_vad_beginning_window_ms: int,
+    enhanced_vad_beginning_threshold: float,
+    enhanced_vad_ending_window_ms: int,
+    enhanced_vad_ending_threshold: float,
+    target_speech_vad_beginning_window_ms: int,
+    target_speech_vad_beginning_threshold: float,
+    target_speech_vad_ending_window_ms: int,
+    target_speech_vad_ending_threshold: float,
+) -> None:
+    auth_plugin = auth_plugin_from_settings(settings)
+    auth_metadata = auth_metadata_from_settings(settings, auth_plugin)
+
+    audio = AudioFile(audio_file)
+    ramp_step = ramp_step or streams
+
+    click.echo(
+        f"Load test parameters:\n"
+        f"Audio: {audio_file} ({audio.duration_ms / 1000:.1f} s)\n"
+        f"Streams: {streams}, started by {ramp_step} every {ramp_interval:g} s\n"
+        f"Duration: {f'{duration:g} s' if duration else 'single replay'}\n"
+        f"Speed: {f'{speed:g}x' if speed else 'unpaced'}, chunk length: {chunk_len_ms} ms\n"
+        f"Channels: {channels}\n"
+    )
+
+    va_config = make_va_config(
+        vad_algo,
+        vad_mode,
+        vad_threshold,
+        vad_min_silence_ms,
+        vad_speech_pad_ms,
+        vad_min_speech_ms,
+        dep_smoothed_window_threshold,
+        dep_smoothed_window_ms,
+        enhanced_vad_beginning_window_ms,
+        enhanced_vad_beginning_threshold,
+        enhanced_vad_ending_window_ms,
+        enhanced_vad_ending_threshold,
+        target_speech_vad_beginning_window_ms,
+        target_speech_vad_beginning_threshold,
+        target_speech_vad_ending_window_ms,
+        target_speech_vad_ending_threshold,
+    )
+    as_config = make_antispoofing_config(
+        enable_antispoofing,
+        antispoofing_attack_type,
+        antispoofing_far,
+        antispoofing_frr,
+        antispoofing_max_duration_for_analysis,
+    )
+    sl_config = make_speaker_labeling_config(
+        enable_speaker_labeling,
+        speakers_max,
+        speakers_num,
+    )
+    wfst_config = make_context_dictionary_config(
+        wfst_dictionary_name,
+        wfst_dictionary_weight,
+    )
+    recognition_config = make_recognition_config(
+        model,
+        va_config,
+        va_response_mode,
+        audio.sample_rate,
+        audio.channel_count,
+        enable_genderage,
+        enable_word_time_offsets,
+        enable_punctuator,
+        enable_denormalization,
+        as_config,
+        sl_config,
+        wfst_config,
+    )
+    stream_recognition_config = stt_pb2.StreamRecognitionConfig(
+        config=recognition_config,
+        interim_results=interim_results,
+    )
+
+    click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+
+    ssl_creds = ssl_creds_from_settings(settings)
+    stats = LoadTestStats()
+    deadline = stats.started + duration
+    active = 0
+    active_lock = threading.Lock()
+
+    def report_result(result: StreamResult) -> None:
+        stats.add(result)
+        if result.error:
+            status = f"FAILED ({result.error})"
+        else:
+            first_partial = (
+                f"{result.first_partial * 1000:.0f} ms" if result.first_partial is not None else "-"
+            )
+            status = f"first partial {first_partial}, RTF {result.rtf:.3f}"
+        click.echo(f"[stream {result.stream_id}, {active} active] {status}")
+
+    with ChannelPool(channels, settings.use_gzip) as pool:
+
+        def stream_slot(slot: int) -> None:
+            nonlocal active
+            time.sleep(slot // ramp_step * ramp_interval)
+            stub = stt_pb2_grpc.STTStub(pool.get(settings.api_address, ssl_creds, auth_plugin))
+
+            replay = 0
+            while True:
+                with active_lock:
+                    active += 1
+                result = run_stream(
+                    stub,
+                    stream_recognition_config,
+                    audio,
+                    chunk_len_ms,
+                    speed,
+                    auth_metadata,
+                    settings.timeout,
+                    slot * 1000 + replay,
+                )
+                with active_lock:
+                    active -= 1
+                report_result(result)
+
+                replay += 1
+                if time.monotonic() >= deadline:
+                    return
+
+        with ThreadPoolExecutor(max_workers=streams) as executor:
+            for future in [executor.submit(stream_slot, slot) for slot in range(streams)]:
+                future.result()
+
+        click.echo(f"\n{pool.stats()}")
+
+    click.echo(f"\n{stats.summary()}")
+
+    if report:
+        report_data = {
+            "audio_file": audio_file,
+            "audio_seconds": audio.duration_ms / 1000,
+            "streams": streams,
+            "ramp_step": ramp_step,
+            "ramp_interval_s": ramp_interval,
+            "duration_s": duration,
+            "speed": speed,
+            "chunk_len_ms": chunk_len_ms,
+            "channels": channels,
+            "api_address": settings.api_address,
+            **stats.to_dict(),
+        }
+        Path(report).write_text(json.dumps(report_data, indent=2), encoding="utf-8")
+        click.echo(f"\nReport stored in {report}")
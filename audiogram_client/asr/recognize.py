@@ -1,19 +1,41 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+import os
+from typing import cast
 
 import click
 from google.protobuf.json_format import MessageToJson
 import grpc
 
 from audiogram_client.common_utils.arguments import common_options_in_settings
-from audiogram_client.common_utils.audio import AudioFile
-from audiogram_client.common_utils.auth import get_auth_metadata
+from audiogram_client.common_utils.audio import AudioFile, AudioStream
+from audiogram_client.common_utils.auth import (
+    auth_metadata_from_settings,
+    auth_plugin_from_settings,
+)
 from audiogram_client.common_utils.config import SettingsProtocol
 from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.flac import encode_flac_stream
 from audiogram_client.common_utils.grpc import open_grpc_channel, print_metadata, ssl_creds_from_settings
-from audiogram_client.common_utils.types import ASAttackType, VADAlgo, VADMode, VAResponseMode
+from audiogram_client.common_utils.media import MediaStream, is_media_file
+from audiogram_client.common_utils.pacing import Pacer
+from audiogram_client.common_utils.types import (
+    ASAttackType,
+    AudioFormat,
+    UploadEncoding,
+    VADAlgo,
+    VADMode,
+    VAResponseMode,
+)
 from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
 
-from .utils.arguments import common_asr_options
+from .utils.arguments import (
+    audio_window_options,
+    common_asr_options,
+    result_output_options,
+    silence_trim_options,
+    upload_encoding_options,
+    window_ranges,
+)
 from .utils.definitions import (
     CHUNK_LEN_MS,
     DEFAULT_VAD_S_MIN_SILENCE_MS,
@@ -30,6 +52,9 @@ from .utils.request import (
     stream_request_iterator,
 )
 from .utils.response import print_recognize_response
+from .utils.segmentation import Segment, audio_windows, cut_silence, format_windows, trim_summary
+from .utils.timeline import OffsetMap, TimeMapper, remap_response_times
+from .utils.writers import ResultWriters
 
 
 @click.command(
@@ -42,6 +67,42 @@ from .utils.response import print_recognize_response
     DEFAULT_VAD_S_MIN_SILENCE_MS,
     DEFAULT_VAD_S_SPEECH_PAD_MS,
     DEFAULT_VAD_S_MIN_SPEECH_MS,
+    with_audio_file=False,
+)
+@click.option(
+    "--audio-file",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True, resolve_path=True),
+    help="path to an audio file or a named pipe, `-` to read from stdin "
+    "(media files such as MP3 or MP4 are decoded with ffmpeg on the fly)",
+    metavar="<path>",
+)
+@click.option(
+    "--unix-socket",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help="read audio from a Unix domain socket instead of a file",
+    metavar="<path>",
+)
+@click.option(
+    "--format",
+    "audio_format",
+    type=click.Choice(cast(Sequence[str], AudioFormat)),
+    default=AudioFormat.wav,
+    show_default=True,
+    help="input audio format, `s16le` is raw 16-bit little-endian PCM without a header",
+)
+@click.option(
+    "--rate",
+    "sample_rate",
+    type=click.IntRange(min=1),
+    help="sample rate of raw PCM input in Hz (required for `--format s16le`)",
+)
+@click.option(
+    "--channels",
+    "channel_count",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="channel count of raw PCM input",
 )
 @click.option(
     "--single-utterance",
@@ -62,6 +123,13 @@ from .utils.response import print_recognize_response
     default=False,
     help="enable emulation of real-time audio streaming",
 )
+@click.option(
+    "--speed",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="pace multiplier for real-time emulation (eg. 0.5, 2, 10)",
+)
 @click.option(
     "--chunk-len",
     "chunk_len_ms",
@@ -69,9 +137,17 @@ from .utils.response import print_recognize_response
     default=CHUNK_LEN_MS,
     help="set audio chunk length in milliseconds (from 500 to 2000)",
 )
+@upload_encoding_options()
+@audio_window_options()
+@silence_trim_options()
+@result_output_options()
 def recognize(
     settings: SettingsProtocol,
-    audio_file: str,
+    audio_file: str | None,
+    unix_socket: str | None,
+    audio_format: AudioFormat,
+    sample_rate: int | None,
+    channel_count: int,
     model: str,
     enable_word_time_offsets: bool,
     enable_punctuator: bool,
@@ -99,6 +175,7 @@ def recognize(
     single_utterance: bool,
     interim_results: bool,
     realtime: bool,
+    speed: float,
     chunk_len_ms: int,
     enhanced_vad_beginning_window_ms: int,
     enhanced_vad_beginning_threshold: float,
@@ -108,6 +185,16 @@ def recognize(
     target_speech_vad_beginning_threshold: float,
     target_speech_vad_ending_window_ms: int,
     target_speech_vad_ending_threshold: float,
+    encoding: UploadEncoding,
+    start_ms: int | None,
+    end_ms: int | None,
+    ranges: tuple[tuple[int, int | None], ...],
+    trim_silence: bool,
+    trim_threshold_dbfs: float,
+    trim_min_silence_ms: int,
+    trim_pad_ms: int,
+    outputs: tuple[str, ...],
+    quiet: bool,
     dump_json_request: bool = click.option(
         "--dump-json-request",
         is_flag=True,
@@ -115,19 +202,46 @@ def recognize(
         help="print JSON representation of the request config and metadata (audio not included)",
     )(lambda: None),
 ) -> None:
-    auth_metadata = get_auth_metadata(
-        settings.sso_url,
-        settings.realm,
-        settings.client_id,
-        settings.client_secret,
-        settings.iam_account,
-        settings.iam_workspace,
-        settings.verify_sso,
-    )
-    auth_metadata.append(("x-ai-account", "demo"))
-    auth_metadata.append(("x-ai-workspace", "default"))
+    auth_plugin = auth_plugin_from_settings(settings)
+    auth_metadata = auth_metadata_from_settings(settings, auth_plugin)
 
-    audio = AudioFile(audio_file)
+    if (audio_file is None) == (unix_socket is None):
+        raise click.UsageError("Exactly one of --audio-file and --unix-socket is required")
+    if audio_format == AudioFormat.s16le and sample_rate is None:
+        raise click.UsageError("--rate is required for --format s16le")
+    ranges_ms = window_ranges(start_ms, end_ms, ranges)
+
+    audio = _open_audio(audio_file, unix_socket, audio_format, sample_rate, channel_count)
+    # NB: every part is a separate call, its result times are mapped back to file time
+    parts: list[tuple[TimeMapper, AudioFile | AudioStream]] = [(OffsetMap([]), audio)]
+    windows: list[Segment] = []
+    if ranges_ms or trim_silence:
+        if not isinstance(audio, AudioFile):
+            audio.close()
+            raise click.UsageError("--start, --end, --range and --trim-silence require a WAV file")
+        try:
+            windows = audio_windows(audio, ranges_ms) if ranges_ms else []
+        except ValueError as err:
+            raise click.UsageError(str(err)) from err
+
+        if trim_silence:
+            trimmed, offset_map = cut_silence(
+                audio, windows, trim_threshold_dbfs, trim_min_silence_ms, trim_pad_ms
+            )
+            if not trimmed.frame_count:
+                audio.close()
+                click.echo("No speech found in the audio, nothing to recognize")
+                return
+            parts = [(offset_map, trimmed)]
+        else:
+            # NB: windows are zero-copy views of the mapped file, the rest of it is never read
+            parts = [
+                (OffsetMap([(w.start_ms, w.end_ms)]), audio.window(w.start_frame, w.end_frame))
+                for w in windows
+            ]
+
+    # NB: live feeds (pipes, sockets) have no known length, they run until the sender stops
+    timeout = None if isinstance(audio, AudioStream) else settings.timeout
 
     click.echo(
         f"Request parameters:\n"
@@ -142,7 +256,13 @@ def recognize(
         f"Antispoofing enabled: {enable_antispoofing}\n"
         f"Single utterance enabled: {single_utterance}\n"
         f"Interim results enabled: {interim_results}\n"
+        f"Real-time emulation: {f'{speed:g}x' if realtime else 'disabled'}\n"
+        f"Upload encoding: {encoding}\n"
+        f"Audio ranges: {format_windows(windows)}\n"
     )
+    if trim_silence:
+        analyzed_ms = sum(w.duration_ms for w in windows) if windows else audio.duration_ms
+        click.echo(f"Silence trimming: {trim_summary(analyzed_ms, parts[0][1].duration_ms)}\n")
 
     va_config = make_va_config(
         vad_algo,
@@ -191,6 +311,7 @@ def recognize(
         as_config,
         sl_config,
         wfst_config,
+        encoding=encoding.pb2_value,
     )
     stream_recognition_config = stt_pb2.StreamRecognitionConfig(
         config=recognition_config,
@@ -212,35 +333,84 @@ def recognize(
                     "interim_results": interim_results,
                     "chunk_len_ms": chunk_len_ms,
                     "realtime": realtime,
+                    "speed": speed,
                 }
             )
             click.echo()
         except Exception as exc:
             click.echo(f"Failed to dump JSON request: {exc}\n")
-    request_iterator = stream_request_iterator(
-        stream_recognition_config,
-        audio.chunks(chunk_len_ms),
-        chunk_len_ms if realtime else 0,
-    )
-
     click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
 
-    with open_grpc_channel(
-        settings.api_address,
-        ssl_creds_from_settings(settings),
-    ) as channel:
+    with (
+        open_grpc_channel(
+            settings.api_address,
+            ssl_creds_from_settings(settings),
+            auth_plugin,
+            settings.use_gzip,
+        ) as channel,
+        ResultWriters(outputs) as writers,
+    ):
         stub = stt_pb2_grpc.STTStub(channel)
 
-        response_iterator: Iterable[stt_pb2.StreamRecognitionConfig] | grpc.Call
-        response_iterator = stub.Recognize(
-            request_iterator,
-            metadata=auth_metadata,
-            timeout=settings.timeout,
-        )
+        for idx, (time_mapper, part) in enumerate(parts):
+            if len(parts) > 1:
+                click.echo(f"\n--- Range {format_windows(windows[idx : idx + 1])} ---\n")
+
+            pacer = Pacer(chunk_len_ms, speed) if realtime else None
+            audio_chunks: Iterable[bytes | memoryview] = part.chunks(chunk_len_ms)
+            # NB: PCM is paced before the encoder, compressed blocks don't map to audio time
+            if pacer is not None:
+                audio_chunks = pacer.paced(audio_chunks)
+            if encoding == UploadEncoding.flac:
+                audio_chunks = encode_flac_stream(
+                    audio_chunks, audio.sample_rate, audio.channel_count
+                )
+            request_iterator = stream_request_iterator(stream_recognition_config, audio_chunks)
+
+            response_iterator: Iterable[stt_pb2.StreamRecognitionConfig] | grpc.Call
+            response_iterator = stub.Recognize(
+                request_iterator,
+                metadata=auth_metadata,
+                timeout=timeout,
+            )
+
+            click.echo("Response metadata:")
+            print_metadata(response_iterator.initial_metadata())
+
+            for response_idx, response in enumerate(response_iterator, 1):
+                remap_response_times(response, time_mapper)
+                # NB: interim hypotheses are replaced by the final one, only finals are stored
+                if response.is_final:
+                    writers.write(response)
+                if not quiet:
+                    click.echo(f"\nResponse #{response_idx}:")
+                    print_recognize_response(response)
+
+            if pacer is not None:
+                click.echo(f"\nReal-time pacing: {pacer.summary()}")
+
+    for _, part in parts:
+        if part is not audio:
+            part.close()
+    audio.close()
+
+    for output in outputs:
+        click.echo(f"\nResults written to {output}")
+
+
+def _open_audio(
+    audio_file: str | None,
+    unix_socket: str | None,
+    audio_format: AudioFormat,
+    sample_rate: int | None,
+    channel_count: int,
+) -> AudioFile | AudioStream:
+    if unix_socket is not None:
+        return AudioStream.connect(unix_socket, audio_format, sample_rate, channel_count)
 
-        click.echo("Response metadata:")
-        print_metadata(response_iterator.initial_metadata())
+    assert audio_file is not None
+    # NB: regular WAV files are memory-mapped, anything else is read as it arrives
+    if audio_format == AudioFormat.wav and audio_file != "-" and os.path.isfile(audio_file):
+        return MediaStream(audio_file) if is_media_file(audio_file) else AudioFile(audio_file)
 
-        for response_idx, response in enumerate(response_iterator, 1):
-            click.echo(f"\nResponse #{response_idx}:")
-            print_recognize_response(response)
+    return AudioStream.open(audio_file, audio_format, sample_rate, channel_count)
@@ -0,0 +1,290 @@
+from concurrent.futures import ThreadPoolExecutor
+import socket
+import threading
+from typing import cast
+
+import click
+import grpc
+
+from audiogram_client.common_utils.arguments import common_options_in_settings
+from audiogram_client.common_utils.auth import (
+    auth_metadata_from_settings,
+    auth_plugin_from_settings,
+)
+from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import DEFAULT_CHANNEL_POOL_SIZE
+from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.grpc import ChannelPool, ssl_creds_from_settings
+from audiogram_client.common_utils.types import ASAttackType, VADAlgo, VADMode, VAResponseMode
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
+
+from .utils.arguments import common_asr_options
+from .utils.definitions import (
+    DEFAULT_RTP_IDLE_TIMEOUT_S,
+    DEFAULT_RTP_JITTER_PACKETS,
+    DEFAULT_RTP_MAX_CALLS,
+    DEFAULT_RTP_PORT,
+    DEFAULT_VAD_S_MIN_SILENCE_MS,
+    DEFAULT_VAD_S_MIN_SPEECH_MS,
+    DEFAULT_VAD_S_SPEECH_PAD_MS,
+    DEFAULT_VAD_S_THRESHOLD,
+    RTP_CHUNK_LEN_MS,
+    RTP_PAYLOAD_ENCODINGS,
+    RTP_SAMPLE_RATE,
+)
+from .utils.request import (
+    make_antispoofing_config,
+    make_context_dictionary_config,
+    make_recognition_config,
+    make_speaker_labeling_config,
+    make_va_config,
+    stream_request_iterator,
+)
+from .utils.rtp import RtpCall, RtpReceiver
+
+
+@click.command(
+    help="Online (stream) speech recognition of G.711 calls received over RTP",
+)
+@errors_handler
+@common_options_in_settings
+@common_asr_options(
+    DEFAULT_VAD_S_THRESHOLD,
+    DEFAULT_VAD_S_MIN_SILENCE_MS,
+    DEFAULT_VAD_S_SPEECH_PAD_MS,
+    DEFAULT_VAD_S_MIN_SPEECH_MS,
+    with_audio_file=False,
+)
+@click.option(
+    "--host",
+    default="0.0.0.0",
+    show_default=True,
+    help="address to listen for RTP packets on",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(1, 65535),
+    default=DEFAULT_RTP_PORT,
+    show_default=True,
+    help="UDP port to listen for RTP packets on",
+)
+@click.option(
+    "--jitter-buffer",
+    "jitter_depth",
+    type=click.IntRange(min=1),
+    default=DEFAULT_RTP_JITTER_PACKETS,
+    show_default=True,
+    help="number of packets held back per call to put reordered packets in place",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_RTP_IDLE_TIMEOUT_S,
+    show_default=True,
+    help="end a call after this many seconds without packets",
+    metavar="<seconds>",
+)
+@click.option(
+    "--max-calls",
+    type=click.IntRange(min=1),
+    default=DEFAULT_RTP_MAX_CALLS,
+    show_default=True,
+    help="max number of concurrent calls, packets of further calls are dropped",
+)
+@click.option(
+    "--chunk-len",
+    "chunk_len_ms",
+    type=click.IntRange(20, 2000),
+    default=RTP_CHUNK_LEN_MS,
+    show_default=True,
+    help="audio chunk length in milliseconds",
+)
+@click.option(
+    "--interim-results",
+    is_flag=True,
+    default=False,
+    help="show partly recognized results (when phrase recognition is not complete)",
+)
+@click.option(
+    "--channels",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHANNEL_POOL_SIZE,
+    show_default=True,
+    help="number of gRPC connections to spread calls over",
+)
+def rtp_recognize(
+    settings: SettingsProtocol,
+    host: str,
+    port: int,
+    jitter_depth: int,
+    idle_timeout: float,
+    max_calls: int,
+    chunk_len_ms: int,
+    interim_results: bool,
+    channels: int,
+    model: str,
+    enable_word_time_offsets: bool,
+    enable_punctuator: bool,
+    enable_denormalization: bool,
+    enable_speaker_labeling: bool,
+    enable_genderage: bool,
+    enable_antispoofing: bool,
+    va_response_mode: VAResponseMode,
+    vad_algo: VADAlgo,
+    vad_mode: VADMode,
+    vad_threshold: float,
+    vad_speech_pad_ms: int,
+    vad_min_silence_ms: int,
+    vad_min_speech_ms: int,
+    dep_smoothed_window_threshold: float,
+    dep_smoothed_window_ms: int,
+    antispoofing_attack_type: ASAttackType | None,
+    antispoofing_far: int | None,
+    antispoofing_frr: int | None,
+    antispoofing_max_duration_for_analysis: int | None,
+    speakers_max: int | None,
+    speakers_num: int | None,
+    wfst_dictionary_name: str,
+    wfst_dictionary_weight: float,
+    enhanced_vad_beginning_window_ms: int,
+    enhanced_vad_beginning_threshold: float,
+    enhanced_vad_ending_window_ms: int,
+    enhanced_vad_ending_threshold: float,
+    target_speech_vad_beginning_window_ms: int,
+    target_speech_vad_beginning_threshold: float,
+    target_speech_vad_ending_window_ms: int,
+    target_speech_vad_ending_threshold: float,
+) -> None:
+    auth_plugin = auth_plugin_from_settings(settings)
+    auth_metadata = auth_metadata_from_settings(settings, auth_plugin)
+
+    va_config = make_va_config(
+        vad_algo,
+        vad_mode,
+        vad_threshold,
+        vad_min_silence_ms,
+        vad_speech_pad_ms,
+        vad_min_speech_ms,
+        dep_smoothed_window_threshold,
+        dep_smoothed_window_ms,
+        enhanced_vad_beginning_window_ms,
+        enhanced_vad_beginning_threshold,
+        enhanced_vad_ending_window_ms,
+        enhanced_vad_ending_threshold,
+        target_speech_vad_beginning_window_ms,
+        target_speech_vad_beginning_threshold,
+        target_speech_vad_ending_window_ms,
+        target_speech_vad_ending_threshold,
+    )
+    as_config = make_antispoofing_config(
+        enable_antispoofing,
+        antispoofing_attack_type,
+        antispoofing_far,
+        antispoofing_frr,
+        antispoofing_max_duration_for_analysis,
+    )
+    sl_config = make_speaker_labeling_config(
+        enable_speaker_labeling,
+        speakers_max,
+        speakers_num,
+    )
+    wfst_config = make_context_dictionary_config(
+        wfst_dictionary_name,
+        wfst_dictionary_weight,
+    )
+    # NB: G.711 payload goes to the server as is, only the encoding differs between calls
+    stream_configs = {
+        encoding: stt_pb2.StreamRecognitionConfig(
+            config=make_recognition_config(
+                model,
+                va_config,
+                va_response_mode,
+                RTP_SAMPLE_RATE,
+                1,
+                enable_genderage,
+                enable_word_time_offsets,
+                enable_punctuator,
+                enable_denormalization,
+                as_config,
+                sl_config,
+                wfst_config,
+                encoding=encoding,
+            ),
+            interim_results=interim_results,
+        )
+        for encoding in RTP_PAYLOAD_ENCODINGS.values()
+    }
+
+    click.echo(
+        f"RTP parameters:\n"
+        f"Listening on: udp://{host}:{port}\n"
+        f"Jitter buffer: {jitter_depth} packets\n"
+        f"Idle timeout: {idle_timeout:g} s\n"
+        f"Max calls: {max_calls}\n"
+        f"Channels: {channels}\n"
+    )
+    click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+
+    ssl_creds = ssl_creds_from_settings(settings)
+    echo_lock = threading.Lock()
+
+    def echo(call: RtpCall, message: str) -> None:
+        with echo_lock:
+            click.echo(f"[call {call.ssrc:08x}] {message}")
+
+    with ChannelPool(channels, settings.use_gzip) as pool:
+
+        def recognize_call(call: RtpCall) -> None:
+            stub = stt_pb2_grpc.STTStub(pool.get(settings.api_address, ssl_creds, auth_plugin))
+            try:
+                responses = stub.Recognize(
+                    stream_request_iterator(stream_configs[call.encoding], call.chunks()),
+                    metadata=auth_metadata,
+                    # NB: a call lasts as long as the caller talks, it ends on idle timeout instead
+                    timeout=None,
+                )
+                for response in responses:
+                    hypothesis = response.hypothesis
+                    transcript = hypothesis.normalized_transcript or hypothesis.transcript
+                    if transcript and (response.is_final or interim_results):
+                        echo(
+                            call,
+                            f"{hypothesis.start_time_ms / 1000:06.2f}-"
+                            f"{hypothesis.end_time_ms / 1000:06.2f} "
+                            f"{'' if response.is_final else '(partial) '}{transcript}",
+                        )
+            except grpc.RpcError as err:
+                # NB: nothing reads the call audio anymore, stop it piling up until the call ends
+                call.abort()
+                err_call = cast(grpc.Call, err)
+                echo(call, f"FAILED ({err_call.code()}: {err_call.details()})")
+
+        def start_call(call: RtpCall) -> None:
+            encoding = stt_pb2.AudioEncoding.Name(call.encoding)
+            echo(call, f"started ({encoding}, {receiver.active_calls} active)")
+            executor.submit(recognize_call, call)
+
+        def end_call(call: RtpCall) -> None:
+            echo(call, f"ended ({call.summary()})")
+
+        with (
+            ThreadPoolExecutor(max_workers=max_calls) as executor,
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock,
+        ):
+            sock.bind((host, port))
+            receiver = RtpReceiver(
+                sock,
+                start_call,
+                jitter_depth,
+                chunk_len_ms,
+                idle_timeout,
+                max_calls,
+                end_call,
+            )
+            click.echo("Waiting for RTP packets, press Ctrl+C to stop\n")
+            try:
+                receiver.serve()
+            except KeyboardInterrupt:
+                click.echo("\nStopping, waiting for active calls to finish")
+
+        click.echo(f"\nReceiver: {receiver.stats()}\n{pool.stats()}")
@@ -1,13 +1,29 @@
 from collections.abc import Iterable, Sequence
-from typing import cast
+import os
+from typing import Any, cast
 
 import click
 
 from audiogram_client.common_utils.arguments import OptionCallable, options_wrapper, OptionsWrapper
 from audiogram_client.common_utils.cli_options import audio_file_option
-from audiogram_client.common_utils.types import ASAttackType, VADAlgo, VADMode, VAResponseMode
+from audiogram_client.common_utils.types import (
+    ASAttackType,
+    UploadEncoding,
+    VADAlgo,
+    VADMode,
+    VAResponseMode,
+)
 
-from .definitions import DEFAULT_DEP_SMOOTHED_WINDOW_MS, DEFAULT_DEP_SMOOTHED_WINDOW_THRESHOLD
+from .definitions import (
+    DEFAULT_DEP_SMOOTHED_WINDOW_MS,
+    DEFAULT_DEP_SMOOTHED_WINDOW_THRESHOLD,
+    DEFAULT_TRANSCRIPT_CACHE_SIZE_MB,
+    DEFAULT_TRIM_MIN_SILENCE_MS,
+    DEFAULT_TRIM_PAD_MS,
+    DEFAULT_TRIM_THRESHOLD_DBFS,
+    TRANSCRIPT_CACHE_DIR,
+)
+from .writers import WRITERS
 
 
 def common_asr_options(
@@ -15,11 +31,12 @@ def common_asr_options(
     default_vad_min_silence_ms: int,
     default_vad_speech_pad_ms: int,
     default_vad_min_speech_ms: int,
+    with_audio_file: bool = True,
 ) -> OptionsWrapper:
     """Inject common list of ASR-related click options to a command.
 
     Options:
-    - audio_file: str - path to audio file (required)
+    - audio_file: str - path to audio file (required, omitted if not with_audio_file)
     - model: str - ASR model name
     - enable_word_time_offsets: bool - enable word time offsets
     - enable_punctuator: bool - enable automatic punctuation
@@ -54,7 +71,6 @@ def common_asr_options(
     - target_speech_vad_ending_threshold: float - Target speech VAD ending threshold
     """
     options: list = [
-        audio_file_option(),
         click.option(
             "--model",
             default="e2e-v3",
@@ -171,6 +187,8 @@ def common_asr_options(
             help="Target speech VAD ending threshold",
         ),
     ]
+    if with_audio_file:
+        options.insert(0, audio_file_option())
 
     return options_wrapper(options)
 
@@ -320,3 +338,240 @@ def _wfst_dictionary_options() -> Iterable[OptionCallable]:
     ]
 
     return options
+
+
+def transcript_cache_options() -> OptionsWrapper:
+    """Inject options of the local FileRecognize result cache.
+
+    Options:
+    - cache_dir: str - directory of cached results
+    - no_cache: bool - disable the cache
+    - cache_max_size_mb: int - cache size limit, least recently used results are evicted
+    """
+    options: list = [
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, writable=True, resolve_path=True),
+            default=str(TRANSCRIPT_CACHE_DIR),
+            show_default=True,
+            help="directory for cached recognition results",
+            metavar="<path>",
+        ),
+        click.option(
+            "--no-cache",
+            is_flag=True,
+            default=False,
+            help="always send requests, don't read or store cached results",
+        ),
+        click.option(
+            "--cache-max-size",
+            "cache_max_size_mb",
+            type=click.IntRange(min=1),
+            default=DEFAULT_TRANSCRIPT_CACHE_SIZE_MB,
+            show_default=True,
+            help="max size of the result cache in megabytes",
+            metavar="<MB>",
+        ),
+    ]
+
+    return options_wrapper(options)
+
+
+def upload_encoding_options() -> OptionsWrapper:
+    """Inject option of audio encoding used on the wire.
+
+    Options:
+    - encoding: UploadEncoding - send raw PCM or compress it to FLAC first
+    """
+    options: list = [
+        click.option(
+            "--encoding",
+            type=click.Choice(cast(Sequence[str], UploadEncoding)),
+            default=UploadEncoding.pcm,
+            show_default=True,
+            help="audio encoding on the wire, `flac` compresses audio with ffmpeg before sending",
+        ),
+    ]
+
+    return options_wrapper(options)
+
+
+class TimeOffset(click.ParamType):
+    """Audio position as seconds (`90.5`), `MM:SS` or `HH:MM:SS`, converted to milliseconds."""
+
+    name = "time"
+
+    def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> int:
+        if isinstance(value, int):
+            return value
+
+        parts = str(value).split(":")
+        if len(parts) > 3 or not all(part.replace(".", "", 1).isdigit() for part in parts):
+            self.fail(f"{value!r} is not a time, use seconds, MM:SS or HH:MM:SS", param, ctx)
+
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+        return round(seconds * 1000)
+
+
+class TimeRange(click.ParamType):
+    """`START-END` pair of audio positions in milliseconds, END may be omitted."""
+
+    name = "range"
+
+    def convert(
+        self, value: Any, param: click.Parameter | None, ctx: click.Context | None
+    ) -> tuple[int, int | None]:
+        if isinstance(value, tuple):
+            return value
+
+        start, sep, end = str(value).partition("-")
+        if not sep:
+            self.fail(f"{value!r} is not a range, use START-END", param, ctx)
+
+        start_ms = TimeOffset().convert(start, param, ctx)
+        end_ms = TimeOffset().convert(end, param, ctx) if end else None
+        if end_ms is not None and end_ms <= start_ms:
+            self.fail(f"{value!r} ends before it starts", param, ctx)
+        return start_ms, end_ms
+
+
+def audio_window_options() -> OptionsWrapper:
+    """Inject options which limit recognition to parts of the audio.
+
+    Options:
+    - start_ms: int | None - beginning of the part to recognize
+    - end_ms: int | None - end of the part to recognize
+    - ranges: tuple[tuple[int, int | None], ...] - several parts to recognize
+    """
+    options: list = [
+        click.option(
+            "--start",
+            "start_ms",
+            type=TimeOffset(),
+            default=None,
+            help="recognize audio from this position (seconds, MM:SS or HH:MM:SS)",
+        ),
+        click.option(
+            "--end",
+            "end_ms",
+            type=TimeOffset(),
+            default=None,
+            help="recognize audio up to this position (seconds, MM:SS or HH:MM:SS)",
+        ),
+        click.option(
+            "--range",
+            "ranges",
+            type=TimeRange(),
+            multiple=True,
+            help="recognize only this part of audio, eg. `1:00:00-1:01:00`, can be repeated",
+        ),
+    ]
+
+    return options_wrapper(options)
+
+
+def window_ranges(
+    start_ms: int | None,
+    end_ms: int | None,
+    ranges: Sequence[tuple[int, int | None]],
+) -> list[tuple[int, int | None]]:
+    """Combine `audio_window_options` values into a list of ranges, empty for the whole audio."""
+    if ranges and (start_ms is not None or end_ms is not None):
+        raise click.UsageError("--range can't be combined with --start/--end")
+    if start_ms is None and end_ms is None:
+        return list(ranges)
+
+    start_ms = start_ms or 0
+    if end_ms is not None and end_ms <= start_ms:
+        raise click.UsageError("--end must be after --start")
+    return [(start_ms, end_ms)]
+
+
+def silence_trim_options() -> OptionsWrapper:
+    """Inject options of client-side silence trimming.
+
+    Options:
+    - trim_silence: bool - cut long pauses out of audio before sending it
+    - trim_threshold_dbfs: float - frames quieter than this are silence
+    - trim_min_silence_ms: int - shorter pauses are kept
+    - trim_pad_ms: int - silence kept around speech
+    """
+    options: list = [
+        click.option(
+            "--trim-silence",
+            is_flag=True,
+            default=False,
+            help="cut long pauses out of audio before sending it, result times stay file times",
+        ),
+        click.option(
+            "--trim-threshold",
+            "trim_threshold_dbfs",
+            type=click.FloatRange(max=0),
+            default=DEFAULT_TRIM_THRESHOLD_DBFS,
+            show_default=True,
+            help="frames quieter than this are silence (with --trim-silence)",
+            metavar="<dBFS>",
+        ),
+        click.option(
+            "--trim-min-silence",
+            "trim_min_silence_ms",
+            type=click.IntRange(min=0),
+            default=DEFAULT_TRIM_MIN_SILENCE_MS,
+            show_default=True,
+            help="shorter pauses are not trimmed (with --trim-silence)",
+            metavar="<ms>",
+        ),
+        click.option(
+            "--trim-pad",
+            "trim_pad_ms",
+            type=click.IntRange(min=0),
+            default=DEFAULT_TRIM_PAD_MS,
+            show_default=True,
+            help="silence kept on both sides of speech (with --trim-silence)",
+            metavar="<ms>",
+        ),
+    ]
+
+    return options_wrapper(options)
+
+
+def _check_output_suffix(
+    ctx: click.Context, param: click.Parameter, paths: tuple[str, ...]
+) -> tuple[str, ...]:
+    for path in paths:
+        if os.path.splitext(path)[1].lower() not in WRITERS:
+            raise click.BadParameter(
+                f"unknown format of {path!r}, use one of: {', '.join(WRITERS)}", ctx, param
+            )
+    return paths
+
+
+def result_output_options() -> OptionsWrapper:
+    """Inject options of recognition result output.
+
+    Options:
+    - outputs: tuple[str, ...] - files to write results to, format is chosen by suffix
+    - quiet: bool - don't print results to the terminal
+    """
+    options: list = [
+        click.option(
+            "--output",
+            "outputs",
+            type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+            multiple=True,
+            callback=_check_output_suffix,
+            help="write results to a file, format is chosen by suffix: "
+            f"{', '.join(WRITERS)} (can be repeated)",
+            metavar="<path>",
+        ),
+        click.option(
+            "--quiet",
+            is_flag=True,
+            default=False,
+            help="don't print recognition results to the terminal",
+        ),
+    ]
+
+    return options_wrapper(options)
@@ -0,0 +1,70 @@
+from collections.abc import Callable
+import hashlib
+from pathlib import Path
+
+from audiogram_client.common_utils.cache import DiskCache
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc, stt_response_pb2
+
+
+class TranscriptCache:
+    """Local cache of FileRecognize results.
+
+    Entries are keyed by the hash of PCM payload and the deterministic
+    serialization of RecognitionConfig, so any change of audio or
+    recognition options results in a new request.
+    """
+
+    def __init__(self, directory: Path, max_size_mb: int) -> None:
+        self._cache = DiskCache(directory, max_size_mb * 1024 * 1024)
+
+    @staticmethod
+    def make_key(audio: bytes | memoryview, config: stt_pb2.RecognitionConfig) -> str:
+        digest = hashlib.sha256(audio)
+        digest.update(config.SerializeToString(deterministic=True))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> stt_response_pb2.FileRecognizeResponse | None:
+        value = self._cache.get(key)
+        if value is None:
+            return None
+
+        return stt_response_pb2.FileRecognizeResponse.FromString(value)
+
+    def put(self, key: str, response: stt_response_pb2.FileRecognizeResponse) -> None:
+        self._cache.put(key, response.SerializeToString())
+
+    def stats(self) -> str:
+        return self._cache.stats()
+
+
+def cached_file_recognize(
+    stub: stt_pb2_grpc.STTStub,
+    config: stt_pb2.RecognitionConfig,
+    audio: bytes | memoryview,
+    metadata: list[tuple[str, str]],
+    timeout: float,
+    cache: TranscriptCache | None,
+    encode: Callable[[bytes | memoryview], bytes] | None = None,
+) -> stt_response_pb2.FileRecognizeResponse:
+    """Call FileRecognize unless the same audio and config are already cached.
+
+    Audio is passed through `encode` right before sending (eg. FLAC
+    compression), the cache key is always computed over the PCM.
+    """
+    cache_key = TranscriptCache.make_key(audio, config) if cache else ""
+    cached = cache.get(cache_key) if cache else None
+    if cached is not None:
+        return cached
+
+    response: stt_response_pb2.FileRecognizeResponse = stub.FileRecognize(
+        stt_pb2.FileRecognizeRequest(
+            config=config,
+            audio=encode(audio) if encode else bytes(audio),
+        ),
+        metadata=metadata,
+        timeout=timeout,
+    )
+    if cache:
+        cache.put(cache_key, response)
+
+    return response
@@ -1,5 +1,6 @@
 from typing import Final
 
+from audiogram_client.common_utils.definitions import CACHE_DIR, MEDIA_SUFFIXES
 from audiogram_client.genproto import stt_pb2
 
 # --- Config Defaults ---
@@ -36,3 +37,51 @@ AUDIO_ENCODING: Final = stt_pb2.AudioEncoding.LINEAR_PCM
 LANGUAGE_CODE: Final = "ru"
 MAX_ALTERNATIVES: Final = 1
 CHUNK_LEN_MS: Final = 1000
+
+# --- Batch Recognition ---
+BATCH_AUDIO_SUFFIXES: Final = (".wav", *MEDIA_SUFFIXES)
+DEFAULT_BATCH_MAX_IN_FLIGHT: Final = 8
+
+# --- Transcript Cache ---
+TRANSCRIPT_CACHE_DIR: Final = CACHE_DIR / "transcripts"
+DEFAULT_TRANSCRIPT_CACHE_SIZE_MB: Final = 1024
+
+# --- Long Audio Splitting ---
+SPLIT_SEARCH_MS: Final = 5000  # look for a pause within +/- this range of a target boundary
+SPLIT_WINDOW_MS: Final = 100
+DEFAULT_MAX_PARALLEL_SEGMENTS: Final = 4
+
+# --- Silence Trimming ---
+TRIM_FRAME_MS: Final = 30
+TRIM_BLOCK_FRAMES: Final = 2000  # energy is computed per block to keep memory flat
+DEFAULT_TRIM_THRESHOLD_DBFS: Final = -45.0
+DEFAULT_TRIM_MIN_SILENCE_MS: Final = 1000
+DEFAULT_TRIM_PAD_MS: Final = 250
+
+# --- Result Writers ---
+WRITE_BUFFER_SIZE: Final = 1 << 20
+TRANSCRIPT_FLUSH_SIZE: Final = 256
+TRANSCRIPT_MAX_PENDING: Final = 4096
+WORD_TABLE_MAGIC: Final = b"AGWT"
+WORD_TABLE_VERSION: Final = 1
+
+# --- Load Testing ---
+DEFAULT_LOADTEST_STREAMS: Final = 10
+LOADTEST_CHUNK_LEN_MS: Final = 100
+
+# --- RTP Ingestion ---
+# NB: static payload types of RFC 3551, G.711 is always 8 kHz mono
+RTP_PAYLOAD_ENCODINGS: Final = {
+    0: stt_pb2.AudioEncoding.MULAW,  # PCMU
+    8: stt_pb2.AudioEncoding.ALAW,  # PCMA
+}
+G711_SILENCE: Final = {
+    stt_pb2.AudioEncoding.MULAW: 0xFF,
+    stt_pb2.AudioEncoding.ALAW: 0xD5,
+}
+RTP_SAMPLE_RATE: Final = 8000
+DEFAULT_RTP_PORT: Final = 5004
+DEFAULT_RTP_JITTER_PACKETS: Final = 5
+DEFAULT_RTP_IDLE_TIMEOUT_S: Final = 2.0
+DEFAULT_RTP_MAX_CALLS: Final = 100
+RTP_CHUNK_LEN_MS: Final = 100
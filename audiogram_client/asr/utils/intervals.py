@@ -0,0 +1,156 @@
+from array import array
+import bisect
+from collections.abc import Iterable
+from typing import Generic, TypeVar
+
+from audiogram_client.genproto import stt_response_pb2
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Static index of [start_ms, end_ms] intervals with a payload each.
+
+    Intervals are sorted by start, so everything starting after a query is
+    cut off with bisect. The rest is searched with a tree of maximum ends
+    built over the sorted intervals, which skips every subtree ending before
+    the query. Queries take O(log n) plus O(log n) per match, bounds are
+    inclusive.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int, T]]) -> None:
+        ordered = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = array("q", (start for start, _, _ in ordered))
+        self._payloads = [payload for _, _, payload in ordered]
+
+        self._leaves = 1
+        while self._leaves < len(ordered):
+            self._leaves *= 2
+
+        # NB: implicit binary tree, node i has children 2i and 2i+1, leaves start at `_leaves`
+        self._max_ends = array("q", [-1]) * (2 * self._leaves)
+        for idx, (_, end, _) in enumerate(ordered):
+            self._max_ends[self._leaves + idx] = end
+        for node in range(self._leaves - 1, 0, -1):
+            self._max_ends[node] = max(self._max_ends[2 * node], self._max_ends[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def overlapping(self, start_ms: int, end_ms: int) -> list[T]:
+        """Payloads of intervals overlapping [start_ms, end_ms], in start order."""
+        count = bisect.bisect_right(self._starts, end_ms)
+        if not count:
+            return []
+
+        found = []
+        # NB: (node, first leaf, leaf count); right children are pushed first to keep start order
+        stack = [(1, 0, self._leaves)]
+        while stack:
+            node, first, size = stack.pop()
+            if first >= count or self._max_ends[node] < start_ms:
+                continue
+            if size == 1:
+                found.append(self._payloads[first])
+                continue
+
+            half = size // 2
+            stack.append((2 * node + 1, first + half, half))
+            stack.append((2 * node, first, half))
+
+        return found
+
+    def at(self, time_ms: int) -> list[T]:
+        """Payloads of intervals containing `time_ms`."""
+        return self.overlapping(time_ms, time_ms)
+
+
+def _merged(per_channel: dict[int, IntervalIndex[T]], start_ms: int, end_ms: int) -> list[T]:
+    found: list[T] = []
+    for index in per_channel.values():
+        found += index.overlapping(start_ms, end_ms)
+    return found
+
+
+class ResultIndex:
+    """Time queries over a recognition response, built once.
+
+    Results, words, voice activity marks and spoofing intervals are indexed
+    per channel; a query without `channel` looks at all of them and returns
+    matches grouped by channel. Voice activity marks are indexed as points,
+    speakers by the time span of the result they were detected in.
+    """
+
+    def __init__(self, response: stt_response_pb2.FileRecognizeResponse) -> None:
+        results: dict[int, list] = {}
+        words: dict[int, list] = {}
+        marks: dict[int, list] = {}
+        spoofing: dict[int, list] = {}
+
+        for result in response.response:
+            channel = result.channel
+            hypothesis = result.hypothesis
+            results.setdefault(channel, []).append(
+                (hypothesis.start_time_ms, hypothesis.end_time_ms, result)
+            )
+            words.setdefault(channel, []).extend(
+                (word.start_time_ms, word.end_time_ms, word)
+                for word in hypothesis.normalized_words or hypothesis.words
+            )
+            marks.setdefault(channel, []).extend(
+                (mark.offset_ms, mark.offset_ms, mark) for mark in result.va_marks
+            )
+            spoofing.setdefault(channel, []).extend(
+                (interval.start_time_ms, interval.end_time_ms, interval)
+                for interval in result.spoofing_result
+            )
+
+        self._results = {channel: IntervalIndex(items) for channel, items in results.items()}
+        self._words = {channel: IntervalIndex(items) for channel, items in words.items()}
+        self._marks = {channel: IntervalIndex(items) for channel, items in marks.items()}
+        self._spoofing = {channel: IntervalIndex(items) for channel, items in spoofing.items()}
+
+    @property
+    def channels(self) -> list[int]:
+        return sorted(self._results)
+
+    def _query(
+        self,
+        per_channel: dict[int, IntervalIndex[T]],
+        start_ms: int,
+        end_ms: int,
+        channel: int | None,
+    ) -> list[T]:
+        if channel is None:
+            return _merged(per_channel, start_ms, end_ms)
+        index = per_channel.get(channel)
+        return index.overlapping(start_ms, end_ms) if index is not None else []
+
+    def results(
+        self, start_ms: int, end_ms: int, channel: int | None = None
+    ) -> list[stt_response_pb2.RecognizeResponse]:
+        return self._query(self._results, start_ms, end_ms, channel)
+
+    def words(
+        self, start_ms: int, end_ms: int, channel: int | None = None
+    ) -> list[stt_response_pb2.SpeechRecognitionHypothesis.WordInfo]:
+        return self._query(self._words, start_ms, end_ms, channel)
+
+    def va_marks(
+        self, start_ms: int, end_ms: int, channel: int | None = None
+    ) -> list[stt_response_pb2.VoiceActivityMark]:
+        return self._query(self._marks, start_ms, end_ms, channel)
+
+    def spoofing(
+        self, start_ms: int, end_ms: int, channel: int | None = None
+    ) -> list[stt_response_pb2.SpoofingResult]:
+        return self._query(self._spoofing, start_ms, end_ms, channel)
+
+    def speakers_at(self, time_ms: int, channel: int | None = None) -> list[int]:
+        """Ids of speakers talking at `time_ms`, results without a speaker are skipped."""
+        speakers = []
+        for result in self.results(time_ms, time_ms, channel):
+            speaker_id = result.speaker_info.speaker_id
+            if result.HasField("speaker_info") and speaker_id not in speakers:
+                speakers.append(speaker_id)
+        return speakers
@@ -0,0 +1,170 @@
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any, cast
+
+import grpc
+from tabulate import tabulate
+
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.common_utils.histogram import Histogram
+from audiogram_client.common_utils.pacing import Pacer
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
+
+from .request import StreamRequestIterator, stream_request_iterator
+
+
+@dataclass
+class StreamResult:
+    """Timings of a single Recognize stream, in seconds from its start."""
+
+    stream_id: int
+    audio_seconds: float
+    elapsed: float = 0.0
+    first_partial: float | None = None
+    final_latencies: list[float] = field(default_factory=list)
+    max_send_lag: float = 0.0
+    error: str | None = None
+
+    @property
+    def rtf(self) -> float:
+        return self.elapsed / self.audio_seconds if self.audio_seconds else 0.0
+
+
+class _SendLog:
+    """Record when audio up to a given offset was handed over to gRPC."""
+
+    def __init__(self, bytes_per_ms: float) -> None:
+        self._bytes_per_ms = bytes_per_ms
+        self._audio_bytes = 0
+        self.offsets_ms: list[float] = []
+        self.sent_at: list[float] = []
+
+    def track(self, requests: StreamRequestIterator) -> StreamRequestIterator:
+        for request in requests:
+            if request.audio:
+                self._audio_bytes += len(request.audio)
+                self.offsets_ms.append(self._audio_bytes / self._bytes_per_ms)
+                self.sent_at.append(time.monotonic())
+            yield request
+
+    def sent_time(self, offset_ms: int) -> float | None:
+        # NB: list is appended by the gRPC sender thread, take a consistent length first
+        sent = len(self.sent_at)
+        idx = bisect_left(self.offsets_ms, offset_ms, hi=sent)
+        return self.sent_at[idx] if idx < sent else None
+
+
+def run_stream(
+    stub: stt_pb2_grpc.STTStub,
+    config: stt_pb2.StreamRecognitionConfig,
+    audio: AudioFile,
+    chunk_len_ms: int,
+    speed: float,
+    metadata: list[tuple[str, str]],
+    timeout: float,
+    stream_id: int,
+) -> StreamResult:
+    """Replay audio over one Recognize stream and measure its latencies.
+
+    Final result latency is measured from the moment the chunk holding the
+    end of the utterance was sent until the final hypothesis arrives.
+    """
+    result = StreamResult(stream_id, audio.duration_ms / 1000)
+    send_log = _SendLog(audio.sample_rate * audio.frame_size / 1000)
+    pacer = Pacer(chunk_len_ms, speed) if speed else None
+
+    started = time.monotonic()
+    try:
+        responses = stub.Recognize(
+            send_log.track(stream_request_iterator(config, audio.chunks(chunk_len_ms), pacer)),
+            metadata=metadata,
+            timeout=timeout,
+        )
+        for response in responses:
+            now = time.monotonic()
+            hypothesis = response.hypothesis
+            if result.first_partial is None and (
+                hypothesis.transcript or hypothesis.normalized_transcript
+            ):
+                result.first_partial = now - started
+
+            if response.is_final:
+                sent_at = send_log.sent_time(hypothesis.end_time_ms)
+                if sent_at is not None:
+                    result.final_latencies.append(now - sent_at)
+    except grpc.RpcError as err:
+        result.error = cast(grpc.Call, err).code().name
+
+    result.elapsed = time.monotonic() - started
+    if pacer is not None:
+        result.max_send_lag = pacer.max_lag_ms / 1000
+    return result
+
+
+class LoadTestStats:
+    """Thread-safe aggregate of stream results."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.succeeded = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.errors: Counter[str] = Counter()
+        self.first_partial_ms = Histogram()
+        self.final_latency_ms = Histogram()
+        self.rtf = Histogram(scale=10000)
+        self.send_lag_ms = Histogram()
+
+    def add(self, result: StreamResult) -> None:
+        with self._lock:
+            if result.error:
+                self.failed += 1
+                self.errors[result.error] += 1
+                return
+
+            self.succeeded += 1
+            self.audio_seconds += result.audio_seconds
+            self.rtf.record(result.rtf)
+            self.send_lag_ms.record(result.max_send_lag * 1000)
+            if result.first_partial is not None:
+                self.first_partial_ms.record(result.first_partial * 1000)
+            for latency in result.final_latencies:
+                self.final_latency_ms.record(latency * 1000)
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        histograms = {
+            "Time to first partial, ms": self.first_partial_ms,
+            "Final result latency, ms": self.final_latency_ms,
+            "Real-time factor": self.rtf,
+            "Max send lag, ms": self.send_lag_ms,
+        }
+        rows = [
+            [name, hist.count, *hist.percentiles().values()] for name, hist in histograms.items()
+        ]
+        headers = ["", "count", *self.rtf.percentiles()]
+
+        errors = ", ".join(f"{code}: {count}" for code, count in self.errors.most_common())
+        return (
+            f"Streams: {self.succeeded} succeeded, {self.failed} failed"
+            f"{f' ({errors})' if errors else ''}\n"
+            f"Elapsed: {elapsed:.2f} s, audio streamed: {self.audio_seconds:.1f} s\n\n"
+            + tabulate(rows, headers=headers, floatfmt=".3f")
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "elapsed_s": time.monotonic() - self.started,
+            "streams_succeeded": self.succeeded,
+            "streams_failed": self.failed,
+            "audio_seconds": self.audio_seconds,
+            "errors": dict(self.errors),
+            "first_partial_ms": self.first_partial_ms.to_dict(),
+            "final_latency_ms": self.final_latency_ms.to_dict(),
+            "rtf": self.rtf.to_dict(),
+            "max_send_lag_ms": self.send_lag_ms.to_dict(),
+        }
@@ -1,8 +1,7 @@
 import uuid
-import time
 from collections.abc import Iterable, Iterator
-from itertools import islice
 
+from audiogram_client.common_utils.pacing import Pacer
 from audiogram_client.common_utils.types import ASAttackType, VADAlgo, VADMode, VAResponseMode
 from audiogram_client.genproto import stt_pb2
 
@@ -141,12 +140,13 @@ def make_recognition_config(
     sl_config: stt_pb2.SpeakerLabelingConfig,
     wfst_config: stt_pb2.ContextDictionaryConfig,
     split_by_channel: bool = False,
+    encoding: stt_pb2.AudioEncoding.ValueType = AUDIO_ENCODING,
 ) -> stt_pb2.RecognitionConfig:
     ga_config = stt_pb2.GenderAgeEmotionConfig(enable=enable_genderage)
     punct_config = stt_pb2.PunctuationConfig(enable=enable_punctuator)
     denorm_config = stt_pb2.DenormalizationConfig(enable=enable_denormalization)
     result = stt_pb2.RecognitionConfig(
-        encoding=AUDIO_ENCODING,
+        encoding=encoding,
         language_code=LANGUAGE_CODE,
         model=model,
         sample_rate_hertz=sample_rate,
@@ -168,14 +168,15 @@ def make_recognition_config(
 
 def stream_request_iterator(
     recognition_config: stt_pb2.StreamRecognitionConfig,
-    audio_chunks: Iterable[bytes],
-    wait_ms: int,
+    audio_chunks: Iterable[bytes | memoryview],
+    pacer: Pacer | None = None,
 ) -> StreamRequestIterator:
+    """Yield config request followed by audio requests, paced by `pacer` if given."""
+    # NB: protobuf bytes fields don't accept buffer views, so each chunk is
+    # materialized exactly once here, right before serialization
     yield stt_pb2.RecognizeRequest(config=recognition_config)
 
-    for chunk in islice(audio_chunks, 1):
-        yield stt_pb2.RecognizeRequest(audio=chunk)
-
     for chunk in audio_chunks:
-        time.sleep(wait_ms / 1000)
-        yield stt_pb2.RecognizeRequest(audio=chunk)
+        if pacer is not None:
+            pacer.wait()
+        yield stt_pb2.RecognizeRequest(audio=bytes(chunk))
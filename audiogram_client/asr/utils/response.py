@@ -1,9 +1,7 @@
-import csv
-import os
-from datetime import datetime
+import bisect
 from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import List
+from typing import TextIO
 import sys
 import click
 from google.protobuf.duration_pb2 import Duration
@@ -11,8 +9,10 @@ from google.protobuf.duration_pb2 import Duration
 from audiogram_client.genproto import stt_response_pb2, stt_pb2
 from tabulate import tabulate
 
+from .definitions import TRANSCRIPT_FLUSH_SIZE, TRANSCRIPT_MAX_PENDING
 
-@dataclass
+
+@dataclass(slots=True)
 class TranscriptionEntry:
     start_time_ms: int
     end_time_ms: int
@@ -24,12 +24,95 @@ class TranscriptionEntry:
         channel_info = f"Channel {self.channel}: " if self.channel is not None else ""
         return f"{channel_info}{self.transcript}"
 
+    @property
+    def sort_key(self) -> int:
+        # NB: results without a start time are placed by their end time
+        return self.start_time_ms if self.start_time_ms > 0 else self.end_time_ms
+
+
+class TranscriptCollector:
+    """Transcripts of one request, written to `sink` in start time order.
+
+    Entries are kept sorted on insertion. Every one of `channel_count`
+    channels produces results in time order, so once all of them have been
+    seen everything before the slowest one is final and is flushed in
+    batches of `flush_size`. At most `max_pending` entries are held, above
+    that the oldest batch is written even if a slow channel may still put a
+    result before it.
+    """
+
+    __slots__ = (
+        "_sink",
+        "_channel_count",
+        "_flush_size",
+        "_max_pending",
+        "_pending",
+        "_channel_keys",
+        "written",
+    )
 
-# Global list to store all transcriptions
-all_transcriptions: List[TranscriptionEntry] = []
+    def __init__(
+        self,
+        sink: TextIO,
+        channel_count: int = 1,
+        flush_size: int = TRANSCRIPT_FLUSH_SIZE,
+        max_pending: int = TRANSCRIPT_MAX_PENDING,
+    ) -> None:
+        self._sink = sink
+        self._channel_count = channel_count
+        self._flush_size = flush_size
+        self._max_pending = max_pending
+        self._pending: list[TranscriptionEntry] = []
+        self._channel_keys: dict[int, int] = {}
+        self.written = 0
+
+    def add(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        hypothesis = response.hypothesis
+        transcript = hypothesis.normalized_transcript or hypothesis.transcript
+        if not transcript.strip():
+            return
+
+        entry = TranscriptionEntry(
+            start_time_ms=hypothesis.start_time_ms,
+            end_time_ms=hypothesis.end_time_ms,
+            transcript=transcript,
+            channel=response.channel or None,
+            is_final=response.is_final,
+        )
+        # NB: insort places equal keys after existing ones, so arrival order is kept
+        bisect.insort(self._pending, entry, key=lambda e: e.sort_key)
+        self._channel_keys[response.channel] = max(
+            entry.sort_key, self._channel_keys.get(response.channel, entry.sort_key)
+        )
 
-# Global counter for result numbering
-result_counter = 0
+        if len(self._pending) >= self._flush_size:
+            ready = 0
+            if len(self._channel_keys) >= self._channel_count:
+                watermark = min(self._channel_keys.values())
+                ready = bisect.bisect_right(self._pending, watermark, key=lambda e: e.sort_key)
+            if ready < self._flush_size and len(self._pending) >= self._max_pending:
+                ready = self._flush_size
+            if ready:
+                self._write(ready)
+
+    def flush(self) -> None:
+        """Write all pending entries, call once the request is finished."""
+        self._write(len(self._pending))
+        self._sink.flush()
+
+    def _write(self, count: int) -> None:
+        lines = []
+        for entry in self._pending[:count]:
+            self.written += 1
+            time_info = f"({entry.start_time_ms / 1000:05.2f}s-{entry.end_time_ms / 1000:05.2f}s)"
+            lines.append(
+                f"Result {self.written}:\n"
+                f"        Channel: {entry.channel}\n"
+                f'        Hypothesis {time_info}: "{entry.transcript}" '
+                f"is_final: {entry.is_final}\n\n"
+            )
+        self._sink.write("".join(lines))
+        del self._pending[:count]
 
 
 def _duration_to_str(d: Duration) -> str:
@@ -65,9 +148,6 @@ def print_genderage_result(genderage: stt_response_pb2.SpeakerGenderAgePredictio
 def print_hypothesis(
     hypothesis: stt_response_pb2.SpeechRecognitionHypothesis,
     is_final: bool = True,
-    text_file_output: bool = False,
-    text_file_path: str | None = None,
-    channel: int | None = None,
 ) -> None:
     transcript = None
     if hypothesis.normalized_transcript:  # Just check if the field has a value
@@ -90,18 +170,6 @@ def print_hypothesis(
 
         click.echo(msg)
 
-        # Add to global transcriptions list if it's a final result
-        if text_file_output:  # Changed condition to collect all transcriptions
-            click.echo(f"\tAdding transcription to list: Channel {channel}, Text: {transcript}")
-            entry = TranscriptionEntry(
-                start_time_ms=hypothesis.start_time_ms,
-                end_time_ms=hypothesis.end_time_ms,
-                transcript=transcript,
-                channel=channel,
-                is_final=is_final
-            )
-            all_transcriptions.append(entry)
-
     words = hypothesis.normalized_words or hypothesis.words
 
     for word in words:
@@ -199,34 +267,10 @@ def print_words(words: Iterable[stt_response_pb2.SpeechRecognitionHypothesis.Wor
     )
 
 
-def print_recognize_response(response, is_file_response=False, text_file_output=False, audio_file=None):
-    global result_counter
-    
-    # If text file output is enabled, prepare the output file path
-    text_file_path = None
+def print_recognize_response(response, is_file_response=False):
     current_channel = None
     if response.channel:
         current_channel = response.channel
-        
-    if text_file_output and audio_file:
-        try:
-            # Get the base name of the audio file without extension
-            base_name = os.path.splitext(audio_file)[0]
-            text_file_path = f"{base_name}.txt"
-            
-            # Create directory if it doesn't exist
-            dir_path = os.path.dirname(text_file_path)
-            if dir_path:
-                os.makedirs(dir_path, exist_ok=True)
-            
-            # Clear the file and reset counter only on the first response
-            if hasattr(response, 'header') and response.header:
-                if os.path.exists(text_file_path):
-                    os.remove(text_file_path)
-                result_counter = 0  # Reset counter at start
-        except Exception as e:
-            click.echo(f"\nError handling text file: {str(e)}")
-            text_file_path = None
 
     # Print header information if available
     if hasattr(response, 'header') and response.header:
@@ -257,16 +301,6 @@ def print_recognize_response(response, is_file_response=False, text_file_output=
 
         # Define time_info for display
         time_info = f"({response.hypothesis.start_time_ms/1000:05.2f}s-{response.hypothesis.end_time_ms/1000:05.2f}s)"
-        
-        if transcript and text_file_output and text_file_path:
-            try:
-                result_counter += 1  # Increment counter for each result
-                with open(text_file_path, 'a', encoding='utf-8') as f:
-                    f.write(f"Result {result_counter}:\n")
-                    f.write(f"        Channel: {current_channel}\n")
-                    f.write(f'        Hypothesis {time_info}: "{transcript}" is_final: {is_final}\n\n')
-            except Exception as e:
-                click.echo(f"\nError writing to file: {str(e)}")
 
         msg = f'\tHypothesis{time_info}: "{transcript}" is_final: {is_final}'
         if is_final:
@@ -289,27 +323,3 @@ def print_recognize_response(response, is_file_response=False, text_file_output=
 
     if response.spoofing_result:
         print_spoofing_results(response.spoofing_result)
-
-    # Write sorted transcriptions to file only on the last response of the sequence
-    if text_file_output and text_file_path and is_file_response and not response.HasField("hypothesis"):
-        try:
-            click.echo(f"\nPreparing to write {len(all_transcriptions)} transcriptions to file")
-            # Sort all transcriptions by start time, using end time as secondary sort for 0-start entries
-            sorted_transcriptions = sorted(all_transcriptions, key=lambda x: (x.start_time_ms if x.start_time_ms > 0 else x.end_time_ms))
-            
-            # Write to file
-            with open(text_file_path, 'w', encoding='utf-8') as f:
-                # Write results in the expected format
-                for idx, entry in enumerate(sorted_transcriptions, 1):
-                    if entry.transcript.strip():  # Only write non-empty transcripts
-                        click.echo(f"\nWriting Result {idx} to file")
-                        f.write(f"Result {idx}:\n")
-                        f.write(f"        Channel: {entry.channel}\n")
-                        time_info = f"({entry.start_time_ms/1000:05.2f}s-{entry.end_time_ms/1000:05.2f}s)"
-                        f.write(f'        Hypothesis {time_info}: "{entry.transcript}" is_final: {entry.is_final}\n\n')
-                
-            click.echo(f"\nFinished writing to {text_file_path}")
-            # Clear the list after writing the final results
-            all_transcriptions = []
-        except Exception as e:
-            click.echo(f"\nError writing sorted transcriptions to file: {str(e)}")
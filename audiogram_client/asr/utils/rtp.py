@@ -0,0 +1,332 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+import heapq
+import queue
+import socket
+import struct
+import threading
+import time
+
+from audiogram_client.genproto import stt_pb2
+
+from .definitions import G711_SILENCE, RTP_PAYLOAD_ENCODINGS, RTP_SAMPLE_RATE
+
+RTP_VERSION = 2
+_HEADER = struct.Struct("!BBHII")
+_EXTENSION_HEADER = struct.Struct("!HH")
+_SEQUENCE_MOD = 1 << 16
+# NB: a bigger jump means the sender restarted or lost a lot, don't fill it with silence
+_MAX_CONCEALED_PACKETS = 50
+# NB: packets further behind are not late but a sender restarted with a new sequence
+_MAX_MISORDER = 100
+_MAX_DATAGRAM_SIZE = 65535
+
+
+@dataclass(frozen=True)
+class RtpPacket:
+    ssrc: int
+    sequence: int
+    timestamp: int
+    payload_type: int
+    marker: bool
+    payload: bytes
+
+
+def parse_rtp_packet(data: bytes) -> RtpPacket:
+    """Parse RFC 3550 packet, skipping CSRC list, header extension and padding.
+
+    Raises `ValueError` for anything that is not a well-formed RTP v2 packet.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("packet is shorter than RTP header")
+
+    first, second, sequence, timestamp, ssrc = _HEADER.unpack_from(data)
+    if first >> 6 != RTP_VERSION:
+        raise ValueError(f"unsupported RTP version: {first >> 6}")
+
+    offset = _HEADER.size + (first & 0x0F) * 4
+    if first & 0x10:
+        if len(data) < offset + _EXTENSION_HEADER.size:
+            raise ValueError("header extension exceeds packet size")
+        _, extension_words = _EXTENSION_HEADER.unpack_from(data, offset)
+        offset += _EXTENSION_HEADER.size + extension_words * 4
+
+    end = len(data)
+    if first & 0x20:
+        end -= data[-1]
+    if offset > end:
+        raise ValueError("RTP header exceeds packet size")
+
+    return RtpPacket(
+        ssrc=ssrc,
+        sequence=sequence,
+        timestamp=timestamp,
+        payload_type=second & 0x7F,
+        marker=bool(second & 0x80),
+        payload=data[offset:end],
+    )
+
+
+class JitterBuffer:
+    """Reorder payloads of one RTP stream by sequence number.
+
+    Up to `depth` packets are held back, so packets arriving out of order
+    within that window are put in place. Packets behind the last released
+    one are dropped as late, unless they are so far behind that the sender
+    must have restarted: then held packets are released and the buffer
+    starts over from the new sequence. Gaps are filled with `silence` bytes
+    of the previous payload length, so the audio timeline stays intact.
+    """
+
+    def __init__(self, depth: int, silence: int) -> None:
+        self._depth = depth
+        self._silence = silence
+        self._pending: dict[int, bytes] = {}
+        self._order: list[int] = []  # heap of extended sequence numbers
+        self._highest: int | None = None
+        self._next: int | None = None
+        self._payload_len = 0
+
+        self.late = 0
+        self.lost = 0
+        self.resyncs = 0
+
+    def _extend(self, sequence: int) -> int:
+        """Unwrap 16-bit sequence number relative to the highest one seen."""
+        if self._highest is None:
+            return sequence
+
+        delta = (sequence - self._highest) % _SEQUENCE_MOD
+        if delta >= _SEQUENCE_MOD // 2:
+            delta -= _SEQUENCE_MOD
+        return self._highest + delta
+
+    def push(self, sequence: int, payload: bytes) -> list[bytes]:
+        """Add a packet, return payloads that are ready to be sent, in order."""
+        released: list[bytes] = []
+        extended = self._extend(sequence)
+        if self._next is not None and self._next - extended > _MAX_MISORDER:
+            released = self.flush()
+            self._highest = self._next = None
+            extended = sequence
+            self.resyncs += 1
+
+        if self._next is None:
+            self._next = extended
+        if extended < self._next or extended in self._pending:
+            self.late += 1
+            return released
+
+        self._highest = extended if self._highest is None else max(self._highest, extended)
+        self._pending[extended] = payload
+        heapq.heappush(self._order, extended)
+
+        while self._order and (self._order[0] == self._next or len(self._order) > self._depth):
+            released.extend(self._release())
+        return released
+
+    def flush(self) -> list[bytes]:
+        """Release all held packets, eg. when the stream has ended."""
+        released: list[bytes] = []
+        while self._order:
+            released.extend(self._release())
+        return released
+
+    def _release(self) -> list[bytes]:
+        extended = heapq.heappop(self._order)
+        payload = self._pending.pop(extended)
+        assert self._next is not None
+
+        released = []
+        gap = extended - self._next
+        if gap:
+            self.lost += gap
+            if gap <= _MAX_CONCEALED_PACKETS:
+                released.append(bytes([self._silence]) * (self._payload_len * gap))
+
+        released.append(payload)
+        self._payload_len = len(payload)
+        self._next = extended + 1
+        return released
+
+
+class RtpCall:
+    """Audio of one RTP stream (SSRC), handed over from the receiver to a Recognize call.
+
+    The receiver thread feeds packets, the gRPC sender thread consumes
+    payloads through `chunks`. Payloads are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        ssrc: int,
+        payload_type: int,
+        jitter_depth: int,
+        chunk_len_ms: int,
+    ) -> None:
+        self.ssrc = ssrc
+        self.payload_type = payload_type
+        self.encoding: stt_pb2.AudioEncoding.ValueType = RTP_PAYLOAD_ENCODINGS[payload_type]
+        self.started = time.monotonic()
+        self.last_packet = self.started
+        self.packets = 0
+        self.aborted = False
+
+        self._jitter = JitterBuffer(jitter_depth, G711_SILENCE[self.encoding])
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        # NB: G.711 is one byte per sample
+        self._chunk_len = RTP_SAMPLE_RATE * chunk_len_ms // 1000
+
+    @property
+    def late(self) -> int:
+        return self._jitter.late
+
+    @property
+    def lost(self) -> int:
+        return self._jitter.lost
+
+    def feed(self, packet: RtpPacket) -> None:
+        self.last_packet = time.monotonic()
+        self.packets += 1
+        if self.aborted:
+            return
+        for payload in self._jitter.push(packet.sequence, packet.payload):
+            self._queue.put(payload)
+
+    def end(self) -> None:
+        if not self.aborted:
+            for payload in self._jitter.flush():
+                self._queue.put(payload)
+        self._queue.put(None)
+
+    def abort(self) -> None:
+        """Stop queueing audio nobody reads anymore, eg. after the Recognize call failed.
+
+        The call stays known to the receiver until it goes idle, so its
+        packets keep being dropped instead of starting a new call.
+        """
+        self.aborted = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield audio in chunks of about `chunk_len_ms` until the call ends."""
+        buffer = bytearray()
+        while (payload := self._queue.get()) is not None:
+            buffer += payload
+            if len(buffer) >= self._chunk_len:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+    def summary(self) -> str:
+        return (
+            f"{self.packets} packets, {self.lost} lost, {self.late} late, "
+            f"{self._jitter.resyncs} resyncs, {self.last_packet - self.started:.1f} s"
+            f"{', recognition aborted' if self.aborted else ''}"
+        )
+
+
+class RtpReceiver:
+    """Demultiplex RTP packets arriving on one UDP socket into calls by SSRC.
+
+    A new SSRC starts a call and `on_call_start` is invoked, a call ends
+    after `idle_timeout` seconds without packets and `on_call_end` is
+    invoked. Both run in the receiver thread and must not block. Only
+    G.711 payload types are accepted, others (eg. DTMF events) are ignored.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        on_call_start: Callable[[RtpCall], None],
+        jitter_depth: int,
+        chunk_len_ms: int,
+        idle_timeout: float,
+        max_calls: int,
+        on_call_end: Callable[[RtpCall], None] | None = None,
+    ) -> None:
+        self._socket = sock
+        self._on_call_start = on_call_start
+        self._on_call_end = on_call_end
+        self._jitter_depth = jitter_depth
+        self._chunk_len_ms = chunk_len_ms
+        self._idle_timeout = idle_timeout
+        self._max_calls = max_calls
+        self._calls: dict[int, RtpCall] = {}
+        self._stopped = threading.Event()
+
+        self.malformed = 0
+        self.ignored = 0
+        self.rejected_calls = 0
+
+    @property
+    def active_calls(self) -> int:
+        return len(self._calls)
+
+    def serve(self) -> None:
+        """Receive packets until `stop` is called, then end all calls."""
+        self._socket.settimeout(min(self._idle_timeout, 1.0) / 2)
+        try:
+            while not self._stopped.is_set():
+                try:
+                    data = self._socket.recv(_MAX_DATAGRAM_SIZE)
+                except TimeoutError:
+                    data = b""
+
+                if data:
+                    self._dispatch(data)
+                self._expire(time.monotonic() - self._idle_timeout)
+        finally:
+            for ssrc in list(self._calls):
+                self._end_call(ssrc)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _dispatch(self, data: bytes) -> None:
+        try:
+            packet = parse_rtp_packet(data)
+        except ValueError:
+            self.malformed += 1
+            return
+
+        call = self._calls.get(packet.ssrc)
+        if call is None:
+            if packet.payload_type not in RTP_PAYLOAD_ENCODINGS:
+                self.ignored += 1
+                return
+            if len(self._calls) >= self._max_calls:
+                self.rejected_calls += 1
+                return
+
+            call = RtpCall(packet.ssrc, packet.payload_type, self._jitter_depth, self._chunk_len_ms)
+            self._calls[packet.ssrc] = call
+            self._on_call_start(call)
+
+        if packet.payload_type != call.payload_type:
+            self.ignored += 1
+            return
+
+        call.feed(packet)
+
+    def _expire(self, idle_since: float) -> None:
+        for ssrc in [ssrc for ssrc, call in self._calls.items() if call.last_packet < idle_since]:
+            self._end_call(ssrc)
+
+    def _end_call(self, ssrc: int) -> None:
+        call = self._calls.pop(ssrc)
+        call.end()
+        if self._on_call_end is not None:
+            self._on_call_end(call)
+
+    def stats(self) -> str:
+        return (
+            f"{self.active_calls} active calls, {self.rejected_calls} rejected, "
+            f"{self.malformed} malformed and {self.ignored} ignored packets"
+        )
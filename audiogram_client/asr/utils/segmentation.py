@@ -0,0 +1,252 @@
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+import operator
+from typing import Literal
+
+from audiogram_client.common_utils.audio import AudioFile
+
+from .definitions import (
+    DEFAULT_TRIM_MIN_SILENCE_MS,
+    DEFAULT_TRIM_PAD_MS,
+    DEFAULT_TRIM_THRESHOLD_DBFS,
+    SPLIT_SEARCH_MS,
+    SPLIT_WINDOW_MS,
+    TRIM_BLOCK_FRAMES,
+    TRIM_FRAME_MS,
+)
+from .timeline import OffsetMap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# NB: memoryview.cast formats for signed PCM sample widths
+_SAMPLE_FORMATS: dict[int, Literal["h", "i"]] = {2: "h", 4: "i"}
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Part of an audio file, bounds are in frames."""
+
+    start_frame: int
+    end_frame: int
+    sample_rate: int
+
+    @property
+    def start_ms(self) -> int:
+        return self.start_frame * 1000 // self.sample_rate
+
+    @property
+    def end_ms(self) -> int:
+        return self.end_frame * 1000 // self.sample_rate
+
+    @property
+    def duration_ms(self) -> int:
+        return (self.end_frame - self.start_frame) * 1000 // self.sample_rate
+
+    def pcm(self, audio: AudioFile) -> memoryview:
+        return audio.pcm[self.start_frame * audio.frame_size : self.end_frame * audio.frame_size]
+
+
+def audio_windows(audio: AudioFile, ranges_ms: Sequence[tuple[int, int | None]]) -> list[Segment]:
+    """Convert (start_ms, end_ms) ranges to segments in time order, clamped to the audio length.
+
+    `end_ms` of None means the end of audio. Overlapping and adjacent ranges
+    are merged, so no audio is recognized twice. Raises `ValueError` for a
+    range which is empty or starts past the end of audio.
+    """
+    rate = audio.sample_rate
+    total = audio.frame_count
+
+    windows: list[Segment] = []
+    for start_ms, end_ms in sorted(ranges_ms, key=operator.itemgetter(0)):
+        start = start_ms * rate // 1000
+        end = total if end_ms is None else min(total, end_ms * rate // 1000)
+        if start >= end:
+            raise ValueError(
+                f"Range {_format_range(start_ms, end_ms)} is outside of the audio "
+                f"(duration is {audio.duration_ms / 1000:.2f} s)"
+            )
+        if windows and start <= windows[-1].end_frame:
+            last = windows.pop()
+            start, end = last.start_frame, max(last.end_frame, end)
+        windows.append(Segment(start, end, rate))
+
+    return windows
+
+
+def format_windows(windows: Sequence[Segment]) -> str:
+    if not windows:
+        return "whole file"
+    return ", ".join(f"{w.start_ms / 1000:.2f}-{w.end_ms / 1000:.2f} s" for w in windows)
+
+
+def trim_summary(analyzed_ms: int, kept_ms: int) -> str:
+    skipped_ms = analyzed_ms - kept_ms
+    return (
+        f"skipped {skipped_ms / 1000:.1f} s of {analyzed_ms / 1000:.1f} s "
+        f"({skipped_ms / max(analyzed_ms, 1):.0%}), sending {kept_ms / 1000:.1f} s"
+    )
+
+
+def _format_range(start_ms: int, end_ms: int | None) -> str:
+    end = "end" if end_ms is None else f"{end_ms / 1000:.2f}s"
+    return f"{start_ms / 1000:.2f}s-{end}"
+
+
+def _window_energy(audio: AudioFile, start_frame: int, frame_count: int) -> int:
+    samples = audio.pcm[
+        start_frame * audio.frame_size : (start_frame + frame_count) * audio.frame_size
+    ].cast(_SAMPLE_FORMATS[audio.sample_size])
+
+    return sum(map(operator.mul, samples, samples))
+
+
+def _quietest_frame(audio: AudioFile, start_frame: int, end_frame: int, window: int) -> int:
+    """Return the middle frame of the lowest-energy window in [start_frame, end_frame)."""
+    best_frame = (start_frame + end_frame) // 2
+    if audio.sample_size not in _SAMPLE_FORMATS:
+        return best_frame
+
+    best_energy = None
+    step = max(1, window // 2)
+    for frame in range(start_frame, end_frame - window + 1, step):
+        energy = _window_energy(audio, frame, window)
+        if best_energy is None or energy < best_energy:
+            best_energy = energy
+            best_frame = frame + window // 2
+
+    return best_frame
+
+
+def split_on_silence(
+    audio: AudioFile,
+    segment_len_ms: int,
+    search_ms: int = SPLIT_SEARCH_MS,
+    window_ms: int = SPLIT_WINDOW_MS,
+    bounds: Segment | None = None,
+) -> list[Segment]:
+    """Split audio into segments of about `segment_len_ms`, cutting at low-energy points.
+
+    Around every target boundary a region of +/- `search_ms` is scanned with
+    `window_ms` windows and the cut is placed in the quietest one, so words
+    are rarely split between segments. Only the search regions are read.
+    With `bounds`, only that part of the audio is split.
+    """
+    rate = audio.sample_rate
+    total = audio.frame_count if bounds is None else bounds.end_frame
+    target = max(1, segment_len_ms * rate // 1000)
+    search = min(search_ms * rate // 1000, target // 2)
+    window = max(1, window_ms * rate // 1000)
+
+    segments = []
+    position = 0 if bounds is None else bounds.start_frame
+    while total - position > target + search:
+        split = _quietest_frame(
+            audio,
+            position + target - search,
+            position + target + search,
+            window,
+        )
+        segments.append(Segment(position, split, rate))
+        position = split
+
+    segments.append(Segment(position, total, rate))
+    return segments
+
+
+def _loud_frames(
+    audio: AudioFile,
+    start_frame: int,
+    end_frame: int,
+    frame_len: int,
+    threshold: float,
+) -> Iterator[bool]:
+    """Yield whether mean square of every `frame_len` frames reaches `threshold`.
+
+    Audio is processed in blocks, vectorized with numpy when it's installed.
+    """
+    sample_format = _SAMPLE_FORMATS[audio.sample_size]
+    block_len = frame_len * TRIM_BLOCK_FRAMES
+    step = frame_len * audio.channel_count
+
+    for block_start in range(start_frame, end_frame, block_len):
+        block_end = min(end_frame, block_start + block_len)
+        block = audio.pcm[block_start * audio.frame_size : block_end * audio.frame_size]
+        if np is not None:
+            samples = np.frombuffer(block, dtype=f"<i{audio.sample_size}").astype(np.float64)
+            offsets = np.arange(0, len(samples), step)
+            sums = np.add.reduceat(samples * samples, offsets)
+            counts = np.diff(np.append(offsets, len(samples)))
+            yield from (sums / counts >= threshold).tolist()
+            continue
+
+        samples = block.cast(sample_format)
+        for offset in range(0, len(samples), step):
+            frame = samples[offset : offset + step]
+            yield sum(map(operator.mul, frame, frame)) / len(frame) >= threshold
+
+
+def detect_speech(
+    audio: AudioFile,
+    threshold_dbfs: float = DEFAULT_TRIM_THRESHOLD_DBFS,
+    min_silence_ms: int = DEFAULT_TRIM_MIN_SILENCE_MS,
+    pad_ms: int = DEFAULT_TRIM_PAD_MS,
+    bounds: Segment | None = None,
+) -> list[Segment]:
+    """Find parts of audio louder than `threshold_dbfs`, by energy of short frames.
+
+    Pauses shorter than `min_silence_ms` are kept inside speech, every part is
+    extended by `pad_ms` on both sides, so longer pauses are shortened to
+    `2 * pad_ms` instead of being removed. With `bounds`, only that part of
+    the audio is analyzed.
+    """
+    rate = audio.sample_rate
+    start = 0 if bounds is None else bounds.start_frame
+    end = audio.frame_count if bounds is None else bounds.end_frame
+    if audio.sample_size not in _SAMPLE_FORMATS:
+        return [Segment(start, end, rate)]
+
+    frame_len = max(1, TRIM_FRAME_MS * rate // 1000)
+    pad = pad_ms * rate // 1000
+    max_gap = max(min_silence_ms * rate // 1000, 2 * pad)
+    full_scale = 1 << (8 * audio.sample_size - 1)
+    threshold = full_scale * full_scale * 10 ** (threshold_dbfs / 10)
+
+    runs: list[list[int]] = []
+    for idx, loud in enumerate(_loud_frames(audio, start, end, frame_len, threshold)):
+        if not loud:
+            continue
+        frame_start = start + idx * frame_len
+        frame_end = min(end, frame_start + frame_len)
+        if runs and frame_start - runs[-1][1] <= max_gap:
+            runs[-1][1] = frame_end
+        else:
+            runs.append([frame_start, frame_end])
+
+    return [Segment(max(start, a - pad), min(end, b + pad), rate) for a, b in runs]
+
+
+def trim_audio(audio: AudioFile, parts: Sequence[Segment]) -> tuple[AudioFile, OffsetMap]:
+    """Join `parts` of audio into new audio, with a map of its times back to the original."""
+    pcm = b"".join(part.pcm(audio) for part in parts)
+    trimmed = AudioFile.from_pcm(pcm, audio.sample_rate, audio.channel_count, audio.sample_size)
+    return trimmed, OffsetMap((part.start_ms, part.end_ms) for part in parts)
+
+
+def cut_silence(
+    audio: AudioFile,
+    windows: Sequence[Segment],
+    threshold_dbfs: float,
+    min_silence_ms: int,
+    pad_ms: int,
+) -> tuple[AudioFile, OffsetMap]:
+    """Remove long pauses from audio, or from the given windows only (the rest is dropped)."""
+    bounds: Sequence[Segment | None] = windows or [None]
+    parts = [
+        part
+        for window in bounds
+        for part in detect_speech(audio, threshold_dbfs, min_silence_ms, pad_ms, window)
+    ]
+    return trim_audio(audio, parts)
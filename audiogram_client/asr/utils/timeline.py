@@ -0,0 +1,98 @@
+import bisect
+from collections.abc import Callable, Iterable
+
+from audiogram_client.genproto import stt_response_pb2
+
+TimeMapper = Callable[[int], int]
+
+
+class OffsetMap:
+    """Translate times in audio with cut out parts back to the original audio.
+
+    Built from the kept (start_ms, end_ms) spans of the original audio in
+    order. Instances are `TimeMapper`s, so they can be passed directly to
+    `remap_response_times`. A map without spans leaves times as they are.
+
+    A time on the boundary of two spans is both the end of one and the start
+    of the next: calling the map gives the start of the next span, `end()`
+    gives the end of the previous one.
+    """
+
+    def __init__(self, spans: Iterable[tuple[int, int]]) -> None:
+        self._kept_starts: list[int] = []
+        self._original_starts: list[int] = []
+
+        position = 0
+        for start_ms, end_ms in spans:
+            self._kept_starts.append(position)
+            self._original_starts.append(start_ms)
+            position += end_ms - start_ms
+
+        self.kept_ms = position
+
+    def __call__(self, time_ms: int) -> int:
+        if not self._kept_starts:
+            return time_ms
+
+        idx = max(0, bisect.bisect_right(self._kept_starts, time_ms) - 1)
+        return self._original_starts[idx] + time_ms - self._kept_starts[idx]
+
+    def end(self, time_ms: int) -> int:
+        """Map the end of an interval, boundary times stay in the span they close."""
+        if not self._kept_starts:
+            return time_ms
+
+        idx = max(0, bisect.bisect_left(self._kept_starts, time_ms) - 1)
+        return self._original_starts[idx] + time_ms - self._kept_starts[idx]
+
+
+def remap_response_times(response: stt_response_pb2.RecognizeResponse, mapper: TimeMapper) -> None:
+    """Translate every timestamp of a response in place using `mapper(ms) -> ms`.
+
+    Covers hypothesis bounds, words, normalized words, voice activity marks
+    and spoofing intervals. End times of an `OffsetMap` are mapped with its
+    `end()`, so they never jump over a cut out part.
+    """
+    map_end = mapper.end if isinstance(mapper, OffsetMap) else mapper
+    hypothesis = response.hypothesis
+    hypothesis.start_time_ms = mapper(hypothesis.start_time_ms)
+    hypothesis.end_time_ms = map_end(hypothesis.end_time_ms)
+
+    for word in (*hypothesis.words, *hypothesis.normalized_words):
+        word.start_time_ms = mapper(word.start_time_ms)
+        word.end_time_ms = map_end(word.end_time_ms)
+
+    for mark in response.va_marks:
+        mark.offset_ms = mapper(mark.offset_ms)
+
+    for spoofing in response.spoofing_result:
+        spoofing.start_time_ms = mapper(spoofing.start_time_ms)
+        spoofing.end_time_ms = map_end(spoofing.end_time_ms)
+
+
+def shift_response_times(response: stt_response_pb2.RecognizeResponse, offset_ms: int) -> None:
+    """Move every timestamp of a response by `offset_ms` in place."""
+    if offset_ms:
+        remap_response_times(response, lambda time_ms: time_ms + offset_ms)
+
+
+def merge_file_responses(
+    parts: Iterable[tuple[int, stt_response_pb2.FileRecognizeResponse]],
+) -> stt_response_pb2.FileRecognizeResponse:
+    """Merge responses for consecutive audio parts into one timeline.
+
+    `parts` are (offset_ms, response) pairs in audio order; results of each
+    part are shifted by its offset. The header of the first part is kept.
+    """
+    merged = stt_response_pb2.FileRecognizeResponse()
+
+    for idx, (offset_ms, part) in enumerate(parts):
+        if idx == 0 and part.HasField("header"):
+            merged.header.CopyFrom(part.header)
+
+        for result in part.response:
+            merged_result = merged.response.add()
+            merged_result.CopyFrom(result)
+            shift_response_times(merged_result, offset_ms)
+
+    return merged
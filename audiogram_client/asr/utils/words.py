@@ -0,0 +1,182 @@
+from array import array
+import mmap
+import os
+import struct
+import sys
+from types import TracebackType
+from typing import Literal, Self
+
+from audiogram_client.genproto import stt_response_pb2
+
+from .definitions import WORD_TABLE_MAGIC, WORD_TABLE_VERSION
+
+# NB: magic, version, row count, vocabulary size, vocabulary blob size
+_HEADER = struct.Struct("<4sIIII")
+
+# NB: all columns are 4-byte, so they stay aligned after the padded vocabulary
+_COLUMNS: tuple[tuple[str, Literal["I", "f", "i"]], ...] = (
+    ("start_ms", "I"),
+    ("end_ms", "I"),
+    ("confidence", "f"),
+    ("word_ids", "I"),
+    ("channel", "i"),
+    ("speaker_id", "I"),
+)
+
+
+def _padded(size: int) -> int:
+    return -(-size // 4) * 4
+
+
+def _little_endian(column: array | memoryview) -> array | memoryview:
+    if sys.byteorder == "little":
+        return column
+    swapped = array(column.format if isinstance(column, memoryview) else column.typecode, column)
+    swapped.byteswap()
+    return swapped
+
+
+class WordTable:
+    """Word timings of a transcript stored column by column.
+
+    Every word is a row in parallel arrays: start/end ms, confidence, word
+    id, channel and speaker id. Word strings are interned in a vocabulary,
+    so repeated words are stored once. Compared to `WordInfo` messages this
+    takes a fraction of the memory, and columns can be wrapped with
+    `numpy.frombuffer` without copying.
+
+    Tables loaded from a file are memory mapped and read-only.
+    """
+
+    __slots__ = (*(name for name, _ in _COLUMNS), "vocabulary", "_word_index", "_mmap")
+
+    start_ms: array | memoryview
+    end_ms: array | memoryview
+    confidence: array | memoryview
+    word_ids: array | memoryview
+    channel: array | memoryview
+    speaker_id: array | memoryview
+
+    def __init__(self) -> None:
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+        self.vocabulary: list[str] = []
+        self._word_index: dict[str, int] = {}
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def from_response(cls, response: stt_response_pb2.FileRecognizeResponse) -> Self:
+        table = cls()
+        for result in response.response:
+            table.add(result)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.start_ms)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def word(self, row: int) -> str:
+        return self.vocabulary[self.word_ids[row]]
+
+    def add(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        """Append the words of one result, normalized words are preferred."""
+        if self._mmap is not None:
+            raise TypeError("word table loaded from a file is read-only")
+
+        start_ms, end_ms, confidence, word_ids, channel, speaker_id = (
+            getattr(self, name) for name, _ in _COLUMNS
+        )
+        hypothesis = response.hypothesis
+        for info in hypothesis.normalized_words or hypothesis.words:
+            word_id = self._word_index.get(info.word)
+            if word_id is None:
+                word_id = self._word_index[info.word] = len(self.vocabulary)
+                self.vocabulary.append(info.word)
+
+            start_ms.append(info.start_time_ms)
+            end_ms.append(info.end_time_ms)
+            confidence.append(info.confidence)
+            word_ids.append(word_id)
+            channel.append(response.channel)
+            speaker_id.append(response.speaker_info.speaker_id)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the table to a file: header, vocabulary and raw little-endian columns."""
+        encoded = [word.encode("utf-8") for word in self.vocabulary]
+        offsets = array("I", [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        blob = b"".join(encoded)
+
+        with open(path, "wb") as file:
+            file.write(
+                _HEADER.pack(
+                    WORD_TABLE_MAGIC, WORD_TABLE_VERSION, len(self), len(encoded), len(blob)
+                )
+            )
+            file.write(_little_endian(offsets))
+            file.write(blob)
+            file.write(b"\0" * (_padded(file.tell()) - file.tell()))
+            for name, _ in _COLUMNS:
+                file.write(_little_endian(getattr(self, name)))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Self:
+        """Map a saved table, columns are views of the file and nothing is copied."""
+        table = cls.__new__(cls)
+        with open(path, "rb") as file:
+            table._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(table._mmap)
+        magic, version, rows, words, blob_size = _HEADER.unpack_from(view)
+        if magic != WORD_TABLE_MAGIC or version != WORD_TABLE_VERSION:
+            view.release()
+            table._mmap.close()
+            raise ValueError(f"{path} is not a word table of version {WORD_TABLE_VERSION}")
+
+        position = _HEADER.size
+        offsets = array("I")
+        offsets.frombytes(view[position : position + (words + 1) * 4])
+        position += (words + 1) * 4
+        blob = bytes(view[position : position + blob_size])
+        position = _padded(position + blob_size)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        table.vocabulary = [
+            blob[offsets[idx] : offsets[idx + 1]].decode("utf-8") for idx in range(words)
+        ]
+        table._word_index = {word: idx for idx, word in enumerate(table.vocabulary)}
+
+        for name, typecode in _COLUMNS:
+            column: array | memoryview[int] | memoryview[float] = view[
+                position : position + rows * 4
+            ].cast(typecode)
+            if sys.byteorder == "big":
+                column = array(typecode, column)
+                column.byteswap()
+            setattr(table, name, column)
+            position += rows * 4
+
+        view.release()
+        return table
+
+    def close(self) -> None:
+        """Release the file mapping of a loaded table."""
+        if self._mmap is None:
+            return
+
+        for name, _ in _COLUMNS:
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                column.release()
+        self._mmap.close()
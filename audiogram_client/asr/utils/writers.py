@@ -0,0 +1,217 @@
+from abc import ABC, abstractmethod
+import csv
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import ClassVar, Self
+
+from google.protobuf.json_format import MessageToDict
+
+from audiogram_client.genproto import stt_response_pb2
+
+from .definitions import WRITE_BUFFER_SIZE
+from .response import TranscriptCollector
+from .words import WordTable
+
+
+def _transcript(response: stt_response_pb2.RecognizeResponse) -> str:
+    hypothesis = response.hypothesis
+    return str(hypothesis.normalized_transcript or hypothesis.transcript)
+
+
+def _timestamp(time_ms: int, separator: str) -> str:
+    hours, time_ms = divmod(time_ms, 3_600_000)
+    minutes, time_ms = divmod(time_ms, 60_000)
+    seconds, millis = divmod(time_ms, 1000)
+    return f"{hours:02}:{minutes:02}:{seconds:02}{separator}{millis:03}"
+
+
+class ResultWriter(ABC):
+    """Base of recognition result writers.
+
+    The output file is opened once with a large buffer and every response
+    is appended as it arrives. `channel_count` is the number of result
+    channels, it is only needed by writers that reorder results.
+    """
+
+    suffix: ClassVar[str]
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        self._file = open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @abstractmethod
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        """Append one response to the output."""
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlWriter(ResultWriter):
+    """Every response as a JSON object on its own line, all fields included."""
+
+    suffix = ".jsonl"
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        record = MessageToDict(response, preserving_proto_field_name=True)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(ResultWriter):
+    """One row per hypothesis with a transcript."""
+
+    suffix = ".csv"
+    header = ("start_ms", "end_ms", "channel", "speaker_id", "confidence", "transcript")
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        super().__init__(path, channel_count)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.header)
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        if transcript := _transcript(response):
+            hypothesis = response.hypothesis
+            self._writer.writerow(
+                (
+                    hypothesis.start_time_ms,
+                    hypothesis.end_time_ms,
+                    response.channel,
+                    response.speaker_info.speaker_id,
+                    f"{hypothesis.confidence:.4g}",
+                    transcript,
+                )
+            )
+
+
+class SrtWriter(ResultWriter):
+    """SubRip subtitles, one cue per hypothesis with a transcript."""
+
+    suffix = ".srt"
+    time_separator = ","
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        super().__init__(path, channel_count)
+        self._cue_count = 0
+
+    def _cue_text(self, response: stt_response_pb2.RecognizeResponse) -> str:
+        transcript = _transcript(response)
+        return f"Channel {response.channel}: {transcript}" if response.channel else transcript
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        if not _transcript(response):
+            return
+
+        self._cue_count += 1
+        start = _timestamp(response.hypothesis.start_time_ms, self.time_separator)
+        end = _timestamp(response.hypothesis.end_time_ms, self.time_separator)
+        self._file.write(f"{self._cue_count}\n{start} --> {end}\n{self._cue_text(response)}\n\n")
+
+
+class VttWriter(SrtWriter):
+    """WebVTT subtitles, speakers are marked with voice spans."""
+
+    suffix = ".vtt"
+    time_separator = "."
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        super().__init__(path, channel_count)
+        self._file.write("WEBVTT\n\n")
+
+    def _cue_text(self, response: stt_response_pb2.RecognizeResponse) -> str:
+        text = super()._cue_text(response)
+        speaker = response.speaker_info.speaker_id
+        return f"<v Speaker {speaker}>{text}" if speaker else text
+
+
+class TextWriter(ResultWriter):
+    """Numbered plain text results ordered by start time."""
+
+    suffix = ".txt"
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        super().__init__(path, channel_count)
+        self._collector = TranscriptCollector(self._file, channel_count)
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        self._collector.add(response)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._collector.flush()
+        super().close()
+
+
+class WordTableWriter(ResultWriter):
+    """Columnar word timings, see `WordTable`. Written once all results are in."""
+
+    suffix = ".words"
+
+    def __init__(self, path: str | os.PathLike, channel_count: int = 1) -> None:
+        self._path = path
+        self._table: WordTable | None = WordTable()
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        assert self._table is not None
+        self._table.add(response)
+
+    def close(self) -> None:
+        if self._table is not None:
+            self._table.save(self._path)
+            self._table = None
+
+
+WRITERS: dict[str, type[ResultWriter]] = {
+    writer.suffix: writer
+    for writer in (
+        JsonlWriter,
+        CsvWriter,
+        SrtWriter,
+        VttWriter,
+        TextWriter,
+        WordTableWriter,
+    )
+}
+
+
+class ResultWriters:
+    """Fan out responses to several writers, output format is chosen by file suffix."""
+
+    def __init__(self, paths: tuple[str, ...], channel_count: int = 1) -> None:
+        self._writers: list[ResultWriter] = []
+        try:
+            for path in paths:
+                self._writers.append(WRITERS[Path(path).suffix.lower()](path, channel_count))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, response: stt_response_pb2.RecognizeResponse) -> None:
+        for writer in self._writers:
+            writer.write(response)
+
+    def close(self) -> None:
+        for writer in self._writers:
+            writer.close()
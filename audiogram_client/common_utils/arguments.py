@@ -5,7 +5,9 @@ from typing import Callable, cast, ParamSpec, TypeAlias, TypeVar
 
 import click
 
+from audiogram_client.common_utils.auth import enable_token_disk_cache
 from audiogram_client.common_utils.config import CLIOptionsDict, Settings
+from audiogram_client.common_utils.definitions import TOKEN_CACHE_DIR
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -17,6 +19,7 @@ OptionsWrapper: TypeAlias = Callable[[OptionCallable], OptionCallable]
 _common_settings_options = [
     "api_address",
     "use_ssl",
+    "use_gzip",
     "ca_cert",
     "cert_private_key",
     "cert_chain",
@@ -26,6 +29,7 @@ _common_settings_options = [
     "sso_url",
     "realm",
     "verify_sso",
+    "token_cache",
     "iam_account",
     "iam_workspace",
 ]
@@ -71,6 +75,12 @@ def _keycloak_options() -> Iterable[OptionCallable]:
             default=None,
             help="enable CA certificate validation for Keycloak connection",
         ),
+        click.option(
+            "--token-cache",
+            type=bool,
+            default=None,
+            help="share SSO access tokens between runs through a file cache",
+        ),
     ]
 
     return options
@@ -102,6 +112,7 @@ def common_options() -> OptionsWrapper:
         - config_path: str | None - Path to the .ini config file
         - api_address: str - API address:port
         - use_ssl: bool | None - use ssl or not
+        - use_gzip: bool | None - compress gRPC messages or not
         - ca_cert: str - path to certificate file
         - timeout: float - timeout in seconds
         - client_id: str - Keycloak client ID
@@ -109,6 +120,7 @@ def common_options() -> OptionsWrapper:
         - sso_url: str - Keycloak server URL
         - realm: str - Keycloak realm ID
         - verify_sso: bool | None - enable/disable certificate verification for keycloak
+        - token_cache: bool | None - enable/disable on-disk SSO token cache
     """
     # NB (k.zhovnovatiy): When modifying options below - verify that those options' keys
     # exist in _common_settings_options and CLIOptionsDict
@@ -132,6 +144,13 @@ def common_options() -> OptionsWrapper:
             default=None,
             help="enable/disable SSL for gRPC connection",
         ),
+        click.option(
+            "--gzip",
+            "use_gzip",
+            type=bool,
+            default=None,
+            help="enable/disable gzip compression of gRPC messages",
+        ),
         click.option(
             "--ca-cert",
             type=click.Path(exists=True, dir_okay=False),
@@ -193,6 +212,9 @@ def common_options_in_settings(func: Callable[P, T]) -> Callable[P, T]:
         settings.merge_options(cast(CLIOptionsDict, options))
         settings.validators.validate()
 
+        if settings.token_cache:
+            enable_token_disk_cache(TOKEN_CACHE_DIR)
+
         for key in _common_settings_options:
             options.pop(key)
 
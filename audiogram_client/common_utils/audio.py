@@ -1,35 +1,350 @@
-import itertools
+from collections.abc import Iterator
+from dataclasses import dataclass
+import functools
+import mmap
+import socket
+import struct
+import sys
+from types import TracebackType
+from typing import BinaryIO, Self, cast
 import wave
-from collections.abc import Iterable
+
+from audiogram_client.common_utils.types import AudioFormat
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# NB: first 2 bytes of KSDATAFORMAT_SUBTYPE_PCM GUID carry the actual format tag
+_EXTENSIBLE_SUBFORMAT_OFFSET = 24
+# NB: streaming writers can't know the final size and put one of these instead
+_WAV_UNKNOWN_DATA_SIZES = (0, 0xFFFFFFFF)
+_S16LE_SAMPLE_SIZE = 2
+
+
+@dataclass(frozen=True)
+class WavHeader:
+    """Parameters of a PCM WAV file and position of its `data` chunk."""
+
+    sample_rate: int
+    channel_count: int
+    sample_size: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frame_size(self) -> int:
+        return self.sample_size * self.channel_count
+
+
+def read_wav_header(file: BinaryIO) -> WavHeader:
+    """Parse RIFF/WAVE chunks up to the beginning of the `data` chunk.
+
+    Only the header is read, the file position is left at the first PCM byte.
+    The file is never seeked, so pipes and sockets are fine too.
+    Raises `wave.Error` for anything but uncompressed PCM.
+    """
+    riff = file.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise wave.Error("file does not start with RIFF/WAVE id")
+    offset = len(riff)
+
+    fmt: tuple[int, int, int, int] | None = None
+    while True:
+        chunk_header = file.read(8)
+        if len(chunk_header) < 8:
+            raise wave.Error("data chunk is missing")
+
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        offset += len(chunk_header)
+        if chunk_id == b"data":
+            if fmt is None:
+                raise wave.Error("fmt chunk is missing")
+            format_tag, channel_count, sample_rate, bits = fmt
+            return WavHeader(
+                sample_rate=sample_rate,
+                channel_count=channel_count,
+                sample_size=(bits + 7) // 8,
+                data_offset=offset,
+                data_size=chunk_size,
+            )
+
+        chunk = file.read(chunk_size + chunk_size % 2)  # chunks are word-aligned
+        offset += len(chunk)
+        if chunk_id != b"fmt ":
+            continue
+        if chunk_size < 16:
+            raise wave.Error("fmt chunk is too short")
+
+        format_tag, channel_count, sample_rate = struct.unpack_from("<HHI", chunk)
+        (bits,) = struct.unpack_from("<H", chunk, 14)
+        if format_tag == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+            (format_tag,) = struct.unpack_from("<H", chunk, _EXTENSIBLE_SUBFORMAT_OFFSET)
+        if format_tag != _WAVE_FORMAT_PCM:
+            raise wave.Error(f"unknown format: {format_tag}")
+        if not channel_count or not bits:
+            raise wave.Error("bad channel count or sample width")
+
+        fmt = (format_tag, channel_count, sample_rate, bits)
 
 
 class AudioFile:
+    """PCM WAV file with the `data` chunk memory-mapped instead of loaded.
+
+    Audio data is paged in by the OS on access, so resident memory stays
+    small even for multi-GB recordings. Use `pcm` or `chunks` for zero-copy
+    access and `blob` only when a contiguous `bytes` object is required.
+    """
+
     def __init__(self, path: str) -> None:
-        with wave.open(path, "rb") as audio:
-            self._blob = audio.readframes(audio.getnframes())
-            self._sample_rate = audio.getframerate()
-            self._channels_count = audio.getnchannels()
-            self._sample_size = audio.getsampwidth()
+        with open(path, "rb") as file:
+            header = read_wav_header(file)
+            file_size = file.seek(0, 2)
+
+            # NB: streaming writers often leave data size unset (0 or 0xFFFFFFFF),
+            # then data runs until EOF; a set size is never trusted beyond it either
+            data_size = file_size - header.data_offset
+            if header.data_size not in _WAV_UNKNOWN_DATA_SIZES:
+                data_size = min(header.data_size, data_size)
+            data_size -= data_size % header.frame_size
+
+            self._mmap: mmap.mmap | None = None
+            if data_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                data = memoryview(self._mmap)[header.data_offset : header.data_offset + data_size]
+            else:
+                data = memoryview(b"")
+
+        self._header = header
+        self._data = data
+
+    @classmethod
+    def from_pcm(
+        cls,
+        pcm: bytes,
+        sample_rate: int,
+        channel_count: int,
+        sample_size: int = 2,
+    ) -> Self:
+        """Wrap PCM already in memory (eg. decoded from another format), nothing is mapped."""
+        header = WavHeader(sample_rate, channel_count, sample_size, 0, len(pcm))
+        return cls._from_view(header, memoryview(pcm))
+
+    @classmethod
+    def _from_view(cls, header: WavHeader, data: memoryview) -> Self:
+        audio = cls.__new__(cls)
+        audio._header = header
+        audio._mmap = None
+        audio._data = data
+        return audio
+
+    def window(self, start_frame: int, end_frame: int) -> Self:
+        """Zero-copy view of frames [start_frame, end_frame) as a separate audio file.
+
+        Offsets come from the frame size, so nothing outside the window is
+        paged in. The view shares the mapping of its parent.
+        """
+        data = self._data[start_frame * self.frame_size : end_frame * self.frame_size]
+        return self._from_view(self._header, data)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file. Chunks handed out earlier stay valid until released."""
+        self._data.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # NB: outstanding chunk views keep the mapping alive until collected
 
     @property
     def sample_rate(self) -> int:
-        return self._sample_rate
+        return self._header.sample_rate
 
     @property
     def channel_count(self) -> int:
-        return self._channels_count
+        return self._header.channel_count
+
+    @property
+    def sample_size(self) -> int:
+        return self._header.sample_size
+
+    @property
+    def frame_size(self) -> int:
+        """Size of a single frame (one sample for every channel) in bytes."""
+        return self._header.frame_size
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._data) // self.frame_size
 
     @property
+    def duration_ms(self) -> int:
+        return self.frame_count * 1000 // self.sample_rate
+
+    @property
+    def pcm(self) -> memoryview:
+        """Zero-copy view over the whole PCM data."""
+        return self._data
+
+    @functools.cached_property
     def blob(self) -> bytes:
-        return self._blob
-
-    def chunks(self, chunk_len_ms: int) -> Iterable[bytes]:
-        sample_rate_ms = self._sample_rate // 1000
-        chunk_len = chunk_len_ms * sample_rate_ms * self._sample_size
-
-        it = iter(self._blob)
-        while True:
-            chunk = bytes(itertools.islice(it, chunk_len))
-            if not chunk:
-                break
-            yield chunk
+        return self._data.tobytes()
+
+    def chunks(self, chunk_len_ms: int) -> Iterator[memoryview]:
+        """Split PCM data into chunks of `chunk_len_ms` milliseconds.
+
+        Chunks are zero-copy views over the audio buffer and always end on a
+        frame boundary, so multichannel audio is never split mid-frame.
+        """
+        frames_per_chunk = max(1, self.sample_rate * chunk_len_ms // 1000)
+        chunk_len = frames_per_chunk * self.frame_size
+
+        view = self._data
+        for offset in range(0, len(view), chunk_len):
+            yield view[offset : offset + chunk_len]
+
+
+class AudioStream:
+    """PCM audio read incrementally from stdin, a named pipe or a socket.
+
+    Nothing is read ahead: every chunk is yielded as soon as its bytes
+    have arrived, so recognition of a live source starts with the first
+    chunk instead of waiting for the end of the recording. Input is either
+    a WAV stream (header is parsed on open) or raw `s16le` PCM described
+    by `sample_rate` and `channel_count`.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        audio_format: AudioFormat = AudioFormat.wav,
+        sample_rate: int | None = None,
+        channel_count: int = 1,
+        sock: socket.socket | None = None,
+    ) -> None:
+        self._file = file
+        self._socket = sock
+        self._remaining: int | None = None  # NB: None - read until EOF
+        self.bytes_read = 0
+
+        if audio_format == AudioFormat.wav:
+            header = read_wav_header(file)
+            if header.data_size not in _WAV_UNKNOWN_DATA_SIZES:
+                self._remaining = header.data_size
+            self._sample_rate = header.sample_rate
+            self._channel_count = header.channel_count
+            self._sample_size = header.sample_size
+        else:
+            if not sample_rate:
+                raise ValueError("sample rate is required for raw PCM input")
+            self._sample_rate = sample_rate
+            self._channel_count = channel_count
+            self._sample_size = _S16LE_SAMPLE_SIZE
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        audio_format: AudioFormat = AudioFormat.wav,
+        sample_rate: int | None = None,
+        channel_count: int = 1,
+    ) -> Self:
+        """Read audio from a file or a named pipe, `-` stands for stdin."""
+        if path == "-":
+            # NB: closing the duplicate leaves sys.stdin itself usable
+            file = open(sys.stdin.buffer.fileno(), "rb", closefd=False)
+        else:
+            file = open(path, "rb")  # NB: blocks until a writer opens a FIFO
+
+        try:
+            return cls(file, audio_format, sample_rate, channel_count)
+        except BaseException:
+            file.close()
+            raise
+
+    @classmethod
+    def connect(
+        cls,
+        socket_path: str,
+        audio_format: AudioFormat = AudioFormat.wav,
+        sample_rate: int | None = None,
+        channel_count: int = 1,
+    ) -> Self:
+        """Read audio sent by the server listening on a Unix domain socket."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path)
+            file = cast(BinaryIO, sock.makefile("rb"))
+            return cls(file, audio_format, sample_rate, channel_count, sock)
+        except BaseException:
+            sock.close()
+            raise
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+        if self._socket is not None:
+            self._socket.close()
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def channel_count(self) -> int:
+        return self._channel_count
+
+    @property
+    def sample_size(self) -> int:
+        return self._sample_size
+
+    @property
+    def frame_size(self) -> int:
+        """Size of a single frame (one sample for every channel) in bytes."""
+        return self._sample_size * self._channel_count
+
+    @property
+    def duration_ms(self) -> int:
+        """Length of the audio read so far."""
+        return self.bytes_read // self.frame_size * 1000 // self.sample_rate
+
+    def chunks(self, chunk_len_ms: int) -> Iterator[bytes]:
+        """Read PCM data in chunks of `chunk_len_ms` milliseconds until EOF.
+
+        Reads block until a whole chunk has arrived, only the last chunk
+        may be shorter. Chunks always end on a frame boundary.
+        """
+        frames_per_chunk = max(1, self.sample_rate * chunk_len_ms // 1000)
+        chunk_len = frames_per_chunk * self.frame_size
+
+        while self._remaining is None or self._remaining > 0:
+            size = chunk_len if self._remaining is None else min(chunk_len, self._remaining)
+            chunk = self._file.read(size)
+            if self._remaining is not None:
+                self._remaining -= len(chunk)
+
+            chunk = chunk[: len(chunk) - len(chunk) % self.frame_size]
+            if chunk:
+                self.bytes_read += len(chunk)
+                yield chunk
+            if len(chunk) < size:
+                return  # NB: EOF, the writer has closed the stream
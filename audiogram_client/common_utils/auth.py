@@ -1,16 +1,43 @@
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
 from typing import cast
 
 import click
+import grpc
 from keycloak import KeycloakOpenID
+from keycloak.exceptions import KeycloakError
 
+from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import (
+    TOKEN_EXPIRY_MARGIN_S,
+    TOKEN_REFRESH_AHEAD,
+)
 
-def get_sso_access_token(
-    sso_server_url: str,
-    realm_name: str,
-    client_id: str,
-    client_secret: str,
-    verify: bool = True,
-) -> str:
+TokenKey = tuple[str, str, str]  # (sso_url, realm, client_id)
+
+
+@dataclass(frozen=True)
+class AccessToken:
+    value: str
+    issued_at: float  # NB: wall clock, so tokens can be shared between processes
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at - TOKEN_EXPIRY_MARGIN_S
+
+    @property
+    def refresh_at(self) -> float:
+        return self.expires_at - (self.expires_at - self.issued_at) * TOKEN_REFRESH_AHEAD
+
+
+def _request_token(key: TokenKey, client_secret: str, verify: bool) -> AccessToken:
+    sso_server_url, realm_name, client_id = key
     sso_connection = KeycloakOpenID(
         sso_server_url,
         realm_name,
@@ -18,8 +45,145 @@ def get_sso_access_token(
         client_secret,
         verify=verify,
     )
+    issued_at = time.time()
     token_info = sso_connection.token(grant_type="client_credentials")
-    return cast(str, token_info["access_token"])
+
+    return AccessToken(
+        value=cast(str, token_info["access_token"]),
+        issued_at=issued_at,
+        expires_at=issued_at + float(token_info.get("expires_in", 0)),
+    )
+
+
+class TokenCache:
+    """Cache of SSO access tokens keyed by (sso_url, realm, client_id).
+
+    Tokens are kept in memory and, if a directory is set, in owner-only
+    files shared between processes. Every cached token is refreshed by a
+    background timer shortly before it expires, so callers only wait for
+    Keycloak on the very first request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: dict[TokenKey, AccessToken] = {}
+        self._timers: dict[TokenKey, threading.Timer] = {}
+        self._directory: Path | None = None
+
+        self.fetches = 0
+
+    def enable_disk_cache(self, directory: Path) -> None:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._directory = directory
+
+    def get(self, key: TokenKey, client_secret: str, verify: bool) -> str:
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or not token.is_fresh():
+                token = self._read(key)
+
+            if token is None or not token.is_fresh():
+                click.echo("Fetching SSO access token...\n")
+                token = _request_token(key, client_secret, verify)
+                self._store(key, token, client_secret, verify)
+            elif key not in self._timers:
+                self._schedule_refresh(key, token, client_secret, verify)
+
+            self._tokens[key] = token
+            return token.value
+
+    def _store(self, key: TokenKey, token: AccessToken, client_secret: str, verify: bool) -> None:
+        self.fetches += 1
+        self._tokens[key] = token
+        self._write(key, token)
+        self._schedule_refresh(key, token, client_secret, verify)
+
+    def _schedule_refresh(
+        self,
+        key: TokenKey,
+        token: AccessToken,
+        client_secret: str,
+        verify: bool,
+    ) -> None:
+        previous = self._timers.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+        delay = token.refresh_at - time.time()
+        if delay <= 0:
+            return  # NB: short-lived token, refreshed on demand
+
+        timer = threading.Timer(delay, self._refresh, (key, client_secret, verify))
+        timer.daemon = True
+        timer.start()
+        self._timers[key] = timer
+
+    def _refresh(self, key: TokenKey, client_secret: str, verify: bool) -> None:
+        # NB: fetched outside the lock, callers keep using the current token meanwhile
+        try:
+            token: AccessToken | None = _request_token(key, client_secret, verify)
+        except (KeycloakError, OSError):
+            token = None  # NB: next get() retries synchronously once the token expires
+
+        with self._lock:
+            self._timers.pop(key, None)
+            if token is not None:
+                self._store(key, token, client_secret, verify)
+
+    def _path(self, key: TokenKey) -> Path | None:
+        if self._directory is None:
+            return None
+
+        return self._directory / hashlib.sha256("\0".join(key).encode()).hexdigest()
+
+    def _read(self, key: TokenKey) -> AccessToken | None:
+        path = self._path(key)
+        if path is None:
+            return None
+
+        try:
+            return AccessToken(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write(self, key: TokenKey, token: AccessToken) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+
+        # NB: mkstemp creates the file with 0600 permissions
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(asdict(token), file)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+
+
+_token_cache = TokenCache()
+
+
+def enable_token_disk_cache(directory: Path) -> None:
+    """Share SSO tokens between processes through files in `directory`."""
+    _token_cache.enable_disk_cache(directory)
+
+
+def get_sso_access_token(
+    sso_server_url: str,
+    realm_name: str,
+    client_id: str,
+    client_secret: str,
+    verify: bool = True,
+) -> str:
+    return _token_cache.get((sso_server_url, realm_name, client_id), client_secret, verify)
+
+
+def _iam_metadata(iam_account: str | None, iam_workspace: str | None) -> list[tuple[str, str]]:
+    return [
+        ("x-ai-account", iam_account or "demo"),
+        ("x-ai-workspace", iam_workspace or "default"),
+    ]
 
 
 def get_auth_metadata(
@@ -39,7 +203,6 @@ def get_auth_metadata(
 
     result_metadata: list[tuple[str, str]] = []
 
-    click.echo("Fetching SSO access token...\n")
     access_token = get_sso_access_token(
         sso_url,
         realm,
@@ -50,14 +213,83 @@ def get_auth_metadata(
     result_metadata.append(("authorization", f"Bearer {access_token}"))
 
     # Add required headers for v3
-    if iam_account:
-        result_metadata.append(("x-ai-account", iam_account))
-    else:
-        result_metadata.append(("x-ai-account", "demo"))
-        
-    if iam_workspace:
-        result_metadata.append(("x-ai-workspace", iam_workspace))
-    else:
-        result_metadata.append(("x-ai-workspace", "default"))
+    result_metadata.extend(_iam_metadata(iam_account, iam_workspace))
 
     return result_metadata
+
+
+class SSOAuthPlugin(grpc.AuthMetadataPlugin):
+    """gRPC call credentials that attach SSO and IAM headers to every RPC.
+
+    gRPC invokes the plugin per call, so channels and streams that outlive
+    a token keep working: the token comes from the shared token cache,
+    which refreshes it in the background.
+    """
+
+    def __init__(
+        self,
+        sso_url: str,
+        realm: str,
+        client_id: str,
+        client_secret: str,
+        iam_account: str | None,
+        iam_workspace: str | None,
+        verify_sso: bool,
+    ) -> None:
+        self._token_key: TokenKey = (sso_url, realm, client_id)
+        self._client_secret = client_secret
+        self._verify_sso = verify_sso
+        self._iam_metadata = _iam_metadata(iam_account, iam_workspace)
+
+    def metadata(self) -> list[tuple[str, str]]:
+        access_token = _token_cache.get(self._token_key, self._client_secret, self._verify_sso)
+        return [("authorization", f"Bearer {access_token}"), *self._iam_metadata]
+
+    def __call__(
+        self,
+        context: grpc.AuthMetadataContext,
+        callback: grpc.AuthMetadataPluginCallback,
+    ) -> None:
+        try:
+            metadata = self.metadata()
+        except (KeycloakError, OSError) as err:
+            callback((), err)
+        else:
+            callback(tuple(metadata), None)
+
+
+def auth_plugin_from_settings(settings: SettingsProtocol) -> SSOAuthPlugin | None:
+    """Create call credentials plugin, or None if SSO authorization is disabled.
+
+    The first token is fetched right away, so auth errors are reported
+    before any request is sent.
+    """
+    if not (settings.client_id and settings.client_secret):
+        click.echo("SSO authorization disabled\n")
+        return None
+
+    plugin = SSOAuthPlugin(
+        settings.sso_url,
+        settings.realm,
+        settings.client_id,
+        settings.client_secret,
+        settings.iam_account,
+        settings.iam_workspace,
+        settings.verify_sso,
+    )
+    plugin.metadata()
+
+    return plugin
+
+
+def auth_metadata_from_settings(
+    settings: SettingsProtocol, auth_plugin: SSOAuthPlugin | None
+) -> list[tuple[str, str]]:
+    """Headers to pass with every call next to the `auth_plugin_from_settings` plugin.
+
+    The plugin attaches IAM headers itself, but they are still expected when
+    SSO authorization is disabled.
+    """
+    if auth_plugin:
+        return []
+    return _iam_metadata(settings.iam_account, settings.iam_workspace)
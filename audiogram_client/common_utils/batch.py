@@ -0,0 +1,197 @@
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import csv
+from dataclasses import dataclass, field
+import glob
+import hashlib
+import json
+import math
+from pathlib import Path
+import time
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MANIFEST_SUFFIXES = (".csv", ".jsonl")
+
+
+@dataclass
+class BatchItem:
+    """Single batch input: source path plus optional manifest columns."""
+
+    path: Path
+    output_name: str
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+def read_manifest(path: Path) -> list[dict[str, str]]:
+    """Read CSV (with header row) or JSONL manifest into a list of rows."""
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as file:
+            return [dict(row) for row in csv.DictReader(file)]
+
+    rows = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                rows.append({key: str(value) for key, value in json.loads(line).items()})
+
+    return rows
+
+
+def collect_inputs(
+    sources: Iterable[str],
+    suffixes: Sequence[str],
+    path_column: str = "audio_file",
+    exclude: Sequence[Path] = (),
+) -> list[BatchItem]:
+    """Expand directories, glob patterns and CSV/JSONL manifests into batch items.
+
+    Directories are searched recursively for files with given suffixes.
+    Manifest paths are resolved relative to the manifest location, the
+    optional `output` column overrides the output name. Files inside
+    `exclude` directories (eg. the output directory of an earlier run) are
+    skipped. Output names are made unique, so inputs with equal names never
+    overwrite each other.
+    """
+    items: list[BatchItem] = []
+
+    for source in sources:
+        source_path = Path(source)
+        if source_path.is_dir():
+            for path in sorted(source_path.rglob("*")):
+                if path.is_file() and path.suffix.lower() in suffixes:
+                    items.append(BatchItem(path.resolve(), path.stem))
+        elif source_path.is_file() and source_path.suffix.lower() in MANIFEST_SUFFIXES:
+            for row in read_manifest(source_path):
+                path = source_path.parent / row[path_column]
+                output_name = row.get("output") or path.stem
+                items.append(BatchItem(path.resolve(), output_name, row))
+        elif source_path.is_file():
+            items.append(BatchItem(source_path.resolve(), source_path.stem))
+        else:
+            for match in sorted(glob.glob(source, recursive=True)):
+                path = Path(match)
+                if path.is_file():
+                    items.append(BatchItem(path.resolve(), path.stem))
+
+    excluded = [directory.resolve() for directory in exclude]
+    items = [
+        item
+        for item in items
+        if not any(item.path.is_relative_to(directory) for directory in excluded)
+    ]
+    _deduplicate_output_names(items)
+    return items
+
+
+def check_output_names(items: Sequence[BatchItem], output_dir: Path, suffix: str) -> None:
+    """Check that every item gets its own `<output_name><suffix>` file inside `output_dir`.
+
+    Raises `ValueError` for an output leading out of the directory (absolute
+    or with `..`) and for items sharing an output, eg. a file listed both by
+    a manifest and a glob.
+    """
+    output_dir = output_dir.resolve()
+    sources: dict[Path, Path] = {}
+    for item in items:
+        output = (output_dir / f"{item.output_name}{suffix}").resolve()
+        if not output.is_relative_to(output_dir):
+            raise ValueError(f"{item.path}: output {output} is outside of --output-dir")
+        if output in sources:
+            raise ValueError(f"{item.path}: output {output} is already used by {sources[output]}")
+        sources[output] = item.path
+
+
+def _deduplicate_output_names(items: list[BatchItem]) -> None:
+    seen: dict[str, int] = {}
+    for item in items:
+        seen[item.output_name] = seen.get(item.output_name, 0) + 1
+
+    for item in items:
+        if seen[item.output_name] > 1:
+            path_hash = hashlib.sha1(str(item.path).encode()).hexdigest()[:8]
+            item.output_name = f"{item.output_name}-{path_hash}"
+
+
+def run_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+) -> Iterator[tuple[T, "Future[R]"]]:
+    """Run `func` over items in a thread pool, yielding futures as they complete.
+
+    At most `max_in_flight` calls are running or queued at any moment, so
+    large inputs are never materialized as requests all at once.
+    """
+    items_iter = iter(items)
+    pending: dict[Future[R], T] = {}
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        try:
+            while True:
+                for item in items_iter:
+                    pending[executor.submit(func, item)] = item
+                    if len(pending) >= max_in_flight:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (`q` in 0..100) of a sorted sequence."""
+    if not values:
+        return 0.0
+
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+@dataclass
+class BatchStats:
+    """Throughput and latency counters of a batch run."""
+
+    started: float = field(default_factory=time.monotonic)
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    latencies: list[float] = field(default_factory=list)
+    audio_seconds: float = 0.0
+
+    def add_success(self, latency: float, audio_seconds: float = 0.0) -> None:
+        self.succeeded += 1
+        self.latencies.append(latency)
+        self.audio_seconds += audio_seconds
+
+    def add_failure(self) -> None:
+        self.failed += 1
+
+    def add_skipped(self) -> None:
+        self.skipped += 1
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def summary(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        latencies = sorted(self.latencies)
+        processed = self.succeeded + self.failed
+
+        return (
+            f"Files: {self.succeeded} succeeded, {self.failed} failed, {self.skipped} skipped\n"
+            f"Elapsed: {elapsed:.2f} s\n"
+            f"Throughput: {processed / elapsed:.2f} files/s, "
+            f"{self.audio_seconds / 3600 / elapsed:.4f} audio-hours/s\n"
+            f"Latency: p50 {percentile(latencies, 50):.3f} s, "
+            f"p95 {percentile(latencies, 95):.3f} s"
+        )
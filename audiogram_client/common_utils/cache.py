@@ -0,0 +1,125 @@
+from collections import OrderedDict
+import mmap
+import os
+from pathlib import Path
+import tempfile
+import threading
+
+
+class DiskCache:
+    """Size-bounded LRU cache of binary values stored as files in a directory.
+
+    Keys must be filesystem-safe (eg. hex digests). Values are written
+    atomically (temp file + rename), so concurrent readers and processes
+    never see partial entries. Recency is tracked through file mtime, so
+    LRU order survives restarts.
+    """
+
+    def __init__(self, directory: Path, max_size_bytes: int) -> None:
+        self._directory = directory
+        self._max_size = max_size_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key -> size, oldest first
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        entries = []
+        for path in self._directory.glob("*/*"):
+            if path.name.startswith("."):
+                continue  # NB: temp file of an interrupted write
+            stat = path.stat()
+            entries.append((stat.st_mtime_ns, path.name, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            value = path.read_bytes()
+        except FileNotFoundError:
+            self._miss()
+            return None
+
+        self._hit(key, path)
+        return value
+
+    def open(self, key: str) -> mmap.mmap | None:
+        """Map a value into memory instead of reading it, the caller closes the mapping.
+
+        Pages are shared with the OS file cache, so a hot entry is served
+        without copying it. Empty values can't be mapped and are misses.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                value = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            self._miss()
+            return None
+
+        try:
+            self._hit(key, path)
+        except BaseException:
+            value.close()
+            raise
+        return value
+
+    def _hit(self, key: str, path: Path) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # NB: evicted by another thread or process after it was read
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self._max_size:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._size += len(value) - self._entries.pop(key, 0)
+            self._entries[key] = len(value)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass  # NB: already evicted by another process
+
+    def stats(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{len(self._entries)} entries, {self._size / 1024 / 1024:.1f} MB"
+        )
@@ -68,6 +68,7 @@ _VALIDATORS = [
             'or "use_ssl" parameter in config file'
         ),
     ),
+    *_default_bool_validators("USE_GZIP", False),
     Validator(
         "CA_CERT_PATH",
         is_type_of=str,
@@ -158,12 +159,14 @@ _VALIDATORS = [
         },
     ),
     *_default_bool_validators("VERIFY_SSO", True),
+    *_default_bool_validators("TOKEN_CACHE", False),
 ]
 
 
 class CLIOptionsDict(TypedDict, total=False):
     api_address: str | None
     use_ssl: bool | None
+    use_gzip: bool | None
     ca_cert: str | None
     cert_private_key: str | None
     cert_chain: str | None
@@ -173,6 +176,7 @@ class CLIOptionsDict(TypedDict, total=False):
     sso_url: str | None
     realm: str | None
     verify_sso: bool | None
+    token_cache: bool | None
     iam_account: str | None
     iam_workspace: str | None
 
@@ -180,6 +184,7 @@ class CLIOptionsDict(TypedDict, total=False):
 class SettingsProtocol(Protocol):
     api_address: str
     use_ssl: bool
+    use_gzip: bool
     ca_cert_path: str
     cert_private_key_path: str
     cert_chain_path: str
@@ -190,6 +195,7 @@ class SettingsProtocol(Protocol):
     client_id: str
     client_secret: str
     verify_sso: bool
+    token_cache: bool
 
     iam_account: str | None
     iam_workspace: str | None
@@ -219,6 +225,7 @@ class Settings(Dynaconf):
         merge_dict = {
             "api_address": options["api_address"],
             "use_ssl": options["use_ssl"],
+            "use_gzip": options["use_gzip"],
             "ca_cert_path": options["ca_cert"],
             "cert_private_key_path": options["cert_private_key"],
             "cert_chain_path": options["cert_chain"],
@@ -228,6 +235,7 @@ class Settings(Dynaconf):
             "sso_url": options["sso_url"],
             "realm": options["realm"],
             "verify_sso": options["verify_sso"],
+            "token_cache": options["token_cache"],
             "iam_account": options["iam_account"],
             "iam_workspace": options["iam_workspace"],
         }
@@ -1,5 +1,49 @@
+import os
 from pathlib import Path
 from typing import Final
 
+import grpc
+
 _this_directory = Path(__file__).parent
 SETTINGS_TEMPLATE: Final = _this_directory / "config_files" / "settings_template.ini"
+CACHE_DIR: Final = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "audiogram"
+
+# --- SSO Token Cache ---
+TOKEN_CACHE_DIR: Final = CACHE_DIR / "tokens"
+# Tokens are not used during the last seconds of their lifetime
+TOKEN_EXPIRY_MARGIN_S: Final = 10
+# Part of the token lifetime left when a background refresh starts
+TOKEN_REFRESH_AHEAD: Final = 0.2
+
+# --- gRPC Channels ---
+# NB: FileRecognize carries the whole file in one message, the 4 MB gRPC default is too small
+GRPC_MAX_MESSAGE_BYTES: Final = 512 * 1024 * 1024
+# NB: servers reject pings more often than every 5 min on idle connections (too_many_pings),
+# so keepalive is only sent while calls are active
+GRPC_KEEPALIVE_TIME_MS: Final = 60_000
+GRPC_KEEPALIVE_TIMEOUT_MS: Final = 20_000
+DEFAULT_CHANNEL_POOL_SIZE: Final = 1
+
+# --- FLAC Upload Encoding ---
+FLAC_COMPRESSION_LEVEL: Final = 5
+# NB: PCM is fed to the encoder in slices, so a whole file is never copied at once
+FLAC_FEED_SIZE: Final = 1024 * 1024
+FLAC_READ_SIZE: Final = 64 * 1024
+
+# --- Media Decoding ---
+MEDIA_SUFFIXES: Final = (".mp3", ".m4a", ".aac", ".ogg", ".flac", ".mp4")
+# NB: format expected by the recognition models, no resampling on the server side
+DECODE_SAMPLE_RATE: Final = 16000
+DECODE_CHANNEL_COUNT: Final = 1
+DEFAULT_MAX_DECODERS: Final = os.cpu_count() or 1
+
+# --- Retries ---
+# NB: a server returns these when it is overloaded or restarting, the same call may succeed later
+RETRY_STATUS_CODES: Final = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+)
+DEFAULT_RETRIES: Final = 3
+RETRY_BACKOFF_S: Final = 0.5
+RETRY_BACKOFF_MAX_S: Final = 10.0
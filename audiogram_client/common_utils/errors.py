@@ -3,6 +3,7 @@ import wave
 from typing import Callable, cast, ParamSpec
 
 import click
+import ffmpeg
 import grpc
 import keycloak
 from dynaconf import ValidationError
@@ -41,6 +42,12 @@ def errors_handler(func: Callable[P, int | None]) -> Callable[P, int | None]:
             click.echo(f"details: {err_call.details()}")
             context.exit(1)
 
+        except ffmpeg.Error as err:
+            click.echo(
+                f"Audio processing with ffmpeg failed: {err.stderr.decode(errors='replace')}"
+            )
+            context.exit(1)
+
         except wave.Error as err:
             click.echo(f"Error while trying to open audio file: {err}")
             click.echo("This client only supports WAV files in PCM (int16le) format.")
@@ -0,0 +1,93 @@
+from collections.abc import Iterable, Iterator
+import io
+import subprocess
+import threading
+from typing import IO, cast
+
+import ffmpeg
+
+from audiogram_client.common_utils.definitions import (
+    FLAC_COMPRESSION_LEVEL,
+    FLAC_FEED_SIZE,
+    FLAC_READ_SIZE,
+)
+
+
+def _start_encoder(sample_rate: int, channel_count: int) -> subprocess.Popen:
+    try:
+        return cast(
+            subprocess.Popen,
+            ffmpeg.input("pipe:", format="s16le", ar=sample_rate, ac=channel_count)
+            .output(
+                "pipe:",
+                format="flac",
+                compression_level=FLAC_COMPRESSION_LEVEL,
+                loglevel="error",
+            )
+            .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True),
+        )
+    except FileNotFoundError as err:
+        raise FileNotFoundError(
+            err.errno, "ffmpeg executable is not found, it is required for FLAC encoding"
+        ) from err
+
+
+def encode_flac_stream(
+    pcm_chunks: Iterable[bytes | memoryview],
+    sample_rate: int,
+    channel_count: int,
+) -> Iterator[bytes]:
+    """Encode 16-bit PCM to FLAC with an ffmpeg subprocess, yielding bytes as they're produced.
+
+    PCM is written to ffmpeg from a worker thread while the caller consumes
+    encoded blocks, so reading input, encoding and sending all overlap.
+    Raises `ffmpeg.Error` if the encoder fails.
+    """
+    process = _start_encoder(sample_rate, channel_count)
+    stdin = cast(IO[bytes], process.stdin)
+    feed_errors: list[BaseException] = []
+
+    def feed() -> None:
+        try:
+            for chunk in pcm_chunks:
+                stdin.write(chunk)
+        except BrokenPipeError:
+            pass  # NB: encoder has died, it is reported through the exit code
+        except BaseException as err:
+            feed_errors.append(err)
+        finally:
+            try:
+                stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = threading.Thread(target=feed, name="flac-feeder", daemon=True)
+    feeder.start()
+
+    stdout = cast(io.BufferedReader, process.stdout)
+    finished = False
+    try:
+        while block := stdout.read1(FLAC_READ_SIZE):
+            yield block
+        finished = True
+    finally:
+        # NB: consumer may stop early (eg. cancelled RPC), don't leave the encoder behind
+        if not finished:
+            process.kill()
+        feeder.join()
+        stderr = cast(IO[bytes], process.stderr).read()
+        return_code = process.wait()
+
+    if feed_errors:
+        raise feed_errors[0]
+    if return_code:
+        raise ffmpeg.Error("ffmpeg", b"", stderr)
+
+
+def encode_flac(pcm: bytes | memoryview, sample_rate: int, channel_count: int) -> bytes:
+    """Encode a whole PCM buffer to FLAC."""
+    view = memoryview(pcm)
+    slices = (
+        view[offset : offset + FLAC_FEED_SIZE] for offset in range(0, len(view), FLAC_FEED_SIZE)
+    )
+    return b"".join(encode_flac_stream(slices, sample_rate, channel_count))
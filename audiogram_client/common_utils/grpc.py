@@ -1,14 +1,29 @@
+import collections
+import random
 import ssl
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable
 from pathlib import Path
-from typing import cast
+from typing import Any, TypeVar, cast
 
 import click
 import grpc
 
+from audiogram_client.common_utils.auth import SSOAuthPlugin
 from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import (
+    DEFAULT_CHANNEL_POOL_SIZE,
+    DEFAULT_RETRIES,
+    GRPC_KEEPALIVE_TIME_MS,
+    GRPC_KEEPALIVE_TIMEOUT_MS,
+    GRPC_MAX_MESSAGE_BYTES,
+    RETRY_BACKOFF_MAX_S,
+    RETRY_BACKOFF_S,
+    RETRY_STATUS_CODES,
+)
 from audiogram_client.genproto import stt_pb2_grpc, tts_pb2_grpc
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from contextlib import contextmanager
 from typing import Iterator, Self
 
@@ -64,24 +79,251 @@ def ssl_creds_from_settings(settings: SettingsProtocol) -> SSLCreds | None:
     )
 
 
-@contextmanager
-def open_grpc_channel(address: str, ssl_creds: SSLCreds | None) -> Iterator[grpc.Channel]:
-    """Open either secure or insecure connection to gRPC API."""
+class _ClientCallDetails(
+    collections.namedtuple(
+        "_ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials", "wait_for_ready", "compression"),
+    ),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+class _ClientInterceptor(
+    grpc.UnaryUnaryClientInterceptor,
+    grpc.UnaryStreamClientInterceptor,
+    grpc.StreamUnaryClientInterceptor,
+    grpc.StreamStreamClientInterceptor,
+):
+    """Base for interceptors that only inspect or replace call details."""
+
+    def _intercept(self, details: grpc.ClientCallDetails) -> grpc.ClientCallDetails:
+        return details
+
+    def intercept_unary_unary(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        return continuation(self._intercept(client_call_details), request)
+
+    def intercept_unary_stream(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        return continuation(self._intercept(client_call_details), request)
+
+    def intercept_stream_unary(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.ClientCallDetails,
+        request_iterator: Any,
+    ) -> Any:
+        return continuation(self._intercept(client_call_details), request_iterator)
+
+    def intercept_stream_stream(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: grpc.ClientCallDetails,
+        request_iterator: Any,
+    ) -> Any:
+        return continuation(self._intercept(client_call_details), request_iterator)
+
+
+class _AuthMetadataInterceptor(_ClientInterceptor):
+    """Add auth headers to every call on channels that can't carry call credentials."""
+
+    def __init__(self, auth_plugin: SSOAuthPlugin) -> None:
+        self._auth_plugin = auth_plugin
+
+    def _intercept(self, details: grpc.ClientCallDetails) -> grpc.ClientCallDetails:
+        return _ClientCallDetails(
+            details.method,
+            details.timeout,
+            [*self._auth_plugin.metadata(), *(details.metadata or ())],
+            details.credentials,
+            details.wait_for_ready,
+            details.compression,
+        )
+
+
+def channel_options() -> list[tuple[str, int]]:
+    return [
+        ("grpc.max_send_message_length", GRPC_MAX_MESSAGE_BYTES),
+        ("grpc.max_receive_message_length", GRPC_MAX_MESSAGE_BYTES),
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", GRPC_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 0),
+        # NB: give every channel its own connection instead of a shared global subchannel,
+        # otherwise pooled channels to one address end up on a single TCP connection
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
+def create_grpc_channel(
+    address: str,
+    ssl_creds: SSLCreds | None,
+    auth_plugin: SSOAuthPlugin | None = None,
+    compression: bool = False,
+    interceptors: Iterable[_ClientInterceptor] = (),
+) -> grpc.Channel:
+    """Create either secure or insecure channel with tuned options. Caller closes it."""
+    options = channel_options()
+    channel_compression = grpc.Compression.Gzip if compression else None
+    interceptors = list(interceptors)
+
     if ssl_creds:
         creds = grpc.ssl_channel_credentials(
             root_certificates=ssl_creds.root_certificates,
             private_key=ssl_creds.private_key,
             certificate_chain=ssl_creds.certificate_chain,
         )
+        if auth_plugin:
+            creds = grpc.composite_channel_credentials(
+                creds,
+                grpc.metadata_call_credentials(auth_plugin),
+            )
 
-        channel_ctx = grpc.secure_channel(address, creds)
+        channel = grpc.secure_channel(address, creds, options, channel_compression)
     else:
-        channel_ctx = grpc.insecure_channel(address)
+        channel = grpc.insecure_channel(address, options, channel_compression)
+        if auth_plugin:
+            # NB: gRPC refuses call credentials on insecure channels, so inject headers instead
+            interceptors.append(_AuthMetadataInterceptor(auth_plugin))
+
+    if interceptors:
+        channel = grpc.intercept_channel(channel, *interceptors)
+
+    return channel
 
-    with channel_ctx as channel:
+
+@contextmanager
+def open_grpc_channel(
+    address: str,
+    ssl_creds: SSLCreds | None,
+    auth_plugin: SSOAuthPlugin | None = None,
+    compression: bool = False,
+) -> Iterator[grpc.Channel]:
+    """Open either secure or insecure connection to gRPC API.
+
+    If `auth_plugin` is given, auth headers are attached to every call made
+    through the channel, so call sites don't need to pass them.
+    """
+    with create_grpc_channel(address, ssl_creds, auth_plugin, compression) as channel:
         yield channel
 
 
+class _CallCounter(_ClientInterceptor):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _intercept(self, details: grpc.ClientCallDetails) -> grpc.ClientCallDetails:
+        with self._lock:
+            self.calls += 1
+
+        return details
+
+
+@dataclass
+class _PooledChannel:
+    address: str
+    channel: grpc.Channel
+    counter: _CallCounter
+
+
+_PoolKey = tuple[str, tuple | None, SSOAuthPlugin | None]
+
+
+class ChannelPool:
+    """Long-lived gRPC channels shared between calls.
+
+    Up to `size` channels, each with its own connection, are kept per
+    address, SSL credentials and auth plugin, and handed out round-robin.
+    Reusing channels saves a TCP and TLS handshake per request. Channels
+    count the RPCs they served, see `stats`.
+    """
+
+    def __init__(self, size: int = DEFAULT_CHANNEL_POOL_SIZE, compression: bool = False) -> None:
+        self._size = size
+        self._compression = compression
+        self._lock = threading.Lock()
+        self._channels: dict[_PoolKey, list[_PooledChannel]] = {}
+        self._next: dict[_PoolKey, int] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def get(
+        self,
+        address: str,
+        ssl_creds: SSLCreds | None,
+        auth_plugin: SSOAuthPlugin | None = None,
+    ) -> grpc.Channel:
+        key: _PoolKey = (address, astuple(ssl_creds) if ssl_creds else None, auth_plugin)
+
+        with self._lock:
+            channels = self._channels.setdefault(key, [])
+            if len(channels) < self._size:
+                counter = _CallCounter()
+                channel = create_grpc_channel(
+                    address,
+                    ssl_creds,
+                    auth_plugin,
+                    self._compression,
+                    [counter],
+                )
+                channels.append(_PooledChannel(address, channel, counter))
+                return channel
+
+            idx = self._next.get(key, 0)
+            self._next[key] = idx + 1
+            return channels[idx % len(channels)].channel
+
+    def stats(self) -> str:
+        with self._lock:
+            return "\n".join(
+                f"Channel {idx} to {pooled.address}: {pooled.counter.calls} RPCs"
+                for channels in self._channels.values()
+                for idx, pooled in enumerate(channels, 1)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            for channels in self._channels.values():
+                for pooled in channels:
+                    pooled.channel.close()
+            self._channels.clear()
+            self._next.clear()
+
+
+R = TypeVar("R")
+
+
+def call_with_retries(call: Callable[[], R], retries: int = DEFAULT_RETRIES) -> tuple[R, int]:
+    """Make a gRPC call, repeating it on transient errors with exponential backoff.
+
+    Return the result and the number of retries made. Delays are jittered,
+    so parallel calls failing together don't retry in lockstep.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call(), attempt
+        except grpc.RpcError as err:
+            if attempt >= retries or cast(grpc.Call, err).code() not in RETRY_STATUS_CODES:
+                raise
+
+        time.sleep(random.uniform(0, min(RETRY_BACKOFF_MAX_S, RETRY_BACKOFF_S * 2**attempt)))
+        attempt += 1
+
+
 def print_metadata(metadata: Iterable[tuple[str, str | bytes]]) -> None:
     for key, value in metadata:
         click.echo(f"{key}: {value!r}")
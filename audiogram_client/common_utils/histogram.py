@@ -0,0 +1,90 @@
+from collections.abc import Iterable
+
+DEFAULT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 100.0)
+
+
+class Histogram:
+    """Log-linear histogram in the style of HdrHistogram.
+
+    Values are scaled to integers (`scale` units per value unit) and put
+    into buckets whose width doubles with every power of two, each split
+    into 2**`precision_bits` sub-buckets. Relative error of reported
+    values is below 2**-(`precision_bits` - 1), memory does not depend
+    on the number of recorded values.
+    """
+
+    def __init__(self, scale: int = 1000, precision_bits: int = 7) -> None:
+        self._scale = scale
+        self._bits = precision_bits
+        self._counts: dict[int, int] = {}
+
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self._bits)
+        return (shift << self._bits) | (value >> shift)
+
+    def _value(self, index: int) -> float:
+        """Middle of the bucket range in value units."""
+        shift = index >> self._bits
+        sub_bucket = index & ((1 << self._bits) - 1)
+        lowest = sub_bucket << shift
+        return (lowest + ((1 << shift) - 1) / 2) / self._scale
+
+    def record(self, value: float) -> None:
+        scaled = max(0, round(value * self._scale))
+        index = self._index(scaled)
+        self._counts[index] = self._counts.get(index, 0) + 1
+
+        self.min = value if not self.count else min(self.min, value)
+        self.max = value if not self.count else max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        if (other._scale, other._bits) != (self._scale, self._bits):
+            raise ValueError("Histograms with different scale or precision can't be merged")
+
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+
+        if other.count:
+            self.min = other.min if not self.count else min(self.min, other.min)
+            self.max = other.max if not self.count else max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Value at or below which `q` percent (0..100) of recorded values fall."""
+        if not self.count:
+            return 0.0
+        if q >= 100:
+            return self.max
+
+        target = max(1, round(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(max(self._value(index), self.min), self.max)
+
+        return self.max
+
+    def percentiles(self, quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> dict[str, float]:
+        return {f"p{q:g}": self.percentile(q) for q in quantiles}
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.mean,
+            "max": self.max,
+            **self.percentiles(),
+        }
@@ -0,0 +1,138 @@
+from dataclasses import asdict, dataclass, replace
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+from audiogram_client.common_utils.option_types import StrEnum
+
+LEDGER_FILENAME = "ledger.jsonl"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+class JobStatus(StrEnum):
+    pending = "pending"
+    done = "done"
+    failed = "failed"
+
+
+@dataclass
+class JobRecord:
+    key: str
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    config_hash: str
+    status: JobStatus
+    attempts: int = 0
+    output: str = ""
+    error: str = ""
+    updated: float = 0.0
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of file contents, read in blocks to keep memory flat."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while block := file.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class JobLedger:
+    """Append-only JSONL journal of batch jobs, used to resume interrupted runs.
+
+    Every state change appends a full record, the last record of a key wins.
+    Records are flushed immediately, so a crashed run loses at most the job
+    that was being written. The journal is compacted on open. Keys must
+    identify a job across runs, batch commands use resolved input paths.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._records: dict[str, JobRecord] = {}
+
+        if path.is_file():
+            self._load()
+            self._compact()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _load(self) -> None:
+        with self._path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    raw = json.loads(line)
+                    raw["status"] = JobStatus(raw["status"])
+                    record = JobRecord(**raw)
+                except (ValueError, TypeError, KeyError):
+                    continue  # NB: torn last line after a crash
+                self._records[record.key] = record
+
+    def _compact(self) -> None:
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            for record in self._records.values():
+                file.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self._path)
+
+    def _append(self, record: JobRecord) -> None:
+        record.updated = time.time()
+        with self._lock:
+            self._records[record.key] = record
+            self._file.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def content_hash(self, key: str, path: Path) -> str:
+        """Hash file contents, reusing the stored hash if size and mtime are unchanged."""
+        stat = path.stat()
+        record = self._records.get(key)
+        if record and record.size == stat.st_size and record.mtime_ns == stat.st_mtime_ns:
+            return record.content_hash
+
+        return file_hash(path)
+
+    def is_done(self, key: str, content_hash: str, config_hash: str) -> bool:
+        """Check that the job finished with the same input and config and its output exists."""
+        record = self._records.get(key)
+        return (
+            record is not None
+            and record.status == JobStatus.done
+            and record.content_hash == content_hash
+            and record.config_hash == config_hash
+            and Path(record.output).is_file()
+        )
+
+    def start(self, key: str, path: Path, content_hash: str, config_hash: str) -> None:
+        previous = self._records.get(key)
+        attempts = previous.attempts if previous and previous.content_hash == content_hash else 0
+        stat = path.stat()
+
+        self._append(
+            JobRecord(
+                key=key,
+                path=str(path),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=content_hash,
+                config_hash=config_hash,
+                status=JobStatus.pending,
+                attempts=attempts + 1,
+            )
+        )
+
+    def finish(self, key: str, output: Path) -> None:
+        self._append(replace(self._records[key], status=JobStatus.done, output=str(output)))
+
+    def fail(self, key: str, error: str) -> None:
+        self._append(replace(self._records[key], status=JobStatus.failed, error=error))
@@ -0,0 +1,99 @@
+from collections.abc import Iterator
+import io
+import os
+import subprocess
+import threading
+from typing import IO, cast
+
+import ffmpeg
+
+from audiogram_client.common_utils.audio import AudioFile, AudioStream
+from audiogram_client.common_utils.definitions import (
+    DECODE_CHANNEL_COUNT,
+    DECODE_SAMPLE_RATE,
+    DEFAULT_MAX_DECODERS,
+    MEDIA_SUFFIXES,
+)
+from audiogram_client.common_utils.types import AudioFormat
+
+# NB: chunk size only matters for how often the pipe is drained
+_READ_CHUNK_MS = 1000
+
+
+def is_media_file(path: str | os.PathLike) -> bool:
+    """Check if a file has to be decoded with ffmpeg before recognition."""
+    return os.path.splitext(path)[1].lower() in MEDIA_SUFFIXES
+
+
+class MediaStream(AudioStream):
+    """PCM decoded by ffmpeg from any supported media file, read from its stdout pipe.
+
+    ffmpeg writes 16-bit mono 16 kHz PCM to a pipe, no intermediate WAV
+    is written. If the reader is slower than the decoder, the pipe fills
+    up and ffmpeg blocks, so memory use stays flat.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        try:
+            self._process = cast(
+                subprocess.Popen,
+                ffmpeg.input(str(path))
+                .audio.output(
+                    "pipe:",
+                    format="s16le",
+                    acodec="pcm_s16le",
+                    ac=DECODE_CHANNEL_COUNT,
+                    ar=DECODE_SAMPLE_RATE,
+                    loglevel="error",
+                )
+                .run_async(pipe_stdout=True, pipe_stderr=True),
+            )
+        except FileNotFoundError as err:
+            raise FileNotFoundError(
+                err.errno, "ffmpeg executable is not found, it is required for media decoding"
+            ) from err
+
+        stdout = cast(io.BufferedReader, self._process.stdout)
+        super().__init__(stdout, AudioFormat.s16le, DECODE_SAMPLE_RATE, DECODE_CHANNEL_COUNT)
+
+    def chunks(self, chunk_len_ms: int) -> Iterator[bytes]:
+        """Read decoded PCM until EOF, raise `ffmpeg.Error` if decoding has failed."""
+        yield from super().chunks(chunk_len_ms)
+
+        stderr = cast(IO[bytes], self._process.stderr).read()
+        if self._process.wait():
+            raise ffmpeg.Error("ffmpeg", b"", stderr)
+
+    def read_all(self) -> AudioFile:
+        """Decode the rest of the file into memory."""
+        pcm = b"".join(self.chunks(_READ_CHUNK_MS))
+        return AudioFile.from_pcm(pcm, self.sample_rate, self.channel_count, self.sample_size)
+
+    def close(self) -> None:
+        # NB: reader may stop early, don't leave the decoder blocked on a full pipe
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        super().close()
+        cast(IO[bytes], self._process.stderr).close()
+
+
+def decode_media(path: str | os.PathLike) -> AudioFile:
+    """Decode a whole media file into memory."""
+    with MediaStream(path) as stream:
+        return stream.read_all()
+
+
+class DecoderPool:
+    """Bound the number of ffmpeg decoders running at once.
+
+    Callers block until a slot is free, so with many inputs decoding is
+    pipelined with recognition but never uses more than `size` processes.
+    """
+
+    def __init__(self, size: int = DEFAULT_MAX_DECODERS) -> None:
+        self._slots = threading.BoundedSemaphore(size)
+
+    def decode(self, path: str | os.PathLike) -> AudioFile:
+        with self._slots:
+            return decode_media(path)
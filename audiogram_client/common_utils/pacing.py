@@ -0,0 +1,52 @@
+from collections.abc import Iterable, Iterator
+import time
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class Pacer:
+    """Paces periodic sends against absolute monotonic deadlines.
+
+    Tick n is due at start + n * interval / speed, so time spent between
+    ticks (serialization, flow control) does not accumulate as it does
+    with a fixed sleep per tick. Lag behind the schedule is tracked for
+    reporting.
+    """
+
+    def __init__(self, interval_ms: float, speed: float = 1.0) -> None:
+        if speed <= 0:
+            raise ValueError(f"Pacing speed must be > 0, but it is {speed}")
+
+        self._interval = interval_ms / 1000 / speed
+        self._start: float | None = None
+        self.ticks = 0
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def wait(self) -> None:
+        """Block until the next tick is due. The first call starts the clock."""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+
+        deadline = self._start + self.ticks * self._interval
+        if deadline > now:
+            time.sleep(deadline - now)
+            now = time.monotonic()
+
+        self.lag_ms = (now - deadline) * 1000
+        self.max_lag_ms = max(self.max_lag_ms, self.lag_ms)
+        self.ticks += 1
+
+    def paced(self, items: Iterable[T]) -> Iterator[T]:
+        """Yield `items`, waiting for the next tick before each one."""
+        for item in items:
+            self.wait()
+            yield item
+
+    def summary(self) -> str:
+        return (
+            f"{self.ticks} chunks, "
+            f"lag behind schedule: last {self.lag_ms:.1f} ms, max {self.max_lag_ms:.1f} ms"
+        )
@@ -1,11 +1,12 @@
 from enum import Enum, auto
 
-from audiogram_client.common_utils.option_types import Pb2Enum
+from audiogram_client.common_utils.option_types import Pb2Enum, StrEnum
 from audiogram_client.genproto import stt_pb2, tts_pb2
 
 _VAEventsMode = stt_pb2.RecognitionConfig.VoiceActivityMarkEventsMode
 _VADMode = stt_pb2.VADOptions.VoiceActivityDetectionMode
 _VoiceStyle = tts_pb2.VoiceStyle
+_AudioEncoding = stt_pb2.AudioEncoding
 
 
 class VAResponseMode(Enum):
@@ -50,6 +51,17 @@ class ASAttackType(Enum):
     all_types = auto()
 
 
+class AudioFormat(StrEnum):
+    wav = "wav"
+    s16le = "s16le"
+
+
+class UploadEncoding(Pb2Enum):
+    pb2_value: _AudioEncoding.ValueType
+    pcm = ("pcm", _AudioEncoding.LINEAR_PCM)
+    flac = ("flac", _AudioEncoding.FLAC)
+
+
 class TTSVoiceStyle(Pb2Enum):
     pb2_value: _VoiceStyle.ValueType
     neutral = ("neutral", _VoiceStyle.VOICE_STYLE_NEUTRAL)
@@ -47,6 +47,7 @@ class ModelService:
         with open_grpc_channel(
             self._settings.api_address,
             ssl_creds_from_settings(self._settings),
+            compression=self._settings.use_gzip,
         ) as channel:
             asr_stub = stt_pb2_grpc.STTStub(channel)
             tts_stub = tts_pb2_grpc.TTSStub(channel)
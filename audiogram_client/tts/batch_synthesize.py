@@ -0,0 +1,307 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+import functools
+import io
+import mmap
+import os
+from pathlib import Path
+import time
+from typing import cast
+import wave
+
+import click
+import grpc
+
+from audiogram_client.common_utils.arguments import common_options_in_settings
+from audiogram_client.common_utils.auth import auth_plugin_from_settings
+from audiogram_client.common_utils.batch import BatchStats, read_manifest, run_bounded
+from audiogram_client.common_utils.config import SettingsProtocol
+from audiogram_client.common_utils.definitions import DEFAULT_CHANNEL_POOL_SIZE, DEFAULT_RETRIES
+from audiogram_client.common_utils.errors import errors_handler
+from audiogram_client.common_utils.grpc import (
+    ChannelPool,
+    call_with_retries,
+    ssl_creds_from_settings,
+)
+from audiogram_client.common_utils.types import TTSVoiceStyle
+from audiogram_client.genproto import tts_pb2, tts_pb2_grpc
+
+from .utils.arguments import audio_cache_options, batch_tts_options
+from .utils.cache import AudioCache
+from .utils.definitions import AUDIO_SAVE_SAMPLE_WIDTH, DEFAULT_BATCH_MAX_IN_FLIGHT
+from .utils.request import make_tts_request
+
+
+@dataclass
+class SynthesisItem:
+    """Single manifest row to synthesize."""
+
+    source: str
+    fields: dict[str, str]
+    output: Path
+
+
+@click.command(
+    help="Speech synthesis of many texts from CSV/JSONL manifests over shared connections",
+)
+@errors_handler
+@common_options_in_settings
+@click.option(
+    "--input",
+    "inputs",
+    required=True,
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="CSV/JSONL manifest with `text` or `ssml` column and optional `voice`, `style`, "
+    "`sample_rate` and `output` columns (can be repeated)",
+    metavar="<path>",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True, resolve_path=True),
+    default="synthesized",
+    show_default=True,
+    help="directory for WAV files, `output` column paths are relative to it",
+    metavar="<path>",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_MAX_IN_FLIGHT,
+    show_default=True,
+    help="max number of concurrent Synthesize calls",
+)
+@click.option(
+    "--channels",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHANNEL_POOL_SIZE,
+    show_default=True,
+    help="number of gRPC connections to spread requests over",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RETRIES,
+    show_default=True,
+    help="times to repeat a call failed with a transient error (UNAVAILABLE, ...)",
+)
+@batch_tts_options()
+@audio_cache_options()
+def batch_synthesize(
+    settings: SettingsProtocol,
+    inputs: tuple[str, ...],
+    output_dir: str,
+    max_in_flight: int,
+    channels: int,
+    retries: int,
+    sample_rate: int,
+    voice_name: str | None,
+    model_type: str | None,
+    model_sample_rate: int | None,
+    voice_style: TTSVoiceStyle,
+    language_code: str | None,
+    cache_dir: str,
+    no_cache: bool,
+    cache_max_size_mb: int,
+) -> None:
+    output_path = Path(output_dir)
+    try:
+        items = _collect_items(inputs, output_path)
+    except ValueError as err:
+        raise click.UsageError(str(err)) from err
+    if not items:
+        click.echo("No texts to synthesize found")
+        return
+
+    make_request = functools.partial(
+        _make_request,
+        voice_name=voice_name,
+        sample_rate=sample_rate,
+        model_type=model_type,
+        model_sample_rate=model_sample_rate,
+        voice_style=voice_style,
+        language_code=language_code,
+    )
+    auth_plugin = auth_plugin_from_settings(settings)
+    cache = None if no_cache else AudioCache(Path(cache_dir), cache_max_size_mb)
+
+    click.echo(
+        f"Texts to synthesize: {len(items)}\n"
+        f"Max in-flight requests: {max_in_flight}\n"
+        f"Channels: {channels}\n"
+        f"Retries: {retries}\n"
+        f"Audio cache: {'disabled' if cache is None else cache_dir}\n"
+        f"Output directory: {output_path}\n"
+    )
+    click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
+
+    stats = BatchStats()
+    characters = 0
+    retried = 0
+    ssl_creds = ssl_creds_from_settings(settings)
+
+    with ChannelPool(channels, settings.use_gzip) as pool:
+
+        def synthesize_item(item: SynthesisItem) -> tuple[float, int, float, int, bool]:
+            return _synthesize_item(
+                # NB: the channel is only connected on first use, cache hits never open it
+                lambda: tts_pb2_grpc.TTSStub(
+                    pool.get(settings.api_address, ssl_creds, auth_plugin)
+                ),
+                item,
+                make_request,
+                settings.timeout,
+                retries,
+                cache,
+            )
+
+        for idx, (item, future) in enumerate(run_bounded(synthesize_item, items, max_in_flight), 1):
+            prefix = f"[{idx}/{len(items)}] {item.source} -> {item.output.name}"
+            try:
+                latency, item_characters, audio_seconds, item_retries, cached = future.result()
+            except grpc.RpcError as err:
+                err_call = cast(grpc.Call, err)
+                stats.add_failure()
+                click.echo(f"{prefix}: FAILED ({err_call.code()}: {err_call.details()})")
+                continue
+            except (OSError, ValueError) as err:
+                stats.add_failure()
+                click.echo(f"{prefix}: FAILED ({err})")
+                continue
+
+            stats.add_success(latency, audio_seconds)
+            characters += item_characters
+            retried += item_retries
+            source = "from cache" if cached else f"in {latency:.2f} s"
+            click.echo(f"{prefix}: {audio_seconds:.2f} s of audio {source}")
+
+        click.echo(f"\n{pool.stats()}")
+
+    elapsed = max(stats.elapsed, 1e-9)
+    click.echo(
+        f"\n{stats.summary()}\n"
+        f"Synthesis throughput: {characters / elapsed:.1f} chars/s, "
+        f"{stats.audio_seconds / elapsed:.2f} audio-s/s\n"
+        f"Retried calls: {retried}"
+    )
+    if cache:
+        click.echo(f"Audio cache: {cache.stats()}")
+
+
+def _collect_items(inputs: tuple[str, ...], output_dir: Path) -> list[SynthesisItem]:
+    """Read manifest rows, checking that every row gets its own file in `output_dir`."""
+    output_dir = output_dir.resolve()
+    items = []
+    sources: dict[Path, str] = {}
+    for manifest in map(Path, inputs):
+        for line, fields in enumerate(read_manifest(manifest), 1):
+            row = f"{manifest}:{line}"
+            output = (
+                output_dir / (fields.get("output") or f"{manifest.stem}-{line:05}.wav")
+            ).resolve()
+            if not output.is_relative_to(output_dir):
+                raise ValueError(f"{row}: output {output} is outside of --output-dir")
+            if output in sources:
+                raise ValueError(f"{row}: output {output} is already used by {sources[output]}")
+
+            sources[output] = row
+            items.append(SynthesisItem(f"{manifest.name}:{line}", fields, output))
+
+    return items
+
+
+def _make_request(
+    fields: dict[str, str],
+    voice_name: str | None,
+    sample_rate: int,
+    model_type: str | None,
+    model_sample_rate: int | None,
+    voice_style: TTSVoiceStyle,
+    language_code: str | None,
+) -> tuple[tts_pb2.SynthesizeSpeechRequest, int]:
+    """Build a request from manifest columns, command options fill in the missing ones.
+
+    Return the request and the number of characters to synthesize.
+    """
+    ssml = fields.get("ssml")
+    text = ssml or fields.get("text")
+    if not text:
+        raise ValueError("row has neither `text` nor `ssml`")
+
+    voice = fields.get("voice") or voice_name
+    if not voice:
+        raise ValueError("row has no `voice` and --voice-name is not set")
+
+    request = make_tts_request(
+        text,
+        bool(ssml),
+        voice,
+        int(fields.get("sample_rate") or sample_rate),
+        model_type,
+        model_sample_rate,
+        _voice_style(fields["style"]) if fields.get("style") else voice_style,
+        language_code,
+    )
+    return request, len(text)
+
+
+def _voice_style(name: str) -> TTSVoiceStyle:
+    try:
+        return TTSVoiceStyle[name]
+    except KeyError:
+        choices = ", ".join(TTSVoiceStyle)
+        raise ValueError(f"unknown voice style {name!r}, use one of: {choices}") from None
+
+
+def _audio_seconds(audio: bytes | mmap.mmap, sample_rate: int) -> float:
+    try:
+        with wave.open(io.BytesIO(audio)) as wav:
+            return float(wav.getnframes() / wav.getframerate())
+    except (wave.Error, EOFError):
+        return len(audio) / AUDIO_SAVE_SAMPLE_WIDTH / sample_rate
+
+
+def _synthesize_item(
+    make_stub: Callable[[], tts_pb2_grpc.TTSStub],
+    item: SynthesisItem,
+    make_request: Callable[[dict[str, str]], tuple[tts_pb2.SynthesizeSpeechRequest, int]],
+    timeout: float,
+    retries: int,
+    cache: AudioCache | None,
+) -> tuple[float, int, float, int, bool]:
+    """Synthesize one manifest row, or take it from the cache, and store the audio.
+
+    Return latency, number of characters, audio length, number of retries
+    and whether the audio was cached.
+    """
+    request, characters = make_request(item.fields)
+    cache_key = AudioCache.make_key(request, "Synthesize") if cache else ""
+
+    started = time.monotonic()
+    cached = cache.open(cache_key) if cache else None
+    retried = 0
+    if cached is not None:
+        with cached:
+            _store(item.output, cached)
+            audio_seconds = _audio_seconds(cached, request.sample_rate_hertz)
+    else:
+        stub = make_stub()
+        response, retried = call_with_retries(
+            lambda: stub.Synthesize(request, timeout=timeout),
+            retries,
+        )
+        _store(item.output, response.audio)
+        audio_seconds = _audio_seconds(response.audio, request.sample_rate_hertz)
+        if cache:
+            cache.put(cache_key, response.audio)
+    latency = time.monotonic() - started
+
+    return latency, characters, audio_seconds, retried, cached is not None
+
+
+def _store(path: Path, audio: bytes | mmap.mmap) -> None:
+    # NB: write-then-rename, so an interrupted run never leaves a truncated file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.tmp")
+    tmp_file.write_bytes(audio)
+    os.replace(tmp_file, path)
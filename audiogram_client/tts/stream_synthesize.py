@@ -5,14 +5,15 @@ import click
 import grpc
 
 from audiogram_client.common_utils.arguments import common_options_in_settings
-from audiogram_client.common_utils.auth import get_auth_metadata
+from audiogram_client.common_utils.auth import auth_plugin_from_settings
 from audiogram_client.common_utils.config import SettingsProtocol
 from audiogram_client.common_utils.errors import errors_handler
 from audiogram_client.common_utils.grpc import open_grpc_channel, print_metadata, ssl_creds_from_settings
 from audiogram_client.common_utils.types import TTSVoiceStyle
 from audiogram_client.genproto import tts_pb2, tts_pb2_grpc
 
-from .utils.arguments import common_tts_options
+from .utils.arguments import audio_cache_options, common_tts_options
+from .utils.cache import AudioCache
 from .utils.definitions import AUDIO_SAVE_CHANNELS, AUDIO_SAVE_SAMPLE_WIDTH
 from .utils.request import make_tts_request
 
@@ -24,6 +25,7 @@ from .utils.request import make_tts_request
 @errors_handler
 @common_options_in_settings
 @common_tts_options()
+@audio_cache_options()
 def stream_synthesize(
     settings: SettingsProtocol,
     text: str,
@@ -35,17 +37,10 @@ def stream_synthesize(
     model_sample_rate: int | None,
     voice_style: TTSVoiceStyle,
     language_code: str | None,
+    cache_dir: str,
+    no_cache: bool,
+    cache_max_size_mb: int,
 ) -> None:
-    auth_metadata = get_auth_metadata(
-        settings.sso_url,
-        settings.realm,
-        settings.client_id,
-        settings.client_secret,
-        settings.iam_account,
-        settings.iam_workspace,
-        settings.verify_sso,
-    )
-
     click.echo(
         f"Request parameters:\n"
         f"Interpret text as SSML: {is_ssml}\n"
@@ -68,18 +63,35 @@ def stream_synthesize(
         language_code,
     )
 
+    cache = None if no_cache else AudioCache(Path(cache_dir), cache_max_size_mb)
+    cache_key = AudioCache.make_key(request, "StreamingSynthesize")
+    cached = cache.open(cache_key) if cache else None
+    if cache and cached is not None:
+        with cached, wave.open(output_file, "wb") as wav_file:
+            wav_file.setnchannels(AUDIO_SAVE_CHANNELS)
+            wav_file.setsampwidth(AUDIO_SAVE_SAMPLE_WIDTH)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframesraw(cached)
+            click.echo(f"Cached audio size: {len(cached)}")
+        click.echo(f"Synthesized audio stored in {output_file}")
+        click.echo(f"Audio cache: {cache.stats()}")
+        return
+
+    # NB: token is only fetched when the request actually leaves the machine
+    auth_plugin = auth_plugin_from_settings(settings)
     click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
 
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        auth_plugin,
+        settings.use_gzip,
     ) as channel:
         stub = tts_pb2_grpc.TTSStub(channel)
 
         response_iterator: Iterable[tts_pb2.StreamingSynthesizeSpeechResponse] | grpc.Call
         response_iterator = stub.StreamingSynthesize(
             request,
-            metadata=auth_metadata,
             timeout=settings.timeout,
         )
 
@@ -88,6 +100,7 @@ def stream_synthesize(
         click.echo()
 
         total_audio_length = 0
+        chunks: list[bytes] = []
         with wave.open(output_file, "wb") as wav_file:
             wav_file.setnchannels(AUDIO_SAVE_CHANNELS)
             wav_file.setsampwidth(AUDIO_SAVE_SAMPLE_WIDTH)
@@ -95,6 +108,8 @@ def stream_synthesize(
 
             for i_response in response_iterator:
                 wav_file.writeframesraw(i_response.audio)
+                if cache:
+                    chunks.append(i_response.audio)
 
                 chunk_length = len(i_response.audio)
                 total_audio_length += chunk_length
@@ -102,3 +117,8 @@ def stream_synthesize(
 
         click.echo(f"Total received audio size: {total_audio_length}")
         click.echo(f"Synthesized audio stored in {output_file}")
+
+    if cache:
+        # NB: only complete streams get here, a broken one raises above
+        cache.put(cache_key, b"".join(chunks))
+        click.echo(f"Audio cache: {cache.stats()}")
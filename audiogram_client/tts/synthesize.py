@@ -4,14 +4,15 @@ import click
 import grpc
 
 from audiogram_client.common_utils.arguments import common_options_in_settings
-from audiogram_client.common_utils.auth import get_auth_metadata
+from audiogram_client.common_utils.auth import auth_plugin_from_settings
 from audiogram_client.common_utils.config import SettingsProtocol
 from audiogram_client.common_utils.errors import errors_handler
 from audiogram_client.common_utils.grpc import open_grpc_channel, print_metadata, ssl_creds_from_settings
 from audiogram_client.common_utils.types import TTSVoiceStyle
 from audiogram_client.genproto import tts_pb2, tts_pb2_grpc
 
-from .utils.arguments import common_tts_options
+from .utils.arguments import audio_cache_options, common_tts_options
+from .utils.cache import AudioCache
 from .utils.request import make_tts_request
 
 
@@ -22,6 +23,7 @@ from .utils.request import make_tts_request
 @errors_handler
 @common_options_in_settings
 @common_tts_options()
+@audio_cache_options()
 def synthesize(
     settings: SettingsProtocol,
     text: str,
@@ -33,17 +35,10 @@ def synthesize(
     model_sample_rate: int | None,
     voice_style: TTSVoiceStyle,
     language_code: str | None,
+    cache_dir: str,
+    no_cache: bool,
+    cache_max_size_mb: int,
 ) -> None:
-    auth_metadata = get_auth_metadata(
-        settings.sso_url,
-        settings.realm,
-        settings.client_id,
-        settings.client_secret,
-        settings.iam_account,
-        settings.iam_workspace,
-        settings.verify_sso,
-    )
-
     click.echo(
         f"Request parameters:\n"
         f"Interpret text as SSML: {is_ssml}\n"
@@ -66,11 +61,26 @@ def synthesize(
         language_code,
     )
 
+    cache = None if no_cache else AudioCache(Path(cache_dir), cache_max_size_mb)
+    cache_key = AudioCache.make_key(request, "Synthesize")
+    cached = cache.open(cache_key) if cache else None
+    if cache and cached is not None:
+        with cached:
+            Path(output_file).write_bytes(cached)
+            click.echo(f"Cached audio size: {len(cached)}")
+        click.echo(f"Synthesized audio stored in {output_file}")
+        click.echo(f"Audio cache: {cache.stats()}")
+        return
+
+    # NB: token is only fetched when the request actually leaves the machine
+    auth_plugin = auth_plugin_from_settings(settings)
     click.echo(f"Connecting to gRPC server - {settings.api_address}\n")
 
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        auth_plugin,
+        settings.use_gzip,
     ) as channel:
         stub = tts_pb2_grpc.TTSStub(channel)
 
@@ -78,7 +88,6 @@ def synthesize(
         call: grpc.Call
         response, call = stub.Synthesize.with_call(
             request,
-            metadata=auth_metadata,
             timeout=settings.timeout,
         )
 
@@ -90,3 +99,7 @@ def synthesize(
 
     Path(output_file).write_bytes(response.audio)
     click.echo(f"Synthesized audio stored in {output_file}")
+
+    if cache:
+        cache.put(cache_key, response.audio)
+        click.echo(f"Audio cache: {cache.stats()}")
@@ -7,6 +7,8 @@ from audiogram_client.common_utils.arguments import options_wrapper, OptionsWrap
 from audiogram_client.common_utils.cli_options import output_file_option, text_option
 from audiogram_client.common_utils.types import TTSVoiceStyle
 
+from .definitions import AUDIO_CACHE_DIR, DEFAULT_AUDIO_CACHE_SIZE_MB
+
 
 def common_tts_options() -> OptionsWrapper:
     """Inject common list of TTS-related click options to a command.
@@ -32,6 +34,65 @@ def common_tts_options() -> OptionsWrapper:
             default=False,
             help="process --text as SSML (with speech markup)",
         ),
+        *_voice_options(voice_required=True),
+    ]
+
+    return options_wrapper(options)
+
+
+def batch_tts_options() -> OptionsWrapper:
+    """Inject TTS options of batch synthesis, they are defaults for manifest rows.
+
+    Options:
+        - sample_rate: int - output audio sample rate
+        - voice_name: str | None - voice name
+        - model_type: str | None - TTS model type
+        - model_sample_rate: int | None - model sample rate (optional)
+        - voice_style: TTSVoiceStyle - TTS voice style
+        - language_code: str | None - language code (e.g., 'en', 'ru')
+    """
+    return options_wrapper(_voice_options(voice_required=False))
+
+
+def audio_cache_options() -> OptionsWrapper:
+    """Inject options of the local synthesized audio cache.
+
+    Options:
+    - cache_dir: str - directory of cached audio
+    - no_cache: bool - disable the cache
+    - cache_max_size_mb: int - cache size limit, least recently used audio is evicted
+    """
+    options: list = [
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, writable=True, resolve_path=True),
+            default=str(AUDIO_CACHE_DIR),
+            show_default=True,
+            help="directory for cached synthesized audio",
+            metavar="<path>",
+        ),
+        click.option(
+            "--no-cache",
+            is_flag=True,
+            default=False,
+            help="always send requests, don't read or store cached audio",
+        ),
+        click.option(
+            "--cache-max-size",
+            "cache_max_size_mb",
+            type=click.IntRange(min=1),
+            default=DEFAULT_AUDIO_CACHE_SIZE_MB,
+            show_default=True,
+            help="max size of the audio cache in megabytes",
+            metavar="<MB>",
+        ),
+    ]
+
+    return options_wrapper(options)
+
+
+def _voice_options(voice_required: bool) -> list:
+    return [
         click.option(
             "--sample-rate",
             type=int,
@@ -42,7 +103,7 @@ def common_tts_options() -> OptionsWrapper:
         ),
         click.option(
             "--voice-name",
-            required=True,
+            required=voice_required,
             help="voice name for speech synthesis (choices can be fetched via get_models_info)",
             metavar="<name>",
         ),
@@ -75,5 +136,3 @@ def common_tts_options() -> OptionsWrapper:
             show_default="ru",
         ),
     ]
-
-    return options_wrapper(options)
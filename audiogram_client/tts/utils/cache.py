@@ -0,0 +1,45 @@
+import hashlib
+import mmap
+from pathlib import Path
+import unicodedata
+
+from audiogram_client.common_utils.cache import DiskCache
+from audiogram_client.genproto import tts_pb2
+
+
+class AudioCache:
+    """Local cache of synthesized audio.
+
+    Entries are keyed by the method and the deterministic serialization of
+    the request, so voice, sample rate and every synthesis option including
+    custom ones (map keys are sorted) are part of the key. Text is
+    normalized first: Unicode NFC, and for plain text whitespace runs are
+    collapsed, so trivially different spellings of a phrase share an entry.
+    """
+
+    def __init__(self, directory: Path, max_size_mb: int) -> None:
+        self._cache = DiskCache(directory, max_size_mb * 1024 * 1024)
+
+    @staticmethod
+    def make_key(request: tts_pb2.SynthesizeSpeechRequest, method: str) -> str:
+        normalized = tts_pb2.SynthesizeSpeechRequest()
+        normalized.CopyFrom(request)
+        if request.text:
+            normalized.text = " ".join(unicodedata.normalize("NFC", request.text).split())
+        if request.ssml:
+            normalized.ssml = unicodedata.normalize("NFC", request.ssml).strip()
+
+        # NB: Synthesize returns a WAV file and StreamingSynthesize raw PCM, never mix them up
+        digest = hashlib.sha256(f"{method}\0".encode())
+        digest.update(normalized.SerializeToString(deterministic=True))
+        return digest.hexdigest()
+
+    def open(self, key: str) -> mmap.mmap | None:
+        """Map cached audio, see `DiskCache.open`."""
+        return self._cache.open(key)
+
+    def put(self, key: str, audio: bytes) -> None:
+        self._cache.put(key, audio)
+
+    def stats(self) -> str:
+        return self._cache.stats()
@@ -1,5 +1,6 @@
 from typing import Final
 
+from audiogram_client.common_utils.definitions import CACHE_DIR
 from audiogram_client.genproto import tts_pb2
 
 # --- Static Configuration ---
@@ -15,3 +16,10 @@ DEFAULT_VOICE: Final = "borisova"
 DEFAULT_SAMPLE_RATE: Final = 48000
 
 LANGUAGE_CODE: Final = "ru"
+
+# --- Batch Synthesis ---
+DEFAULT_BATCH_MAX_IN_FLIGHT: Final = 8
+
+# --- Audio Cache ---
+AUDIO_CACHE_DIR: Final = CACHE_DIR / "tts"
+DEFAULT_AUDIO_CACHE_SIZE_MB: Final = 1024
@@ -52,6 +52,7 @@ def clone_voice(
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        compression=settings.use_gzip,
     ) as channel:
         stub = voice_cloning_pb2_grpc.VoiceCloningStub(channel)
         response: voice_cloning_pb2.TaskId
@@ -33,6 +33,7 @@ def delete_voice(
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        compression=settings.use_gzip,
     ) as channel:
         stub = voice_cloning_pb2_grpc.VoiceCloningStub(channel)
         stub.DeleteVoice(
@@ -33,6 +33,7 @@ def get_task_info(
     with open_grpc_channel(
         settings.api_address,
         ssl_creds_from_settings(settings),
+        compression=settings.use_gzip,
     ) as channel:
         stub = voice_cloning_pb2_grpc.VoiceCloningStub(channel)
         response: voice_cloning_pb2.TaskInfo
@@ -0,0 +1,79 @@
+"""Micro-benchmark for `AudioFile.chunks`.
+
+Compares the zero-copy memoryview chunker against the previous
+byte-by-byte `itertools.islice` implementation on a synthetic WAV file.
+
+Usage:
+    python -m benchmarks.bench_audio_chunks [--seconds 600] [--chunk-len 1000]
+"""
+
+import argparse
+from collections.abc import Callable, Iterable
+import itertools
+import os
+import tempfile
+import time
+import wave
+
+from audiogram_client.common_utils.audio import AudioFile
+
+
+def _legacy_chunks(audio: AudioFile, chunk_len_ms: int) -> Iterable[bytes]:
+    sample_rate_ms = audio.sample_rate // 1000
+    chunk_len = chunk_len_ms * sample_rate_ms * audio.sample_size
+
+    it = iter(audio.blob)
+    while True:
+        chunk = bytes(itertools.islice(it, chunk_len))
+        if not chunk:
+            break
+        yield chunk
+
+
+def _make_wav(path: str, seconds: int, sample_rate: int, channels: int) -> None:
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(os.urandom(seconds * sample_rate * channels * 2))
+
+
+def _measure(name: str, chunker: Callable[[], Iterable[bytes | memoryview]], size: int) -> float:
+    started = time.perf_counter()
+    total = sum(len(chunk) for chunk in chunker())
+    elapsed = time.perf_counter() - started
+    assert total == size, f"{name}: expected {size} bytes, got {total}"
+
+    throughput = size / elapsed / 1024 / 1024
+    print(f"{name:>10}: {elapsed:8.3f} s, {throughput:10.1f} MB/s")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=600, help="synthetic audio length")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--chunk-len", type=int, default=1000, help="chunk length in ms")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.wav")
+        _make_wav(path, args.seconds, args.sample_rate, args.channels)
+        audio = AudioFile(path)
+        size = len(audio.blob)
+
+        print(f"Audio: {args.seconds} s, {size / 1024 / 1024:.1f} MB, chunk {args.chunk_len} ms")
+        _measure("memoryview", lambda: audio.chunks(args.chunk_len), size)
+        # NB: protobuf copies every chunk into the request, so measure that too
+        new = _measure(
+            "+ bytes()", lambda: (bytes(chunk) for chunk in audio.chunks(args.chunk_len)), size
+        )
+        if args.channels == 1:
+            # NB: legacy chunker ignores channel count, so sizes only match for mono
+            old = _measure("islice", lambda: _legacy_chunks(audio, args.chunk_len), size)
+            print(f"Speedup: {new / old:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
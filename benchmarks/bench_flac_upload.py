@@ -0,0 +1,144 @@
+"""Benchmark of FLAC upload encoding against raw PCM for FileRecognize.
+
+Reports bytes on the wire (serialized FileRecognizeRequest) and end-to-end
+time for several audio lengths. Upload time is modeled from `--bandwidth`;
+with `--api-address` real FileRecognize calls are timed as well. Requires
+the ffmpeg executable.
+
+Usage:
+    python -m benchmarks.bench_flac_upload [--wav speech.wav] [--lengths 10,60,300,1800]
+        [--bandwidth 20] [--api-address host:port]
+"""
+
+import argparse
+import array
+import math
+import random
+import time
+
+import grpc
+from tabulate import tabulate
+
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.common_utils.flac import encode_flac
+from audiogram_client.genproto import stt_pb2, stt_pb2_grpc
+
+_SAMPLE_RATE = 16000
+_PATTERN_SECONDS = 10
+
+
+def _make_speech_like_pcm(seconds: int) -> bytes:
+    """Syllable-rate bursts of voiced harmonics over a low noise floor.
+
+    Random noise is incompressible and silence is trivially compressible,
+    neither gives a realistic ratio. One pattern is tiled, which doesn't
+    help FLAC since its frames are coded independently.
+    """
+    rng = random.Random(0)
+    samples = array.array("h")
+    for n in range(_PATTERN_SECONDS * _SAMPLE_RATE):
+        t = n / _SAMPLE_RATE
+        envelope = max(0.0, math.sin(2 * math.pi * 4 * t)) ** 2  # ~4 syllables per second
+        pitch = 120 + 30 * math.sin(2 * math.pi * 0.5 * t)
+        voiced = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in range(1, 6))
+        samples.append(int(6000 * envelope * voiced + rng.gauss(0, 60)))
+
+    pattern = samples.tobytes()
+    repeats = -(-seconds // _PATTERN_SECONDS)
+    return (pattern * repeats)[: seconds * _SAMPLE_RATE * 2]
+
+
+def _tile_wav(path: str, seconds: int) -> tuple[bytes, int, int]:
+    with AudioFile(path) as audio:
+        size = seconds * audio.sample_rate * audio.frame_size
+        pcm = audio.blob * (size // len(audio.blob) + 1)
+        return pcm[:size], audio.sample_rate, audio.channel_count
+
+
+def _request(
+    pcm: bytes, sample_rate: int, channels: int, flac: bool
+) -> stt_pb2.FileRecognizeRequest:
+    config = stt_pb2.RecognitionConfig(
+        encoding=stt_pb2.AudioEncoding.FLAC if flac else stt_pb2.AudioEncoding.LINEAR_PCM,
+        sample_rate_hertz=sample_rate,
+        audio_channel_count=channels,
+        language_code="ru",
+        model="e2e-v3",
+    )
+    return stt_pb2.FileRecognizeRequest(config=config, audio=pcm)
+
+
+def _timed_call(stub: stt_pb2_grpc.STTStub, request: stt_pb2.FileRecognizeRequest) -> float:
+    started = time.perf_counter()
+    stub.FileRecognize(
+        request,
+        metadata=[("x-ai-account", "demo"), ("x-ai-workspace", "default")],
+        timeout=600,
+    )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wav", help="recording to tile to every length (default: synthetic)")
+    parser.add_argument("--lengths", default="10,60,300,1800", help="audio lengths in seconds")
+    parser.add_argument("--bandwidth", type=float, default=20.0, help="upload Mbit/s to model")
+    parser.add_argument("--api-address", help="also time real FileRecognize calls (insecure)")
+    args = parser.parse_args()
+
+    stub = None
+    if args.api_address:
+        channel = grpc.insecure_channel(
+            args.api_address,
+            options=[("grpc.max_send_message_length", -1)],
+        )
+        stub = stt_pb2_grpc.STTStub(channel)
+
+    rows = []
+    for seconds in (int(length) for length in args.lengths.split(",")):
+        if args.wav:
+            pcm, sample_rate, channels = _tile_wav(args.wav, seconds)
+        else:
+            pcm, sample_rate, channels = _make_speech_like_pcm(seconds), _SAMPLE_RATE, 1
+
+        started = time.perf_counter()
+        flac = encode_flac(pcm, sample_rate, channels)
+        encode_s = time.perf_counter() - started
+
+        pcm_request = _request(pcm, sample_rate, channels, flac=False)
+        flac_request = _request(flac, sample_rate, channels, flac=True)
+        pcm_bytes, flac_bytes = pcm_request.ByteSize(), flac_request.ByteSize()
+        bytes_per_s = args.bandwidth * 1e6 / 8
+
+        row = [
+            seconds,
+            pcm_bytes / 1024 / 1024,
+            flac_bytes / 1024 / 1024,
+            flac_bytes / pcm_bytes,
+            encode_s,
+            pcm_bytes / bytes_per_s,
+            encode_s + flac_bytes / bytes_per_s,
+        ]
+        if stub is not None:
+            row += [_timed_call(stub, pcm_request), encode_s + _timed_call(stub, flac_request)]
+        rows.append(row)
+
+    headers = [
+        "audio, s",
+        "PCM, MB",
+        "FLAC, MB",
+        "ratio",
+        "encode, s",
+        f"PCM @{args.bandwidth:g} Mbit/s, s",
+        f"FLAC @{args.bandwidth:g} Mbit/s, s",
+    ]
+    if stub is not None:
+        headers += ["PCM e2e, s", "FLAC e2e, s"]
+
+    source = args.wav or "synthetic speech-like signal"
+    print(f"Audio: {source}, upload time modeled at {args.bandwidth:g} Mbit/s\n")
+    print(tabulate(rows, headers=headers, floatfmt=".3f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from array import array
+import asyncio
+import threading
+
+from google.protobuf import empty_pb2
+import grpc
+
+from audiogram_client.aio import (
+    AsyncASRClient,
+    AsyncTTSClient,
+    AsyncVoiceCloningClient,
+    create_aio_channel,
+)
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.common_utils.auth import SSOAuthPlugin
+from audiogram_client.genproto import (
+    stt_pb2,
+    stt_pb2_grpc,
+    stt_response_pb2,
+    tts_pb2,
+    tts_pb2_grpc,
+    voice_cloning_pb2,
+    voice_cloning_pb2_grpc,
+)
+
+
+class _EchoSTT(stt_pb2_grpc.STTServicer):
+    """Report received audio size and sample rate as the transcript."""
+
+    async def FileRecognize(self, request, context):
+        response = stt_response_pb2.FileRecognizeResponse()
+        result = response.response.add()
+        result.hypothesis.transcript = f"{len(request.audio)}@{request.config.sample_rate_hertz}"
+        return response
+
+    async def Recognize(self, request_iterator, context):
+        async for request in request_iterator:
+            if request.audio:
+                response = stt_response_pb2.RecognizeResponse()
+                response.hypothesis.transcript = str(len(request.audio))
+                yield response
+
+
+def test_async_asr_client():
+    async def run() -> tuple[list[str], list[str]]:
+        server = grpc.aio.server()
+        stt_pb2_grpc.add_STTServicer_to_server(_EchoSTT(), server)
+        port = server.add_insecure_port("localhost:0")
+        await server.start()
+
+        config = stt_pb2.RecognitionConfig(sample_rate_hertz=16000)
+
+        async def chunks():
+            for size in (2, 4, 6):
+                yield memoryview(bytes(size))
+
+        try:
+            async with create_aio_channel(f"localhost:{port}", None) as channel:
+                client = AsyncASRClient(channel, timeout=10)
+                responses = await asyncio.gather(
+                    *(client.file_recognize(config, bytes(size)) for size in (10, 20))
+                )
+                stream = [
+                    response.hypothesis.transcript
+                    async for response in client.recognize(
+                        stt_pb2.StreamRecognitionConfig(config=config), chunks()
+                    )
+                ]
+        finally:
+            await server.stop(None)
+
+        return [r.response[0].hypothesis.transcript for r in responses], stream
+
+    files, stream = asyncio.run(run())
+
+    assert files == ["10@16000", "20@16000"]
+    assert stream == ["2", "4", "6"]
+
+
+class _EchoTTS(tts_pb2_grpc.TTSServicer):
+    """Return the text and the authorization header as audio."""
+
+    async def Synthesize(self, request, context):
+        headers = dict(context.invocation_metadata())
+        audio = f"{request.text}|{headers.get('authorization', '')}".encode()
+        return tts_pb2.SynthesizeSpeechResponse(audio=audio)
+
+    async def StreamingSynthesize(self, request, context):
+        for word in request.text.split():
+            yield tts_pb2.StreamingSynthesizeSpeechResponse(audio=word.encode())
+
+
+class _FakeAuthPlugin(SSOAuthPlugin):
+    """Static token, remembers the threads it was asked for headers in."""
+
+    def __init__(self) -> None:
+        super().__init__("http://sso", "realm", "client", "secret", None, None, False)
+        self.threads: list[int] = []
+
+    def metadata(self) -> list[tuple[str, str]]:
+        self.threads.append(threading.get_ident())
+        return [("authorization", "Bearer token")]
+
+
+def test_async_tts_client_adds_auth_off_the_event_loop():
+    auth_plugin = _FakeAuthPlugin()
+
+    async def run() -> tuple[list[bytes], list[bytes], int]:
+        server = grpc.aio.server()
+        tts_pb2_grpc.add_TTSServicer_to_server(_EchoTTS(), server)
+        port = server.add_insecure_port("localhost:0")
+        await server.start()
+
+        try:
+            async with create_aio_channel(f"localhost:{port}", None, auth_plugin) as channel:
+                client = AsyncTTSClient(channel, timeout=10)
+                responses = await asyncio.gather(
+                    *(client.synthesize(tts_pb2.SynthesizeSpeechRequest(text=t)) for t in "ab")
+                )
+                stream = [
+                    response.audio
+                    async for response in client.stream_synthesize(
+                        tts_pb2.SynthesizeSpeechRequest(text="one two")
+                    )
+                ]
+        finally:
+            await server.stop(None)
+
+        return [r.audio for r in responses], stream, threading.get_ident()
+
+    audio, stream, loop_thread = asyncio.run(run())
+
+    assert audio == [b"a|Bearer token", b"b|Bearer token"]
+    assert stream == [b"one", b"two"]
+    assert len(auth_plugin.threads) == 3
+    assert loop_thread not in auth_plugin.threads
+
+
+class _FakeVoiceCloning(voice_cloning_pb2_grpc.VoiceCloningServicer):
+    """Voices become ready on the second status request."""
+
+    def __init__(self) -> None:
+        self.polls = 0
+        self.deleted: list[str] = []
+        self.signal = b""
+
+    async def CloneVoice(self, request, context):
+        self.signal = request.signal
+        return voice_cloning_pb2.TaskId(val="task-1")
+
+    async def GetTaskInfo(self, request, context):
+        self.polls += 1
+        status = voice_cloning_pb2.TaskInfo.Status
+        return voice_cloning_pb2.TaskInfo(
+            voice_id=f"voice-of-{request.val}",
+            status=status.READY if self.polls > 1 else status.CREATING,
+        )
+
+    async def DeleteVoice(self, request, context):
+        self.deleted.append(request.voice_id)
+        return empty_pb2.Empty()
+
+
+def test_async_voice_cloning_client():
+    servicer = _FakeVoiceCloning()
+    audio = AudioFile.from_pcm(array("h", [0, 100, -100, 0]).tobytes(), 8000, 1)
+
+    async def run() -> tuple[str, voice_cloning_pb2.TaskInfo]:
+        server = grpc.aio.server()
+        voice_cloning_pb2_grpc.add_VoiceCloningServicer_to_server(servicer, server)
+        port = server.add_insecure_port("localhost:0")
+        await server.start()
+
+        try:
+            async with create_aio_channel(f"localhost:{port}", None) as channel:
+                client = AsyncVoiceCloningClient(channel, timeout=10)
+                task_id = await client.clone_voice(audio)
+                info = await client.wait_for_voice(task_id, poll_interval=0)
+                await client.delete_voice(info.voice_id)
+        finally:
+            await server.stop(None)
+
+        return task_id, info
+
+    task_id, info = asyncio.run(run())
+
+    assert task_id == "task-1"
+    assert info.status == voice_cloning_pb2.TaskInfo.Status.READY
+    assert servicer.polls == 2
+    assert servicer.signal == audio.blob
+    assert servicer.deleted == ["voice-of-task-1"]
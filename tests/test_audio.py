@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+import threading
+import wave
+
+import pytest
+
+from audiogram_client.common_utils.audio import AudioFile, AudioStream
+from audiogram_client.common_utils.types import AudioFormat
+
+
+def _write_wav(path: Path, frames: bytes, channels: int = 1, sample_rate: int = 16000) -> None:
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+
+
+def test_chunks_cover_whole_blob(tmp_path: Path):
+    """Chunks must concatenate back to the original PCM data."""
+    path = tmp_path / "mono.wav"
+    _write_wav(path, bytes(range(256)) * 125)  # 32000 bytes = 1 s
+
+    audio = AudioFile(str(path))
+    chunks = list(audio.chunks(300))
+
+    assert b"".join(chunks) == audio.blob
+    assert [len(chunk) for chunk in chunks] == [9600, 9600, 9600, 3200]
+
+
+def test_chunks_are_frame_aligned_for_stereo(tmp_path: Path):
+    """Stereo chunks must account for both channels and end on frame boundaries."""
+    path = tmp_path / "stereo.wav"
+    _write_wav(path, b"\x01\x00\x02\x00" * 8000, channels=2, sample_rate=8000)
+
+    audio = AudioFile(str(path))
+    chunks = list(audio.chunks(250))
+
+    assert len(chunks) == 4
+    assert all(len(chunk) % audio.frame_size == 0 for chunk in chunks)
+    assert b"".join(chunks) == audio.blob
+
+
+@pytest.mark.parametrize("data_size", [b"\x00\x00\x00\x00", b"\xff\xff\xff\xff"])
+def test_unset_data_size_is_clamped_to_file(tmp_path: Path, data_size: bytes):
+    """Streaming writers leave the data size unset; PCM must still be read up to EOF."""
+    path = tmp_path / "stream.wav"
+    _write_wav(path, b"\x01\x00" * 1600)
+    raw = bytearray(path.read_bytes())
+    data_pos = raw.index(b"data")
+    raw[data_pos + 4 : data_pos + 8] = data_size
+    path.write_bytes(raw)
+
+    with AudioFile(str(path)) as audio:
+        assert audio.frame_count == 1600
+        assert audio.duration_ms == 100
+        assert audio.blob == b"\x01\x00" * 1600
+
+
+def test_stream_reads_wav_from_pipe(tmp_path: Path):
+    """WAV piped in must be parsed without seeking and yield the same PCM as the file."""
+    path = tmp_path / "mono.wav"
+    _write_wav(path, bytes(range(256)) * 125)
+    read_fd, write_fd = os.pipe()
+    def write() -> None:
+        os.write(write_fd, path.read_bytes())
+        os.close(write_fd)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+
+    with AudioStream(open(read_fd, "rb")) as stream, AudioFile(str(path)) as audio:
+        chunks = list(stream.chunks(300))
+        assert b"".join(chunks) == audio.blob
+        assert [len(chunk) for chunk in chunks] == [9600, 9600, 9600, 3200]
+        assert stream.duration_ms == 1000
+    writer.join()
+
+
+def test_stream_raw_pcm_drops_partial_frame(tmp_path: Path):
+    """Raw PCM is described by rate and channels, a trailing partial frame is dropped."""
+    path = tmp_path / "stereo.raw"
+    path.write_bytes(b"\x01\x00\x02\x00" * 800 + b"\x03")
+
+    with AudioStream.open(str(path), AudioFormat.s16le, 8000, 2) as stream:
+        chunks = list(stream.chunks(50))
+
+    assert [len(chunk) for chunk in chunks] == [1600, 1600]
+    assert b"".join(chunks) == b"\x01\x00\x02\x00" * 800
+
+
+def test_from_pcm_wraps_memory():
+    """Audio built from PCM in memory must behave like a mapped WAV file."""
+    audio = AudioFile.from_pcm(b"\x01\x00" * 16000, 16000, 1)
+
+    assert audio.duration_ms == 1000
+    assert [len(chunk) for chunk in audio.chunks(400)] == [12800, 12800, 6400]
+    audio.close()
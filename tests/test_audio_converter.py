@@ -0,0 +1,62 @@
+from pathlib import Path
+import shutil
+
+import pytest
+
+from audio_converter import AudioConverter, BatchConverter
+
+
+@pytest.fixture
+def copying_converter(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Replace ffmpeg with a plain copy, return the list of converted inputs."""
+    converted: list[Path] = []
+
+    def convert(self: AudioConverter, output_path: Path) -> None:
+        converted.append(self.input_path)
+        shutil.copyfile(self.input_path, output_path)
+
+    monkeypatch.setattr(AudioConverter, "_convert_to_wav", convert)
+    monkeypatch.setattr(AudioConverter, "probe_duration", lambda self: 1.0)
+    return converted
+
+
+def test_batch_converter_skips_up_to_date_files(tmp_path: Path, copying_converter: list[Path]):
+    (tmp_path / "a.mp3").write_bytes(b"a")
+    (tmp_path / "b.ogg").write_bytes(b"b")
+    converter = BatchConverter(str(tmp_path / "out"), jobs=2)
+
+    stats = converter.run([str(tmp_path)])
+    assert (stats.succeeded, stats.skipped, stats.failed) == (2, 0, 0)
+    assert sorted(path.name for path in (tmp_path / "out").glob("*.wav")) == ["a.wav", "b.wav"]
+
+    (tmp_path / "b.ogg").write_bytes(b"changed")
+    stats = converter.run([str(tmp_path)])
+    assert (stats.succeeded, stats.skipped) == (1, 1)
+    assert copying_converter[-1] == tmp_path / "b.ogg"
+
+
+def test_batch_converter_ignores_its_own_output(tmp_path: Path, copying_converter: list[Path]):
+    """An output dir inside the input dir must not feed converted files back as inputs."""
+    (tmp_path / "call.wav").write_bytes(b"call")
+    converter = BatchConverter(str(tmp_path / "out"))
+
+    converter.run([str(tmp_path)])
+    stats = converter.run([str(tmp_path)])
+
+    assert (stats.succeeded, stats.skipped) == (0, 1)
+    assert copying_converter == [tmp_path / "call.wav"]
+    assert [path.name for path in (tmp_path / "out").glob("*.wav")] == ["call.wav"]
+
+
+def test_batch_converter_resumes_when_names_change(tmp_path: Path, copying_converter: list[Path]):
+    """A new input with an equal name renames outputs, finished inputs are still skipped."""
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "call.wav").write_bytes(directory.encode())
+    converter = BatchConverter(str(tmp_path / "out"))
+
+    converter.run([str(tmp_path / "a")])
+    stats = converter.run([str(tmp_path / "a"), str(tmp_path / "b")])
+
+    assert (stats.succeeded, stats.skipped) == (1, 1)
+    assert copying_converter == [tmp_path / "a" / "call.wav", tmp_path / "b" / "call.wav"]
@@ -0,0 +1,105 @@
+from concurrent import futures
+import os
+from pathlib import Path
+import time
+from types import SimpleNamespace
+
+import grpc
+import pytest
+
+from audiogram_client.common_utils import auth
+from audiogram_client.common_utils.auth import AccessToken, SSOAuthPlugin, TokenCache
+from audiogram_client.common_utils.grpc import open_grpc_channel
+
+
+@pytest.fixture
+def token_requests(monkeypatch: pytest.MonkeyPatch) -> list[auth.TokenKey]:
+    requests: list[auth.TokenKey] = []
+
+    def request_token(key: auth.TokenKey, client_secret: str, verify: bool) -> AccessToken:
+        requests.append(key)
+        now = time.time()
+        return AccessToken(f"token-{len(requests)}", now, now + 300)
+
+    monkeypatch.setattr(auth, "_request_token", request_token)
+    return requests
+
+
+def test_token_cache_reuses_token(token_requests: list[auth.TokenKey]):
+    cache = TokenCache()
+    key = ("https://sso", "realm", "client")
+
+    assert cache.get(key, "secret", True) == "token-1"
+    assert cache.get(key, "secret", True) == "token-1"
+    assert cache.get(("https://sso", "realm", "other"), "secret", True) == "token-2"
+    assert len(token_requests) == 2
+
+
+def test_token_disk_cache_is_shared_and_private(tmp_path: Path, token_requests: list):
+    key = ("https://sso", "realm", "client")
+    first = TokenCache()
+    first.enable_disk_cache(tmp_path)
+    first.get(key, "secret", True)
+
+    second = TokenCache()
+    second.enable_disk_cache(tmp_path)
+
+    assert second.get(key, "secret", True) == "token-1"
+    assert len(token_requests) == 1
+    [token_file] = tmp_path.iterdir()
+    assert os.stat(token_file).st_mode & 0o777 == 0o600
+
+
+def test_expired_token_is_fetched_again(token_requests: list):
+    cache = TokenCache()
+    key = ("https://sso", "realm", "client")
+    cache._tokens[key] = AccessToken("stale", time.time() - 300, time.time() + 1)
+
+    assert cache.get(key, "secret", True) == "token-1"
+
+
+def test_auth_plugin_adds_headers_to_every_call(token_requests: list):
+    """Insecure channels get auth headers through the interceptor fallback."""
+
+    def echo_metadata(request: bytes, context: grpc.ServicerContext) -> bytes:
+        return repr([tuple(item) for item in context.invocation_metadata()]).encode()
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    server.add_generic_rpc_handlers(
+        (
+            grpc.method_handlers_generic_handler(
+                "test.Echo",
+                {"Metadata": grpc.unary_unary_rpc_method_handler(echo_metadata)},
+            ),
+        )
+    )
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    plugin = SSOAuthPlugin("https://sso", "realm", "plugin-client", "secret", "acc", "", True)
+    try:
+        with open_grpc_channel(f"localhost:{port}", None, plugin) as channel:
+            call = channel.unary_unary("/test.Echo/Metadata")
+            first = call(b"", metadata=[("x-extra", "1")]).decode()
+            second = call(b"").decode()
+    finally:
+        server.stop(None)
+
+    assert "('authorization', 'Bearer token-1')" in first
+    assert "('x-ai-account', 'acc')" in first
+    assert "('x-ai-workspace', 'default')" in first
+    assert "('x-extra', '1')" in first
+    assert "('authorization', 'Bearer token-1')" in second
+    assert len(token_requests) == 1
+
+
+def test_auth_metadata_only_without_sso():
+    """IAM headers go with every call when SSO is disabled, the plugin adds them otherwise."""
+    settings = SimpleNamespace(iam_account="acc", iam_workspace=None)
+    plugin = SSOAuthPlugin("https://sso", "realm", "client", "secret", "acc", None, True)
+
+    assert auth.auth_metadata_from_settings(settings, None) == [
+        ("x-ai-account", "acc"),
+        ("x-ai-workspace", "default"),
+    ]
+    assert auth.auth_metadata_from_settings(settings, plugin) == []
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from audiogram_client.common_utils.batch import (
+    check_output_names,
+    collect_inputs,
+    percentile,
+    run_bounded,
+)
+
+
+def test_collect_inputs_from_directory_and_manifest(tmp_path: Path):
+    """Directories, manifests and globs expand to items with unique output names."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "call.wav").touch()
+    (tmp_path / "b" / "call.wav").touch()
+    (tmp_path / "b" / "notes.txt").touch()
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"audio_file": "a/call.wav", "output": "custom"}) + "\n")
+
+    sources = [str(tmp_path / "a"), str(tmp_path / "b" / "*.wav"), str(manifest)]
+    items = collect_inputs(sources, [".wav"])
+
+    assert [item.path for item in items] == [
+        tmp_path / "a" / "call.wav",
+        tmp_path / "b" / "call.wav",
+        tmp_path / "a" / "call.wav",
+    ]
+    names = [item.output_name for item in items]
+    assert names[2] == "custom"
+    assert names[0] != names[1] and all(name.startswith("call-") for name in names[:2])
+
+
+def test_collect_inputs_skips_excluded_directories(tmp_path: Path):
+    """Results of an earlier run inside an input directory are not inputs of the next one."""
+    (tmp_path / "out").mkdir()
+    (tmp_path / "call.wav").touch()
+    (tmp_path / "out" / "call.wav").touch()
+
+    items = collect_inputs([str(tmp_path)], [".wav"], exclude=[tmp_path / "out"])
+
+    assert [(item.path, item.output_name) for item in items] == [(tmp_path / "call.wav", "call")]
+
+
+@pytest.mark.parametrize("output", ["../escape", "/tmp/absolute", "sub/../../x"])
+def test_check_output_names_rejects_outputs_outside_output_dir(tmp_path: Path, output: str):
+    (tmp_path / "call.wav").touch()
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"audio_file": "call.wav", "output": output}) + "\n")
+
+    items = collect_inputs([str(manifest)], [".wav"])
+
+    with pytest.raises(ValueError, match="outside of --output-dir"):
+        check_output_names(items, tmp_path / "out", ".json")
+
+
+def test_check_output_names_rejects_files_listed_twice(tmp_path: Path):
+    """A file given by a manifest row and a glob would be written by two jobs."""
+    (tmp_path / "call.wav").touch()
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"audio_file": "call.wav"}) + "\n")
+
+    items = collect_inputs([str(manifest), str(tmp_path / "*.wav")], [".wav"])
+    with pytest.raises(ValueError, match="already used by"):
+        check_output_names(items, tmp_path / "out", ".json")
+
+    check_output_names(items[:1], tmp_path / "out", ".json")
+
+
+def test_run_bounded_limits_in_flight_calls():
+    """No more than max_in_flight calls may run at once, and every item is processed."""
+    running = []
+    peak = []
+
+    def work(value: int) -> int:
+        running.append(value)
+        peak.append(len(running))
+        running.remove(value)
+        return value * 2
+
+    results = {item: future.result() for item, future in run_bounded(work, range(20), 3)}
+
+    assert results == {value: value * 2 for value in range(20)}
+    assert max(peak) <= 3
+
+
+def test_percentile_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([], 50) == 0.0
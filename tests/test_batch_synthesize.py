@@ -0,0 +1,154 @@
+import functools
+import io
+import json
+from pathlib import Path
+import wave
+
+import pytest
+
+from audiogram_client.common_utils.types import TTSVoiceStyle
+from audiogram_client.genproto import tts_pb2
+from audiogram_client.tts.batch_synthesize import (
+    SynthesisItem,
+    _collect_items,
+    _make_request,
+    _synthesize_item,
+)
+from audiogram_client.tts.utils.cache import AudioCache
+
+make_request = functools.partial(
+    _make_request,
+    voice_name="default-voice",
+    sample_rate=22050,
+    model_type=None,
+    model_sample_rate=None,
+    voice_style=TTSVoiceStyle.neutral,
+    language_code=None,
+)
+
+
+def _wav(frames: int, sample_rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\0\0" * frames)
+    return buffer.getvalue()
+
+
+def _write_manifest(path: Path, rows: list[dict[str, str]]) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+
+def test_collect_items_names_outputs_inside_output_dir(tmp_path: Path):
+    manifest = _write_manifest(
+        tmp_path / "texts.jsonl", [{"text": "a"}, {"text": "b", "output": "sub/b.wav"}]
+    )
+
+    items = _collect_items((manifest,), tmp_path / "out")
+
+    assert [item.output for item in items] == [
+        tmp_path / "out" / "texts-00001.wav",
+        tmp_path / "out" / "sub" / "b.wav",
+    ]
+    assert items[0].source == "texts.jsonl:1"
+
+
+@pytest.mark.parametrize("output", ["../escape.wav", "/tmp/absolute.wav", "sub/../../x.wav"])
+def test_collect_items_rejects_outputs_outside_output_dir(tmp_path: Path, output: str):
+    manifest = _write_manifest(tmp_path / "texts.jsonl", [{"text": "a", "output": output}])
+
+    with pytest.raises(ValueError, match="outside of --output-dir"):
+        _collect_items((manifest,), tmp_path / "out")
+
+
+def test_collect_items_rejects_duplicate_outputs(tmp_path: Path):
+    """Default names of equally named manifests collide as well as explicit ones."""
+    first = _write_manifest(tmp_path / "a" / "texts.jsonl", [{"text": "a"}])
+    second = _write_manifest(tmp_path / "b" / "texts.jsonl", [{"text": "b"}])
+
+    with pytest.raises(ValueError, match="already used by"):
+        _collect_items((first, second), tmp_path / "out")
+
+    explicit = _write_manifest(
+        tmp_path / "c.jsonl", [{"text": "a", "output": "x.wav"}, {"text": "b", "output": "x.wav"}]
+    )
+    with pytest.raises(ValueError, match="already used by"):
+        _collect_items((explicit,), tmp_path / "out")
+
+
+def test_make_request_fills_missing_columns_from_options():
+    request, characters = make_request({"text": "Привет"})
+
+    assert (request.text, request.voice_name, request.sample_rate_hertz) == (
+        "Привет",
+        "default-voice",
+        22050,
+    )
+    assert request.synthesize_options.voice_style == TTSVoiceStyle.neutral.pb2_value
+    assert characters == 6
+
+
+def test_make_request_prefers_manifest_columns():
+    request, characters = make_request(
+        {"ssml": "<speak>hi</speak>", "voice": "other", "style": "happy", "sample_rate": "8000"}
+    )
+
+    assert (request.ssml, request.text) == ("<speak>hi</speak>", "")
+    assert (request.voice_name, request.sample_rate_hertz) == ("other", 8000)
+    assert request.synthesize_options.voice_style == TTSVoiceStyle.happy.pb2_value
+    assert characters == len("<speak>hi</speak>")
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        ({"voice": "v"}, "neither `text` nor `ssml`"),
+        ({"text": "a", "style": "bored"}, "unknown voice style 'bored'"),
+    ],
+)
+def test_make_request_rejects_bad_rows(fields: dict[str, str], message: str):
+    with pytest.raises(ValueError, match=message):
+        make_request(fields)
+
+
+def test_make_request_requires_a_voice():
+    with pytest.raises(ValueError, match="no `voice`"):
+        _make_request({"text": "a"}, None, 22050, None, None, TTSVoiceStyle.neutral, None)
+
+
+class _FakeStub:
+    def __init__(self, audio: bytes) -> None:
+        self.audio = audio
+        self.calls = 0
+
+    def Synthesize(self, request, timeout):
+        self.calls += 1
+        return tts_pb2.SynthesizeSpeechResponse(audio=self.audio)
+
+
+def test_synthesize_item_stores_audio_and_serves_repeats_from_cache(tmp_path: Path):
+    stub = _FakeStub(_wav(4000))
+    cache = AudioCache(tmp_path / "cache", max_size_mb=1)
+    item = SynthesisItem("texts.jsonl:1", {"text": "a"}, tmp_path / "out" / "a.wav")
+
+    _, characters, audio_seconds, retried, cached = _synthesize_item(
+        lambda: stub, item, make_request, 10, 0, cache
+    )
+    assert (characters, audio_seconds, retried, cached) == (1, 0.5, 0, False)
+    assert item.output.read_bytes() == stub.audio
+
+    item.output.unlink()
+
+    def no_connection() -> _FakeStub:
+        raise AssertionError("cache hits must not connect")
+
+    _, _, audio_seconds, _, cached = _synthesize_item(
+        no_connection, item, make_request, 10, 0, cache
+    )
+    assert (audio_seconds, cached) == (0.5, True)
+    assert item.output.read_bytes() == stub.audio
+    assert stub.calls == 1
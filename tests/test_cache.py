@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from audiogram_client.common_utils.cache import DiskCache
+from audiogram_client.common_utils.types import TTSVoiceStyle
+from audiogram_client.tts.utils.cache import AudioCache
+from audiogram_client.tts.utils.request import make_tts_request
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path):
+    """Entries over the size limit are evicted oldest-access first, also after reopening."""
+    cache = DiskCache(tmp_path, max_size_bytes=10)
+    cache.put("aa01", b"1234")
+    cache.put("aa02", b"5678")
+    assert cache.get("aa01") == b"1234"  # aa02 is now the least recently used
+
+    cache.put("bb03", b"9012")
+
+    assert cache.get("aa02") is None
+    assert cache.get("aa01") == b"1234"
+    assert cache.get("bb03") == b"9012"
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    reopened = DiskCache(tmp_path, max_size_bytes=10)
+    assert reopened.get("bb03") == b"9012"
+    reopened.put("cc04", b"3456")
+    assert reopened.get("aa01") is None
+
+
+def test_disk_cache_skips_oversized_values(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_size_bytes=4)
+    cache.put("aa01", b"12345")
+    assert cache.get("aa01") is None
+
+
+def test_disk_cache_hit_survives_concurrent_eviction(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """A value read just before another process evicted it is still a hit."""
+    cache = DiskCache(tmp_path, max_size_bytes=10)
+    cache.put("aa01", b"1234")
+
+    def evicted(path: Path) -> None:
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr("audiogram_client.common_utils.cache.os.utime", evicted)
+
+    assert cache.get("aa01") == b"1234"
+    assert cache.hits == 1
+
+
+def test_disk_cache_open_maps_value(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_size_bytes=100)
+    cache.put("aa01", b"RIFF....WAVE")
+
+    with cache.open("aa01") as mapped:
+        assert mapped[:] == b"RIFF....WAVE"
+    assert cache.open("aa02") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_audio_cache_key_normalizes_text_only():
+    """Whitespace and Unicode form of plain text don't matter, voice and custom options do."""
+
+    def key(text: str, voice: str = "v", **custom_options) -> str:
+        request = make_tts_request(
+            text, False, voice, 16000, None, None, TTSVoiceStyle.neutral, None, custom_options
+        )
+        return AudioCache.make_key(request, "Synthesize")
+
+    assert key("Ваш  баланс ") == key("Ваш баланс")
+    assert key("\u00e9") == key("e\u0301")
+    assert key("a", speed=1.0, pitch=2) == key("a", pitch=2, speed=1.0)
+    assert key("a", speed=1.0) != key("a", speed=1.1)
+    assert key("a", voice="x") != key("a")
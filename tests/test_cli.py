@@ -29,3 +29,10 @@ def test_models_command_help(runner: CliRunner):
     result = runner.invoke(audiogram_cli, ["models", "--help"])
     assert result.exit_code == 0
     assert "Usage: audiogram_cli models [OPTIONS]" in result.output
+
+
+def test_asr_batch_requires_input(runner: CliRunner):
+    """Test the asr batch command fails without --input."""
+    result = runner.invoke(audiogram_cli, ["asr", "batch"])
+    assert result.exit_code == 2
+    assert "Missing option '--input'" in result.output
@@ -0,0 +1,33 @@
+import math
+import shutil
+import struct
+
+import pytest
+
+from audiogram_client.common_utils.flac import encode_flac, encode_flac_stream
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def _tone(seconds: float, sample_rate: int = 16000) -> bytes:
+    count = int(seconds * sample_rate)
+    samples = (int(8000 * math.sin(2 * math.pi * 440 * n / sample_rate)) for n in range(count))
+    return struct.pack(f"<{count}h", *samples)
+
+
+def test_encode_flac_compresses_pcm():
+    """Encoded audio must be a FLAC stream noticeably smaller than the PCM."""
+    pcm = _tone(2)
+
+    flac = encode_flac(pcm, 16000, 1)
+
+    assert flac[:4] == b"fLaC"
+    assert len(flac) < len(pcm) / 2
+
+
+def test_encode_flac_stream_stops_encoder_early():
+    """Closing the stream before the end must not hang on a still running encoder."""
+    stream = encode_flac_stream(iter([_tone(1)] * 60), 16000, 1)
+
+    assert next(stream)[:4] == b"fLaC"
+    stream.close()
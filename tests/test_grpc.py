@@ -0,0 +1,72 @@
+from concurrent import futures
+
+import grpc
+import pytest
+
+from audiogram_client.common_utils.grpc import ChannelPool, call_with_retries
+
+
+def test_channel_pool_reuses_channels_and_counts_calls():
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    server.add_generic_rpc_handlers(
+        (
+            grpc.method_handlers_generic_handler(
+                "test.Echo",
+                {"Echo": grpc.unary_unary_rpc_method_handler(lambda request, context: request)},
+            ),
+        )
+    )
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    try:
+        with ChannelPool(size=2, compression=True) as pool:
+            channels = [pool.get(f"localhost:{port}", None) for _ in range(5)]
+            for channel in channels:
+                assert channel.unary_unary("/test.Echo/Echo")(b"ping") == b"ping"
+
+            stats = pool.stats()
+    finally:
+        server.stop(None)
+
+    assert len({id(channel) for channel in channels}) == 2
+    assert stats.splitlines() == [
+        f"Channel 1 to localhost:{port}: 3 RPCs",
+        f"Channel 2 to localhost:{port}: 2 RPCs",
+    ]
+
+
+def test_call_with_retries_repeats_only_transient_errors(monkeypatch):
+    """UNAVAILABLE is retried until the call succeeds, other errors are raised at once."""
+    monkeypatch.setattr("audiogram_client.common_utils.grpc.time.sleep", lambda _: None)
+    attempts = {"flaky": 0, "broken": 0}
+
+    def handler(request, context):
+        attempts[request.decode()] += 1
+        if request == b"broken":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad request")
+        if attempts["flaky"] < 3:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "overloaded")
+        return request
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    server.add_generic_rpc_handlers(
+        (
+            grpc.method_handlers_generic_handler(
+                "test.Echo", {"Echo": grpc.unary_unary_rpc_method_handler(handler)}
+            ),
+        )
+    )
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            echo = channel.unary_unary("/test.Echo/Echo")
+            assert call_with_retries(lambda: echo(b"flaky"), retries=3) == (b"flaky", 2)
+            with pytest.raises(grpc.RpcError):
+                call_with_retries(lambda: echo(b"broken"), retries=3)
+    finally:
+        server.stop(None)
+
+    assert attempts == {"flaky": 3, "broken": 1}
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from audiogram_client.common_utils.histogram import Histogram
+
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(42)
+    values = sorted(rng.expovariate(1 / 200) for _ in range(20000))
+    hist = Histogram()
+    for value in values:
+        hist.record(value)
+
+    for q in (50, 90, 99):
+        exact = values[round(q / 100 * len(values)) - 1]
+        assert abs(hist.percentile(q) - exact) / exact < 0.02
+
+    assert hist.percentile(100) == values[-1]
+    assert hist.count == len(values)
+
+
+def test_histogram_merge():
+    first, second = Histogram(), Histogram()
+    for value in (1.0, 2.0, 3.0):
+        first.record(value)
+    second.record(100.0)
+
+    first.merge(second)
+
+    assert (first.count, first.min, first.max) == (4, 1.0, 100.0)
+    assert first.percentile(50) == pytest.approx(2.0, rel=0.01)
@@ -0,0 +1,45 @@
+import random
+
+from audiogram_client.asr.utils.intervals import IntervalIndex, ResultIndex
+from audiogram_client.genproto import stt_response_pb2
+
+
+def test_interval_index_matches_linear_scan():
+    """Overlap and point queries must return exactly what a scan finds, in start order."""
+    rng = random.Random(7)
+    intervals = []
+    for idx in range(500):
+        start = rng.randrange(0, 100_000)
+        intervals.append((start, start + rng.choice([0, 50, 300, 20_000]), idx))
+    index = IntervalIndex(intervals)
+
+    for _ in range(300):
+        start = rng.randrange(-1000, 120_000)
+        end = start + rng.choice([0, 10, 1000, 30_000])
+        expected = sorted((s, payload) for s, e, payload in intervals if s <= end and e >= start)
+        assert index.overlapping(start, end) == [payload for _, payload in expected]
+
+    assert IntervalIndex([]).at(0) == []
+
+
+def test_result_index_queries_by_channel():
+    """Words, marks, spoofing and speakers must be found by time on the right channel."""
+    response = stt_response_pb2.FileRecognizeResponse()
+    for channel, speaker, start in [(0, 1, 0), (1, 2, 500), (0, 3, 2000)]:
+        result = response.response.add(channel=channel)
+        result.hypothesis.start_time_ms = start
+        result.hypothesis.end_time_ms = start + 1000
+        result.hypothesis.words.add(word=f"w{start}", start_time_ms=start, end_time_ms=start + 400)
+        result.va_marks.add(offset_ms=start + 1000)
+        result.spoofing_result.add(start_time_ms=start, end_time_ms=start + 1000)
+        result.speaker_info.speaker_id = speaker
+
+    index = ResultIndex(response)
+
+    assert index.channels == [0, 1]
+    assert index.speakers_at(700) == [1, 2]
+    assert index.speakers_at(700, channel=1) == [2]
+    assert [w.word for w in index.words(300, 2100, channel=0)] == ["w0", "w2000"]
+    assert [m.offset_ms for m in index.va_marks(900, 1600)] == [1000, 1500]
+    assert len(index.spoofing(2500, 2500, channel=1)) == 0
+    assert index.results(0, 100, channel=5) == []
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from audiogram_client.common_utils.ledger import JobLedger, JobStatus, file_hash
+
+
+def test_ledger_resumes_finished_jobs(tmp_path: Path):
+    """A reopened ledger must report finished jobs as done and keep failed ones retryable."""
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"pcm")
+    output = tmp_path / "a.json"
+    output.write_text("{}")
+    content_hash = file_hash(audio)
+
+    ledger = JobLedger(tmp_path / "ledger.jsonl")
+    ledger.start("a", audio, content_hash, "cfg")
+    ledger.finish("a", output)
+    ledger.start("b", audio, content_hash, "cfg")
+    ledger.fail("b", "UNAVAILABLE")
+    ledger.close()
+
+    reopened = JobLedger(tmp_path / "ledger.jsonl")
+    assert reopened.content_hash("a", audio) == content_hash
+    assert reopened.is_done("a", content_hash, "cfg")
+    assert not reopened.is_done("a", content_hash, "other-cfg")
+    assert not reopened.is_done("b", content_hash, "cfg")
+
+    reopened.start("b", audio, content_hash, "cfg")
+    reopened.close()
+    lines = (tmp_path / "ledger.jsonl").read_text().splitlines()
+    assert len(lines) == 3  # compacted to one record per key, plus the new attempt
+    assert '"attempts": 2' in lines[-1] and f'"status": "{JobStatus.pending}"' in lines[-1]
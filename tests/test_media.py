@@ -0,0 +1,36 @@
+from pathlib import Path
+import shutil
+import wave
+
+import pytest
+
+from audiogram_client.common_utils.media import DecoderPool, MediaStream
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def _write_wav(path: Path, seconds: int, channels: int, sample_rate: int) -> None:
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x10\x00" * channels * sample_rate * seconds)
+
+
+def test_decode_resamples_to_recognition_format(tmp_path: Path):
+    """Any input must come out of the pipe as 16-bit mono 16 kHz PCM of the same duration."""
+    path = tmp_path / "stereo.wav"
+    _write_wav(path, 2, channels=2, sample_rate=8000)
+
+    with DecoderPool(1).decode(path) as audio:
+        assert (audio.sample_rate, audio.channel_count, audio.sample_size) == (16000, 1, 2)
+        assert abs(audio.duration_ms - 2000) <= 20
+
+
+def test_stream_stops_decoder_early(tmp_path: Path):
+    """Closing the stream before EOF must not hang on a decoder blocked on a full pipe."""
+    path = tmp_path / "long.wav"
+    _write_wav(path, 60, channels=1, sample_rate=16000)
+
+    with MediaStream(path) as stream:
+        assert len(next(stream.chunks(100))) == 3200
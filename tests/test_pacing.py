@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from audiogram_client.common_utils.pacing import Pacer
+
+
+def test_pacer_does_not_accumulate_work_time():
+    """Work between ticks is absorbed by the schedule instead of adding up."""
+    pacer = Pacer(interval_ms=40, speed=2)  # tick every 20 ms
+
+    started = time.monotonic()
+    for _ in range(11):
+        pacer.wait()
+        time.sleep(0.01)  # serialization, flow control, etc.
+    elapsed = time.monotonic() - started
+
+    # fixed sleeps would take 10 * (20 + 10) ms = 300 ms
+    assert 0.2 <= elapsed < 0.27
+    assert pacer.ticks == 11
+    assert pacer.max_lag_ms < 20
+
+
+def test_pacer_rejects_non_positive_speed():
+    with pytest.raises(ValueError):
+        Pacer(100, speed=0)
@@ -0,0 +1,74 @@
+import struct
+
+import pytest
+
+from audiogram_client.asr.utils.rtp import JitterBuffer, RtpCall, RtpPacket, parse_rtp_packet
+
+
+def test_parse_skips_csrc_extension_and_padding():
+    """Payload must exclude CSRC list, header extension and trailing padding."""
+    header = struct.pack("!BBHII", 0x80 | 0x20 | 0x10 | 1, 0x80 | 8, 7, 1120, 0xCAFE)
+    csrc = struct.pack("!I", 42)
+    extension = struct.pack("!HH", 0xBEDE, 1) + b"\0" * 4
+    data = header + csrc + extension + b"\xd5" * 160 + b"\0\0\3"
+
+    packet = parse_rtp_packet(data)
+
+    assert (packet.ssrc, packet.sequence, packet.payload_type) == (0xCAFE, 7, 8)
+    assert packet.marker
+    assert packet.payload == b"\xd5" * 160
+
+    with pytest.raises(ValueError):
+        parse_rtp_packet(b"\x40" + data[1:])  # RTP version 1
+
+
+def test_jitter_buffer_reorders_across_sequence_wrap():
+    """Out-of-order packets within the buffer depth must come out in order, also past 65535."""
+    buffer = JitterBuffer(depth=3, silence=0xFF)
+    arrival = [65534, 0, 65535, 2, 1, 3]
+
+    released = [p for seq in arrival for p in buffer.push(seq, bytes([seq % 256]))]
+    released += buffer.flush()
+
+    assert released == [bytes([seq % 256]) for seq in [65534, 65535, 0, 1, 2, 3]]
+    assert (buffer.lost, buffer.late) == (0, 0)
+
+
+def test_jitter_buffer_conceals_loss_and_drops_late():
+    """Lost packets become silence of the same length, packets behind the output are dropped."""
+    buffer = JitterBuffer(depth=2, silence=0xFF)
+
+    released = []
+    for seq in [10, 12, 13, 14, 11]:
+        released += buffer.push(seq, b"\x01\x02")
+    released += buffer.flush()
+
+    assert b"".join(released) == b"\x01\x02" + b"\xff\xff" + b"\x01\x02" * 3
+    assert (buffer.lost, buffer.late) == (1, 1)
+
+
+def test_jitter_buffer_resyncs_after_sender_restart():
+    """A jump far behind the output restarts the sequence instead of dropping everything."""
+    buffer = JitterBuffer(depth=2, silence=0xFF)
+
+    released = []
+    for seq in [5000, 5001, 5002, 10, 11, 12]:
+        released += buffer.push(seq, bytes([seq % 256]))
+    released += buffer.flush()
+
+    assert released == [bytes([seq % 256]) for seq in [5000, 5001, 5002, 10, 11, 12]]
+    assert (buffer.lost, buffer.late, buffer.resyncs) == (0, 0, 1)
+
+
+def test_aborted_call_drops_its_audio():
+    """Audio of a call whose recognition failed is dropped, not queued forever."""
+    call = RtpCall(ssrc=1, payload_type=0, jitter_depth=1, chunk_len_ms=20)
+    for seq in range(3):
+        call.feed(RtpPacket(1, seq, seq * 160, 0, False, b"\x01" * 160))
+
+    call.abort()
+    call.feed(RtpPacket(1, 3, 480, 0, False, b"\x01" * 160))
+    call.end()
+
+    assert list(call.chunks()) == []
+    assert call.packets == 4
@@ -0,0 +1,138 @@
+from array import array
+import itertools
+from pathlib import Path
+import wave
+
+import pytest
+
+from audiogram_client.asr.utils.segmentation import (
+    audio_windows,
+    cut_silence,
+    split_on_silence,
+)
+from audiogram_client.asr.utils.timeline import (
+    OffsetMap,
+    merge_file_responses,
+    remap_response_times,
+)
+from audiogram_client.common_utils.audio import AudioFile
+from audiogram_client.genproto import stt_response_pb2
+
+
+def test_split_on_silence_cuts_in_pause(tmp_path: Path):
+    """Cuts land in the silent gap nearest to the target length and cover the whole file."""
+    rate = 8000
+    loud = array("h", [8000, -8000]) * (rate // 2)  # 1 s of tone
+    pause = array("h", [0]) * (rate // 2)  # 0.5 s of silence
+    samples = loud * 3 + pause + loud * 3 + pause + loud * 2
+
+    path = tmp_path / "speech.wav"
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(samples.tobytes())
+
+    with AudioFile(str(path)) as audio:
+        segments = split_on_silence(audio, 4000, search_ms=1500, window_ms=100)
+
+        assert len(segments) == 3
+        assert segments[0].start_frame == 0
+        assert segments[-1].end_frame == audio.frame_count
+        assert all(a.end_frame == b.start_frame for a, b in itertools.pairwise(segments))
+        assert 3 * rate <= segments[1].start_frame <= 3.5 * rate
+        assert 6.5 * rate <= segments[2].start_frame <= 7 * rate
+        assert sum(len(segment.pcm(audio)) for segment in segments) == len(audio.pcm)
+
+
+def test_merge_file_responses_shifts_timestamps():
+    parts = []
+    for offset_ms in (0, 30000):
+        response = stt_response_pb2.FileRecognizeResponse()
+        result = response.response.add()
+        result.hypothesis.start_time_ms = 100
+        result.hypothesis.end_time_ms = 900
+        word = result.hypothesis.words.add()
+        word.start_time_ms = 200
+        word.end_time_ms = 400
+        parts.append((offset_ms, response))
+
+    merged = merge_file_responses(parts)
+
+    assert [r.hypothesis.start_time_ms for r in merged.response] == [100, 30100]
+    assert [r.hypothesis.words[0].end_time_ms for r in merged.response] == [400, 30400]
+    assert parts[1][1].response[0].hypothesis.start_time_ms == 100  # inputs are not modified
+
+
+def test_audio_windows_are_frame_exact_views():
+    """Ranges become sorted frame bounds clamped to the audio, windows slice only their frames."""
+    rate = 1000
+    samples = array("h", range(10 * rate))  # 10 s, every sample holds its own index
+    audio = AudioFile.from_pcm(samples.tobytes(), rate, 1)
+
+    windows = audio_windows(audio, [(9000, None), (2500, 3000)])
+
+    assert [(w.start_frame, w.end_frame) for w in windows] == [(2500, 3000), (9000, 10000)]
+    with audio.window(windows[0].start_frame, windows[0].end_frame) as window:
+        assert window.duration_ms == 500
+        assert window.pcm.cast("h")[0] == 2500
+
+    with pytest.raises(ValueError):
+        audio_windows(audio, [(10000, 11000)])
+
+
+def test_audio_windows_merge_overlapping_ranges():
+    """Duplicate, overlapping and adjacent ranges become one window, nothing is sent twice."""
+    audio = AudioFile.from_pcm(bytes(2 * 10 * 1000), 1000, 1)
+
+    windows = audio_windows(
+        audio, [(4000, 6000), (1000, 2000), (5000, 7000), (1000, 2000), (7000, 8000), (9000, None)]
+    )
+
+    assert [(w.start_frame, w.end_frame) for w in windows] == [
+        (1000, 2000),
+        (4000, 8000),
+        (9000, 10000),
+    ]
+
+
+def test_cut_silence_maps_times_back_to_file():
+    """Long pauses shrink to twice the padding, result times land where the speech was."""
+    rate = 8000
+    loud = array("h", [8000, -8000]) * (rate // 2)  # 1 s of tone
+    samples = loud * 2 + array("h", [0]) * (10 * rate) + loud + array("h", [0]) * (rate // 2) + loud
+    audio = AudioFile.from_pcm(samples.tobytes(), rate, 1)
+
+    trimmed, offset_map = cut_silence(
+        audio, [], threshold_dbfs=-40, min_silence_ms=1000, pad_ms=200
+    )
+
+    # 2 s of speech (rounded up to a 30 ms frame) + pad, then pad + 2.5 s with the short pause
+    assert trimmed.duration_ms == 2210 + 2700
+    response = stt_response_pb2.RecognizeResponse()
+    response.hypothesis.start_time_ms = 2410  # onset of the second speech part
+    response.hypothesis.end_time_ms = 4910
+    response.va_marks.add().offset_ms = 1000
+    remap_response_times(response, offset_map)
+
+    assert (response.hypothesis.start_time_ms, response.hypothesis.end_time_ms) == (12000, 14500)
+    assert response.va_marks[0].offset_ms == 1000
+
+
+def test_offset_map_keeps_boundary_end_times_in_their_span():
+    """A word ending right at a cut must not end after the cut out silence."""
+    offset_map = OffsetMap([(0, 2000), (12000, 14000)])
+
+    assert offset_map(2000) == 12000
+    assert offset_map.end(2000) == 2000
+    assert offset_map.end(2001) == 12001
+
+    response = stt_response_pb2.RecognizeResponse()
+    response.hypothesis.start_time_ms = 1500
+    response.hypothesis.end_time_ms = 2000
+    word = response.hypothesis.words.add()
+    word.start_time_ms, word.end_time_ms = 2000, 2500
+    remap_response_times(response, offset_map)
+
+    assert (response.hypothesis.start_time_ms, response.hypothesis.end_time_ms) == (1500, 2000)
+    assert (word.start_time_ms, word.end_time_ms) == (12000, 12500)
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+from audiogram_client.asr.utils.response import TranscriptCollector
+from audiogram_client.asr.utils.words import WordTable
+from audiogram_client.asr.utils.writers import ResultWriters
+from audiogram_client.genproto import stt_response_pb2
+
+
+def _response(start_ms: int, end_ms: int, text: str, channel: int = 0, speaker: int = 0):
+    response = stt_response_pb2.RecognizeResponse(channel=channel, is_final=True)
+    response.hypothesis.transcript = text
+    response.hypothesis.start_time_ms = start_ms
+    response.hypothesis.end_time_ms = end_ms
+    response.speaker_info.speaker_id = speaker
+    return response
+
+
+def test_writers_stream_all_formats(tmp_path):
+    """Every format must get the same results, empty hypotheses are skipped by cue formats."""
+    paths = [str(tmp_path / f"out.{suffix}") for suffix in ("jsonl", "csv", "srt", "vtt")]
+    responses = [
+        _response(100, 2500, "привет"),
+        _response(2500, 2600, ""),
+        _response(3_661_001, 3_662_000, "bye", channel=1, speaker=2),
+    ]
+
+    with ResultWriters(tuple(paths)) as writers:
+        for response in responses:
+            writers.write(response)
+
+    jsonl, csv_path, srt, vtt = paths
+    with open(jsonl, encoding="utf-8") as f:
+        assert [json.loads(line)["hypothesis"].get("transcript", "") for line in f] == [
+            "привет",
+            "",
+            "bye",
+        ]
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[1][:4] == ["100", "2500", "0", "0"] and rows[1][-1] == "привет"
+    assert len(rows) == 3
+
+    with open(srt, encoding="utf-8") as f:
+        assert f.read() == (
+            "1\n00:00:00,100 --> 00:00:02,500\nпривет\n\n"
+            "2\n01:01:01,001 --> 01:01:02,000\nChannel 1: bye\n\n"
+        )
+    with open(vtt, encoding="utf-8") as f:
+        assert f.read().startswith("WEBVTT\n\n1\n00:00:00.100 --> 00:00:02.500\n")
+        f.seek(0)
+        assert "<v Speaker 2>Channel 1: bye\n" in f.read()
+
+
+def test_transcript_collector_orders_channels_in_bounded_batches():
+    """Results of interleaved channels come out by start time, flushed before the end."""
+    sink = io.StringIO()
+    collector = TranscriptCollector(sink, channel_count=2, flush_size=2, max_pending=100)
+
+    for start_ms, channel in [(0, 0), (1000, 0), (500, 1), (2000, 0), (1500, 1), (3000, 1)]:
+        collector.add(_response(start_ms, start_ms + 400, f"at {start_ms}", channel=channel))
+    flushed_early = collector.written
+    collector.flush()
+
+    assert 0 < flushed_early < collector.written == 6
+    starts = [
+        int(line.split('"at ')[1].split('"')[0])
+        for line in sink.getvalue().splitlines()
+        if '"at ' in line
+    ]
+    assert starts == [0, 500, 1000, 1500, 2000, 3000]
+
+
+def test_word_table_round_trip(tmp_path):
+    """Saved word timings must load back as the same columns with interned words."""
+    response = stt_response_pb2.FileRecognizeResponse()
+    for channel, words in enumerate([["да", "нет", "да"], ["ok"]]):
+        result = response.response.add(channel=channel)
+        result.speaker_info.speaker_id = channel + 5
+        for idx, text in enumerate(words):
+            result.hypothesis.words.add(
+                word=text, start_time_ms=idx * 100, end_time_ms=idx * 100 + 90, confidence=0.5
+            )
+
+    table = WordTable.from_response(response)
+    table.save(tmp_path / "out.words")
+
+    assert table.vocabulary == ["да", "нет", "ok"]
+    with WordTable.load(tmp_path / "out.words") as loaded:
+        assert [loaded.word(row) for row in range(len(loaded))] == ["да", "нет", "да", "ok"]
+        assert list(loaded.end_ms) == [90, 190, 290, 90]
+        assert list(loaded.channel) == [0, 0, 0, 1]
+        assert list(loaded.speaker_id) == [5, 5, 5, 6]
+        assert list(loaded.confidence) == [0.5] * 4